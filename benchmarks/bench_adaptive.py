@@ -0,0 +1,64 @@
+"""
+Wakeups and CPU per interval: fixed-rate versus adaptive playback.
+
+fixed    : play_pattern waking on every microstep tick (240 Hz), empty
+           steps included
+adaptive : play_pattern sleeping straight to the next step that moves
+
+Low-recoil profiles (a few pixels per interval) are played in real time
+through a HybridScheduler onto a RecordingBackend, with a MotionState
+carrying the sub-pixel remainder across intervals. Reports scheduler
+waits, thread CPU time and the total displacement, which must match.
+
+    python benchmarks/bench_adaptive.py
+"""
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main  # noqa: E402
+
+PROFILES = (
+    ("y3_150ms", [(0.4, 3.0, 150)]),
+    ("y8_120ms", [(1.0, 8.0, 120)]),
+    ("y1.7_250ms", [(0.0, 1.7, 250)]),
+)
+
+
+def _play(pattern, adaptive, intervals):
+    sched = main.HybridScheduler()      # calibrates its margin on construction
+    rec = main.RecordingBackend(capacity=pattern.steps * intervals + 16)
+    state = main.MotionState()
+    stop = threading.Event()
+    cpu0 = time.thread_time()
+    for _ in range(intervals):
+        main.play_pattern(pattern, rec, sched, stop, adaptive, state)
+    cpu = time.thread_time() - cpu0
+    return sched.stats()["waits"], cpu, rec.total(), rec.count
+
+
+def run(quick=False):
+    intervals = 4 if quick else 16
+    results = {}
+    for label, segs in PROFILES:
+        pattern = main.compile_pattern(segs)
+        fw, fcpu, ftot, fn = _play(pattern, False, intervals)
+        aw, acpu, atot, an = _play(pattern, True, intervals)
+        results[f"{label}_fixed_wakeups"] = fw
+        results[f"{label}_adaptive_wakeups"] = aw
+        results[f"{label}_fixed_cpu_ms"] = round(fcpu * 1e3, 2)
+        results[f"{label}_adaptive_cpu_ms"] = round(acpu * 1e3, 2)
+        results[f"{label}_moves"] = an
+        results[f"{label}_same_displacement"] = ftot == atot and fn == an
+    return results
+
+
+def _cli():
+    for k, v in run("--quick" in sys.argv).items():
+        print(f"{k:32s} {v}")
+
+
+if __name__ == "__main__":
+    _cli()
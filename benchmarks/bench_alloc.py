@@ -0,0 +1,185 @@
+"""
+Allocations on the steady-state arm/fire path, and the GC option.
+
+alloc : movement_loop fires a profile onto a RecordingBackend on this
+        thread under tracemalloc. Once warmed up (every counter on the
+        path past CPython's small-int cache), a window of intervals must
+        leave traced memory exactly where it started (net 0) and never
+        rise more than --budget bytes above it (transient). What is left
+        on the path is ints past 256 and floats, which CPython recycles;
+        one Condition wait, dict or ctypes struct per step is already over
+        the budget. Fixed-step and adaptive playback, short and long
+        (>256 step) profiles. Exits 1 if any case fails.
+gc    : worker step lateness while another thread churns cyclic garbage
+        over a large live heap, with GC_WHILE_FIRING "on", "freeze" and
+        "off", plus the longest collection pause seen while firing
+
+    python benchmarks/bench_alloc.py [--quick] [--budget BYTES]
+"""
+import collections
+import gc
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main  # noqa: E402
+
+BUDGET = 144    # bytes of recycled ints/floats in flight at once
+WARM = 300      # counters (steps, flushes, waits) past the small-int cache
+
+PROFILES = (
+    ("short", main.ParamSnapshot(3.0, -120.0, 60)),
+    ("segments", main.ParamSnapshot(0.0, 0.0, 400, [{"x": 5, "y": -90, "duration_ms": 200},
+                                                     {"x": -2, "y": -30, "duration_ms": 200}])),
+    ("long", main.ParamSnapshot(3.0, -120.0, 1500)),
+)
+
+
+def steady_window(params, adaptive, intervals):
+    """(net bytes, transient bytes, steps) over `intervals` warmed-up intervals."""
+    rec = main.RecordingBackend(capacity=1 << 16)
+    sched = main.HybridScheduler()
+    # misses only count late steps, so warming up can't be relied on to
+    # carry it past the small-int cache; one crossing mid-window is 32 bytes
+    sched.misses = WARM
+    trig = main.TriggerState()
+    token = main.CancelToken()
+    trig.set_button("right", True)
+    trig.set_button("left", True)
+    # the probe runs inside get_params, so it must not allocate either:
+    # marks live in arrays and every traced-memory read is stored right away
+    marks = array("q", [0] * 4)
+    left = array("q", [-1])
+
+    def get_params():
+        n = left[0]
+        if n < 0:
+            if rec.flushes > WARM and sched.waits > WARM and rec.count > WARM:
+                left[0] = intervals
+                marks[2] = rec.count
+                marks[0] = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+        elif n == 0:
+            marks[1], marks[3] = tracemalloc.get_traced_memory()
+            marks[2] = rec.count - marks[2]
+            token.cancel()
+        else:
+            left[0] = n - 1
+        return params
+
+    tracemalloc.start(1)
+    try:
+        main.movement_loop(get_params, rec, sched, trig, token, adaptive)
+    finally:
+        tracemalloc.stop()
+    return marks[1] - marks[0], marks[3] - marks[0], marks[2]
+
+
+def alloc_cases(quick=False, budget=BUDGET):
+    """{key: value} per profile and mode, plus the failing keys."""
+    out, failed = {}, []
+    for label, params in PROFILES:
+        intervals = max(3, int((0.6 if quick else 2.0) / params.pattern.duration_s))
+        for mode, adaptive in (("fixed", False), ("adaptive", True)):
+            net, transient, steps = steady_window(params, adaptive, intervals)
+            key = f"{label}_{mode}"
+            out[f"{key}_steps"] = steps
+            out[f"{key}_net_bytes"] = net
+            out[f"{key}_transient_bytes"] = transient
+            if net != 0 or transient > budget:
+                failed.append(key)
+    return out, failed
+
+
+def _gc_trial(mode, seconds, heap_size):
+    heap = [[i, str(i)] for i in range(heap_size)]      # long-lived tracked containers
+    rec = main.RecordingBackend(capacity=1 << 18)
+    sched = main.HybridScheduler()
+    sched.late_hist = main.Histogram()
+    trig = main.TriggerState()
+    params = main.ParamSnapshot(0.0, -120.0, 60)
+    pauses = []
+    started = [0.0]
+
+    def on_gc(phase, info):
+        if phase == "start":
+            started[0] = time.perf_counter()
+        elif trig.firing:
+            pauses.append(time.perf_counter() - started[0])
+
+    done = threading.Event()
+
+    def churn():
+        # bursts of UI-ish work with idle gaps, so what stalls the worker is
+        # mostly the collections those bursts trigger rather than the GIL;
+        # a rolling window of survivors reaches the oldest generation and
+        # brings on full collections over the whole heap
+        kept = collections.deque(maxlen=20_000)
+        while not done.is_set():
+            for i in range(300):
+                a = {"self": None, "items": [1, 2, 3]}
+                a["self"] = a           # cyclic: only the collector frees it
+                if i % 3 == 0:
+                    kept.append(a)
+            time.sleep(0.003)
+
+    saved = main.GC_WHILE_FIRING
+    main.GC_WHILE_FIRING = mode
+    gc.callbacks.append(on_gc)
+    worker = main.MotionWorker(lambda: params, rec, sched, trig)
+    th = threading.Thread(target=churn, daemon=True)
+    try:
+        worker.start()
+        th.start()
+        trig.set_button("right", True)
+        trig.set_button("left", True)
+        time.sleep(seconds)
+        trig.set_button("left", False)
+        trig.set_button("right", False)
+        time.sleep(0.1)
+    finally:
+        done.set()
+        th.join()
+        worker.stop()
+        gc.callbacks.remove(on_gc)
+        main.GC_WHILE_FIRING = saved
+        del heap
+        gc.collect()
+    late = sched.late_hist
+    return (late.percentile(0.99), round(late.max_us, 1), len(pauses),
+            round(max(pauses, default=0.0) * 1e3, 2), sched.misses / sched.waits * 100.0 if sched.waits else 0.0)
+
+
+def run(quick=False, budget=BUDGET):
+    results, failed = alloc_cases(quick, budget)
+    results["alloc_budget_bytes"] = budget
+    results["alloc_failed"] = ",".join(failed) or None
+    for mode in ("on", "freeze", "off"):
+        p99, mx, n, worst, miss = _gc_trial(mode, 1.5 if quick else 4.0,
+                                            200_000 if quick else 1_000_000)
+        results[f"gc_{mode}_late_p99_us"] = p99
+        results[f"gc_{mode}_late_max_us"] = mx
+        results[f"gc_{mode}_miss_pct"] = round(miss, 2)
+        results[f"gc_{mode}_collections_while_firing"] = n
+        results[f"gc_{mode}_worst_pause_ms"] = worst
+    return results
+
+
+def _cli():
+    budget = BUDGET
+    if "--budget" in sys.argv:
+        budget = int(sys.argv[sys.argv.index("--budget") + 1])
+    results = run("--quick" in sys.argv, budget)
+    for k, v in results.items():
+        print(f"{k:36s} {v}")
+    if results["alloc_failed"]:
+        print(f"[bench] allocations on the fire path: {results['alloc_failed']}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    _cli()
@@ -0,0 +1,115 @@
+"""
+Background rendering cost during a window-resize storm.
+
+cover_fit : ImageBackground._cover_fit from a 4K source versus from the
+            screen-sized working copy, at common window sizes (no display
+            needed)
+storm     : with a display, replays a drag-resize storm against a real
+            ImageBackground (off-thread resampling) and reports frames
+            rendered, stale renders dropped, worker vs Tk-thread time and the
+            worst single Tk update, next to the old render-every-<Configure> cost
+
+    python benchmarks/bench_background.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main  # noqa: E402
+from PIL import Image  # noqa: E402
+
+WINDOW_SIZES = ((980, 520), (1280, 720), (1600, 900), (1920, 1080))
+SCREEN = (1920, 1080)
+
+
+def make_source(size=(3840, 2160)):
+    return Image.effect_noise(size, 48).convert("RGB")
+
+
+def _time_fit(img, sizes, reps):
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        for w, h in sizes:
+            main.ImageBackground._cover_fit(img, w, h)
+    return (time.perf_counter() - t0) / (reps * len(sizes)) * 1e3
+
+
+def _storm_sizes(n):
+    # a drag: small steps one way then back, repeated
+    out = []
+    for i in range(n):
+        k = i % 80
+        k = k if k < 40 else 80 - k
+        out.append((980 + 12 * k, 520 + 7 * k))
+    return out
+
+
+def _tk_storm(src, n_events):
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"[bench] storm skipped: {e}")
+        return {}
+    try:
+        bg = main.ImageBackground(root, source=src)
+        bg.place(x=0, y=0, relwidth=1, relheight=1)
+        first_deadline = time.perf_counter() + 5.0
+        while bg.frames_rendered == 0 and time.perf_counter() < first_deadline:
+            root.update()
+            time.sleep(0.005)
+        worst = 0.0
+        t0 = time.perf_counter()
+        for w, h in _storm_sizes(n_events):
+            root.geometry(f"{w}x{h}")
+            t = time.perf_counter()
+            root.update()
+            worst = max(worst, time.perf_counter() - t)
+            time.sleep(0.004)   # ~250 Configure events per second
+        # let the last debounced redraw land
+        end = time.perf_counter() + bg.RESIZE_DEBOUNCE_MS / 1000.0 * 4
+        while time.perf_counter() < end:
+            root.update()
+            time.sleep(0.002)
+        wall = time.perf_counter() - t0
+        return {
+            "storm_events": n_events,
+            "storm_frames_rendered": bg.frames_rendered,
+            "storm_stale_dropped": bg.stale_dropped,
+            "storm_cache_hits": bg.cache_hits,
+            "storm_worker_render_ms": round(bg.render_s * 1e3, 1),
+            "storm_tk_convert_ms": round(bg.convert_s * 1e3, 1),
+            "storm_tk_worst_update_ms": round(worst * 1e3, 2),
+            "storm_wall_ms": round(wall * 1e3, 1),
+        }
+    finally:
+        root.destroy()
+
+
+def run(quick=False):
+    reps = 1 if quick else 3
+    src = make_source()
+    work = main.ImageBackground._working_copy(src, *SCREEN)
+    results = {}
+    for w, h in WINDOW_SIZES:
+        results[f"fit_full_{w}x{h}_ms"] = round(_time_fit(src, ((w, h),), reps), 2)
+        results[f"fit_work_{w}x{h}_ms"] = round(_time_fit(work, ((w, h),), reps), 2)
+
+    n_events = 60 if quick else 240
+    storm = _tk_storm(src, n_events)
+    if storm:
+        # old behaviour: one full-resolution resample per <Configure>
+        per = _time_fit(src, _storm_sizes(8), 1)
+        storm["storm_old_render_ms_est"] = round(per * n_events, 1)
+    results.update(storm)
+    return results
+
+
+def _cli():
+    for k, v in run("--quick" in sys.argv).items():
+        print(f"{k:28s} {v}")
+
+
+if __name__ == "__main__":
+    _cli()
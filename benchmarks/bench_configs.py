@@ -0,0 +1,101 @@
+"""
+Config listing and loading at 10, 1k and 10k profiles.
+
+old    : list_configs / load_config as they were — os.listdir + sort on
+         every refresh, open + json.load on every load
+store  : ConfigStore — refresh is skipped while the directory mtime is
+         unchanged (and is stat-only when it did change); load re-stats one
+         file and serves the cached parse
+
+    python benchmarks/bench_configs.py
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main  # noqa: E402
+
+
+def old_list_configs(d):
+    return sorted(
+        [os.path.splitext(f)[0] for f in os.listdir(d) if f.lower().endswith(".json")],
+        key=str.lower
+    )
+
+
+def old_load_config(d, name):
+    with open(os.path.join(d, f"{name}.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def populate(d, n):
+    for i in range(n):
+        with open(os.path.join(d, f"profile {i:05d}.json"), "w", encoding="utf-8") as f:
+            json.dump({"x": i % 7 - 3, "y": -50.0 - i % 40, "interval_ms": 120}, f, indent=2)
+    age_dir(d)
+
+
+def age_dir(d):
+    # step outside ConfigStore's racy window, as a long-lived directory would be
+    old = time.time() - 60
+    os.utime(d, (old, old))
+
+
+def _per_call_ms(fn, reps):
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        fn()
+    return (time.perf_counter() - t0) / reps * 1e3
+
+
+def run(quick=False):
+    sizes = (10, 1000) if quick else (10, 1000, 10_000)
+    results = {}
+    for n in sizes:
+        d = tempfile.mkdtemp(prefix="recoil-cfg-")
+        try:
+            populate(d, n)
+            reps = max(3, 2000 // n)
+            names = old_list_configs(d)
+            probe = names[len(names) // 2]
+
+            store = main.ConfigStore(d)
+            t0 = time.perf_counter()
+            store.refresh()
+            cold = (time.perf_counter() - t0) * 1e3
+
+            results[f"n{n}_old_refresh_ms"] = round(_per_call_ms(lambda: old_list_configs(d), reps), 4)
+            results[f"n{n}_store_cold_refresh_ms"] = round(cold, 4)
+            results[f"n{n}_store_refresh_ms"] = round(_per_call_ms(store.refresh, reps), 4)
+
+            # one new profile appears: the directory changed, so a stat pass runs
+            def add_one():
+                p = os.path.join(d, "zz new.json")
+                with open(p, "w") as f:
+                    f.write("{}")
+                age_dir(d)
+                store.refresh()
+                os.remove(p)
+                age_dir(d)
+                store.refresh()
+            results[f"n{n}_store_changed_refresh_ms"] = round(_per_call_ms(add_one, 3) / 2, 4)
+
+            results[f"n{n}_old_load_us"] = round(_per_call_ms(lambda: old_load_config(d, probe), 200) * 1e3, 2)
+            store.load(probe)
+            results[f"n{n}_store_load_us"] = round(_per_call_ms(lambda: store.load(probe), 200) * 1e3, 2)
+        finally:
+            shutil.rmtree(d, ignore_errors=True)
+    return results
+
+
+def _cli():
+    for k, v in run("--quick" in sys.argv).items():
+        print(f"{k:34s} {v}")
+
+
+if __name__ == "__main__":
+    _cli()
@@ -0,0 +1,144 @@
+"""
+Headless engine versus the full window: startup time and resident memory.
+
+headless : `main.py --headless` from spawn to the control channel
+           accepting connections, its RSS once up, and the round-trip
+           time of a control request ("status" and "set")
+gui      : spawn to the first <Map> of RecoilApp's window, and RSS after
+           the background has been drawn (needs a display; skipped
+           otherwise)
+
+RSS is read from /proc, so memory figures are Linux-only.
+
+    python benchmarks/bench_headless.py
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import main  # noqa: E402
+
+_GUI_PROBE = r"""
+import sys, time
+import main
+try:
+    app = main.RecoilApp()
+except main.tk.TclError as e:
+    print("skip", e)
+    sys.exit(0)
+def rss():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        return -1
+def mapped(_e=None):
+    app.unbind("<Map>")
+    print("mapped", time.time(), flush=True)
+    app.after(1000, done)
+def done():
+    print("rss", rss(), flush=True)
+    app.destroy()
+app.bind("<Map>", mapped)
+app.mainloop()
+"""
+
+
+def _rss_kb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def _headless(reps):
+    t0 = time.time()
+    proc = subprocess.Popen([sys.executable, "main.py", "--headless", "--listen", "127.0.0.1:0"],
+                            cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    try:
+        address = None
+        for line in proc.stdout:
+            if line.startswith("[control] listening on "):
+                address = line.split()[-1]
+                break
+        if address is None:
+            raise RuntimeError("headless engine exited before listening")
+        remote = main.RemoteEngine(address)
+        remote.status()
+        up_ms = (time.time() - t0) * 1e3
+        rtt = {}
+        snap = main.ParamSnapshot(2, -40, 90)
+        for label, call in (("status", remote.status),
+                            ("set", lambda: remote.publish(snap))):
+            samples = []
+            for _ in range(reps):
+                t = time.perf_counter()
+                call()
+                samples.append((time.perf_counter() - t) * 1e6)
+            samples.sort()
+            rtt[label] = (statistics.median(samples), samples[int(len(samples) * 0.99)])
+        time.sleep(0.2)
+        rss = _rss_kb(proc.pid)
+        remote.close()
+        return up_ms, rss, rtt
+    finally:
+        proc.terminate()
+        proc.wait(5)
+
+
+def _gui():
+    t0 = time.time()
+    out = subprocess.run([sys.executable, "-c", _GUI_PROBE], cwd=ROOT,
+                         capture_output=True, text=True, timeout=30)
+    mapped = rss = None
+    for line in out.stdout.splitlines():
+        if line.startswith("skip"):
+            print(f"[bench] gui skipped: {line[5:]}")
+            return None, None
+        if line.startswith("mapped"):
+            mapped = (float(line.split()[1]) - t0) * 1e3
+        if line.startswith("rss"):
+            rss = int(line.split()[1])
+    return mapped, rss
+
+
+def run(quick=False):
+    runs = 2 if quick else 5
+    reps = 200 if quick else 2000
+    ups, rsss = [], []
+    rtt = {}
+    for _ in range(runs):
+        up, rss, rtt = _headless(reps)
+        ups.append(up)
+        rsss.append(rss)
+    results = {"headless_ready_ms": round(statistics.median(ups), 1)}
+    if rsss[0] is not None:
+        results["headless_rss_kb"] = int(statistics.median(rsss))
+    for label, (p50, p99) in rtt.items():
+        results[f"control_{label}_p50_us"] = round(p50, 1)
+        results[f"control_{label}_p99_us"] = round(p99, 1)
+    mapped, rss = _gui()
+    if mapped is not None:
+        results["gui_first_window_ms"] = round(mapped, 1)
+    if rss is not None and rss > 0:
+        results["gui_rss_kb"] = rss
+    return results
+
+
+def _cli():
+    for k, v in run("--quick" in sys.argv).items():
+        print(f"{k:28s} {v}")
+
+
+if __name__ == "__main__":
+    _cli()
@@ -0,0 +1,123 @@
+"""
+Hotkey profile switching: key press to the worker running the new profile.
+
+preload  : ProfileSwitcher.preload() over a directory of bound profiles
+           (parse + compile, done once when toggling on)
+press    : cost of ProfileSwitcher.press() on the listener thread
+applied  : press -> movement_loop adopting the new snapshot at its next
+           interval boundary, with a live worker firing onto a
+           RecordingBackend (bounded by the interval length)
+old      : what a switch used to cost before the worker could see it —
+           load_config from disk plus building the snapshot, without the
+           Tk round-trip on top
+
+    python benchmarks/bench_hotkeys.py
+"""
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main  # noqa: E402
+from bench_configs import old_load_config  # noqa: E402
+
+KEYS = ("f1", "f2", "f3", "f4", "f5", "f6")
+
+
+def populate(d, interval_ms):
+    for i, key in enumerate(KEYS):
+        data = {"x": i - 3, "y": -20.0 - 5 * i, "interval_ms": interval_ms, "hotkey": key}
+        if i % 2:
+            data["segments"] = [{"x": 0, "y": -10 - i, "duration_ms": interval_ms // 2},
+                                {"x": i, "y": -5, "duration_ms": interval_ms // 2}]
+        with open(os.path.join(d, f"profile {key}.json"), "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
+
+def _live_switches(switcher, presses, interval_ms):
+    rec = main.RecordingBackend(capacity=1 << 18)
+    sched = main.HybridScheduler()
+    trig = main.TriggerState()
+    stop = threading.Event()
+    switcher.publish(switcher.loaded[switcher.bindings[KEYS[0]]])
+    samples = []
+
+    def get_params():
+        seen = switcher.switches
+        snap = switcher.current()
+        if switcher.switches != seen:
+            samples.append(switcher.last_latency_us / 1e3)
+        return snap
+
+    th = threading.Thread(target=main.movement_loop,
+                          args=(get_params, rec, sched, trig, stop), daemon=True)
+    th.start()
+    trig.set_button("right", True)
+    trig.set_button("left", True)
+    rnd = random.Random(7)
+    try:
+        for _ in range(presses):
+            time.sleep(rnd.uniform(0.5, 1.5) * interval_ms / 1000.0)
+            switcher.press(rnd.choice(KEYS))
+        time.sleep(2 * interval_ms / 1000.0)
+    finally:
+        stop.set()
+        trig.interrupt()
+        th.join(2.0)
+    samples.sort()
+    return samples
+
+
+def run(quick=False):
+    interval_ms = 40
+    presses = 25 if quick else 150
+    d = tempfile.mkdtemp(prefix="recoil-hk-")
+    try:
+        populate(d, interval_ms)
+        store = main.ConfigStore(d)
+        switcher = main.ProfileSwitcher(store=store)
+        t0 = time.perf_counter()
+        n = switcher.preload()
+        preload_ms = (time.perf_counter() - t0) * 1e3
+
+        reps = 20_000
+        t0 = time.perf_counter()
+        for i in range(reps):
+            switcher.press(KEYS[i % len(KEYS)])
+        press_us = (time.perf_counter() - t0) / reps * 1e6
+
+        probe = f"profile {KEYS[1]}"
+        t0 = time.perf_counter()
+        for _ in range(200):
+            main.ParamSnapshot.from_config(old_load_config(d, probe))
+        old_us = (time.perf_counter() - t0) / 200 * 1e6
+
+        switcher.switches = 0
+        ms = _live_switches(switcher, presses, interval_ms)
+        return {
+            "profiles_bound": n,
+            "preload_ms": round(preload_ms, 2),
+            "press_us": round(press_us, 2),
+            "old_load_and_build_us": round(old_us, 1),
+            "interval_ms": interval_ms,
+            "switches_applied": len(ms),
+            "applied_p50_ms": round(ms[len(ms) // 2], 2),
+            "applied_p99_ms": round(ms[int(len(ms) * 0.99)], 2),
+            "applied_max_ms": round(ms[-1], 2),
+        }
+    finally:
+        shutil.rmtree(d, ignore_errors=True)
+
+
+def _cli():
+    for k, v in run("--quick" in sys.argv).items():
+        print(f"{k:26s} {v}")
+
+
+if __name__ == "__main__":
+    _cli()
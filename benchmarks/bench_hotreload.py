@@ -0,0 +1,160 @@
+"""
+Live config hot-reload.
+
+latency  : profile file rewritten on disk -> new snapshot published to the
+           engine, with the inotify watcher and with stat polling
+idle_cpu : process CPU while the watcher idles over 1000 profiles
+glitch   : a live worker fires a 100 ms pattern onto a RecordingBackend
+           while the running profile's file is rewritten every ~70 ms;
+           every interval's recorded moves must add up to exactly the old
+           or the new pattern, never a mix
+
+    python benchmarks/bench_hotreload.py
+"""
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main  # noqa: E402
+from bench_configs import populate  # noqa: E402
+
+ACTIVE = "active profile"
+
+
+def _write(d, y, interval_ms=100):
+    with open(os.path.join(d, f"{ACTIVE}.json"), "w", encoding="utf-8") as f:
+        json.dump({"x": 0, "y": y, "interval_ms": interval_ms}, f)
+
+
+def _engine(d, inotify):
+    main.config_store = main.ConfigStore(d)
+    eng = main.Engine(main.ProfileSwitcher(store=main.config_store))
+    eng.load_profile(ACTIVE)
+    eng.watcher = main.ConfigWatcher(d, eng._configs_changed, eng._watched_names,
+                                     use_inotify=inotify)
+    eng.watcher.start()
+    return eng
+
+
+def _latency(d, inotify, edits):
+    eng = _engine(d, inotify)
+    out = []
+    try:
+        time.sleep(0.1)
+        for i in range(edits):
+            before = eng.switcher.reloads
+            t0 = time.perf_counter()
+            _write(d, -60 - (i % 2) * 60)
+            deadline = t0 + 3.0
+            while eng.switcher.reloads == before and time.perf_counter() < deadline:
+                time.sleep(0.0005)
+            out.append((time.perf_counter() - t0) * 1e3)
+            time.sleep(0.05)
+    finally:
+        eng.close()
+    out.sort()
+    return out
+
+
+def _idle_cpu(d, inotify, seconds):
+    eng = _engine(d, inotify)
+    try:
+        time.sleep(0.2)
+        c0 = time.process_time()
+        time.sleep(seconds)
+        return (time.process_time() - c0) / seconds * 100.0
+    finally:
+        eng.close()
+
+
+def _glitch(d, seconds):
+    eng = _engine(d, True)
+    rec = main.RecordingBackend(capacity=1 << 18)
+    sched = main.HybridScheduler()
+    trig = main.TriggerState()
+    starts = []
+
+    def get_params():
+        snap = eng.switcher.current()
+        starts.append((time.perf_counter(), snap))
+        return snap
+
+    worker = main.MotionWorker(get_params, rec, sched, trig)
+    worker.start()
+    trig.set_button("right", True)
+    trig.set_button("left", True)
+    rnd = random.Random(3)
+    t_end = time.perf_counter() + seconds
+    edits = 0
+    try:
+        while time.perf_counter() < t_end:
+            time.sleep(rnd.uniform(0.04, 0.1))
+            _write(d, rnd.choice((-60, -120, -90)))
+            edits += 1
+        trig.set_button("left", False)
+        time.sleep(0.15)
+    finally:
+        trig.set_button("right", False)
+        worker.stop()
+        eng.close()
+
+    mixed = 0
+    used = set()
+    j = 0
+    bounds = [t for t, _ in starts[1:]] + [float("inf")]
+    for (t0, snap), t1 in zip(starts, bounds):
+        while j < rec.count and rec.t[j] < t0:
+            j += 1
+        k, sy = j, 0
+        while k < rec.count and rec.t[k] < t1:
+            sy += rec.dy[k]
+            k += 1
+        used.add(snap.y)
+        if k > j and sy != snap.pattern.total()[1]:
+            mixed += 1
+    return len(starts), edits, len(used), mixed
+
+
+def run(quick=False):
+    saved = main.config_store
+    d = tempfile.mkdtemp(prefix="recoil-watch-")
+    results = {}
+    try:
+        populate(d, 1000)
+        _write(d, -60)
+        edits = 10 if quick else 40
+        for label, inotify in (("inotify", True), ("poll", False)):
+            probe = main.ConfigWatcher(d, lambda names: None, use_inotify=inotify)
+            probe.start()
+            mode = probe.mode
+            probe.stop()
+            if inotify and mode != "inotify":
+                print("[bench] inotify unavailable here; skipping it")
+                continue
+            ms = _latency(d, inotify, edits)
+            results[f"{label}_reload_p50_ms"] = round(ms[len(ms) // 2], 2)
+            results[f"{label}_reload_max_ms"] = round(ms[-1], 2)
+            results[f"{label}_idle_cpu_pct"] = round(_idle_cpu(d, inotify, 1.0 if quick else 3.0), 3)
+        intervals, n_edits, variants, mixed = _glitch(d, 1.5 if quick else 5.0)
+        results["glitch_intervals"] = intervals
+        results["glitch_file_edits"] = n_edits
+        results["glitch_profiles_seen"] = variants
+        results["glitch_mixed_intervals"] = mixed
+    finally:
+        main.config_store = saved
+        shutil.rmtree(d, ignore_errors=True)
+    return results
+
+
+def _cli():
+    for k, v in run("--quick" in sys.argv).items():
+        print(f"{k:28s} {v}")
+
+
+if __name__ == "__main__":
+    _cli()
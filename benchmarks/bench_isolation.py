@@ -0,0 +1,165 @@
+"""
+Step jitter of the in-process worker thread versus the isolated engine
+process while the UI is busy.
+
+thread  : MotionWorker, movement_loop on a thread of this process
+process : ProcessWorker, movement_loop in a child process fed through the
+          shared block (params, buttons in; stats out)
+
+Fire is held on a dense profile (every 240 Hz microstep moves) onto a
+RecordingBackend while this process's main thread runs a load:
+
+quiet  : nothing
+resize : with a display, a RecoilApp window resized continuously (Tk
+         layout, background redraws); without one, the same storm
+         replayed synthetically: ImageBackground._cover_fit at drag-resize
+         sizes plus GIL-holding Python work standing in for the Tk
+         callbacks
+
+Jitter is the scheduler's lateness past each step deadline, from its log2
+histogram (so percentiles are bucket upper edges), plus the exact max and
+the share of steps later than the miss tolerance (0.5 ms).
+
+    python benchmarks/bench_isolation.py
+"""
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main  # noqa: E402
+
+PARAMS = main.ParamSnapshot(0.0, -120.0, 60)
+
+
+def _storm_sizes(n):
+    return [(920 + (i * 37) % 700, 480 + (i * 23) % 400) for i in range(n)]
+
+
+class _SyntheticUI:
+    """A resize storm without a display: resample plus Tcl-ish Python work."""
+    def __init__(self):
+        try:
+            from PIL import Image
+            src = Image.effect_noise((3840, 2160), 48).convert("RGB")
+            self.work = main.ImageBackground._working_copy(src, 1920, 1080)
+        except ImportError:
+            self.work = None
+        self.sizes = _storm_sizes(64)
+        self.layout = {f"widget{i}": {"x": i, "y": i * 2, "w": 120, "h": 24, "opts": list(range(8))}
+                       for i in range(400)}
+        self.frames = 0
+
+    def frame(self):
+        w, h = self.sizes[self.frames % len(self.sizes)]
+        if self.work is not None:
+            main.ImageBackground._cover_fit(self.work, w, h)
+        # geometry propagation and event callbacks hold the GIL in bursts
+        for _ in range(3):
+            json.loads(json.dumps(self.layout))
+        self.frames += 1
+
+    def close(self):
+        pass
+
+
+class _TkUI:
+    def __init__(self, app):
+        self.app = app
+        self.sizes = _storm_sizes(64)
+        self.frames = 0
+
+    def frame(self):
+        w, h = self.sizes[self.frames % len(self.sizes)]
+        self.app.geometry(f"{w}x{h}")
+        self.app.update()
+        self.frames += 1
+
+    def close(self):
+        self.app.destroy()
+
+
+def _ui():
+    try:
+        app = main.RecoilApp()
+        app.update()
+        return _TkUI(app), "tk"
+    except main.tk.TclError as e:
+        print(f"[bench] no display ({e}); replaying the resize storm synthetically")
+        return _SyntheticUI(), "synthetic"
+
+
+def _fire(worker, trig, ui, seconds):
+    trig.set_button("right", True)
+    trig.set_button("left", True)
+    t_end = time.perf_counter() + seconds
+    try:
+        while time.perf_counter() < t_end:
+            if ui is not None:
+                ui.frame()
+            else:
+                time.sleep(0.01)
+    finally:
+        trig.set_button("left", False)
+        trig.set_button("right", False)
+        time.sleep(0.05)
+
+
+def _thread(ui, seconds):
+    rec = main.RecordingBackend(capacity=1 << 18)
+    sched = main.HybridScheduler()
+    sched.late_hist = main.Histogram()
+    trig = main.TriggerState()
+    worker = main.MotionWorker(lambda: PARAMS, rec, sched, trig)
+    worker.start()
+    try:
+        _fire(worker, trig, ui, seconds)
+    finally:
+        worker.stop()
+    late = sched.late_hist
+    return late.percentile(0.5), late.percentile(0.99), late.max_us, sched.waits, sched.misses
+
+
+def _process(ui, seconds):
+    switcher = main.ProfileSwitcher()
+    switcher.publish(PARAMS)
+    trig = main.TriggerState()
+    worker = main.ProcessWorker(switcher, trig, main.RecordingBackend)
+    worker.start()
+    try:
+        if not worker.wait_ready():
+            raise RuntimeError("engine process did not come up")
+        _fire(worker, trig, ui, seconds)
+    finally:
+        worker.stop()
+    st = worker.stats()
+    return st["late_p50_us"], st["late_p99_us"], st["max_late_us"], st["waits"], st["misses"]
+
+
+def run(quick=False):
+    seconds = 1.5 if quick else 5.0
+    ui, kind = _ui()
+    results = {"resize_load": kind}
+    try:
+        for load in ("quiet", "resize"):
+            for mode, fn in (("thread", _thread), ("process", _process)):
+                p50, p99, mx, waits, misses = fn(ui if load == "resize" else None, seconds)
+                key = f"{mode}_{load}"
+                results[f"{key}_late_p50_us"] = p50
+                results[f"{key}_late_p99_us"] = p99
+                results[f"{key}_late_max_us"] = round(mx, 1)
+                results[f"{key}_miss_pct"] = round(misses / waits * 100.0, 2) if waits else None
+        results["resize_frames"] = ui.frames
+    finally:
+        ui.close()
+    return results
+
+
+def _cli():
+    for k, v in run("--quick" in sys.argv).items():
+        print(f"{k:30s} {v}")
+
+
+if __name__ == "__main__":
+    _cli()
@@ -0,0 +1,86 @@
+"""
+Packed profile library versus the per-file JSON layout.
+
+json      : list_configs + load_config the old way (listdir + sort, then
+            open + json.load of one profile)
+library   : ProfileLibrary opened with mmap, one lookup by name (open cost
+            reported separately since a long-lived app keeps it open)
+
+Also reports pack time and allocated disk size for 10, 1k and 10k profiles.
+
+    python benchmarks/bench_library.py
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main  # noqa: E402
+from bench_configs import old_list_configs, old_load_config, populate  # noqa: E402
+
+
+def _per_call_us(fn, reps):
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        fn()
+    return (time.perf_counter() - t0) / reps * 1e6
+
+
+def _disk_bytes(st):
+    # allocated blocks where the platform reports them; each small JSON file
+    # costs a whole filesystem block
+    blocks = getattr(st, "st_blocks", None)
+    return blocks * 512 if blocks is not None else st.st_size
+
+
+def _dir_bytes(d):
+    return sum(_disk_bytes(e.stat()) for e in os.scandir(d) if e.name.endswith(".json"))
+
+
+def run(quick=False):
+    sizes = (10, 1000) if quick else (10, 1000, 10_000)
+    results = {}
+    for n in sizes:
+        d = tempfile.mkdtemp(prefix="recoil-lib-")
+        try:
+            populate(d, n)
+            lib_path = os.path.join(d, "profiles.rcpl")
+            t0 = time.perf_counter()
+            main.pack_config_dir(lib_path, d)
+            pack_ms = (time.perf_counter() - t0) * 1e3
+            probe = old_list_configs(d)[n // 2]
+            reps = max(5, 2000 // n)
+
+            def json_path():
+                names = old_list_configs(d)
+                return old_load_config(d, names[names.index(probe)])
+
+            def lib_open_get():
+                with main.ProfileLibrary(lib_path) as lib:
+                    return lib.get(probe)
+
+            lib = main.ProfileLibrary(lib_path)
+            try:
+                assert lib.get(probe) == json_path()
+                results[f"n{n}_json_list_load_us"] = round(_per_call_us(json_path, reps), 1)
+                results[f"n{n}_lib_open_get_us"] = round(_per_call_us(lib_open_get, reps), 1)
+                results[f"n{n}_lib_get_us"] = round(_per_call_us(lambda: lib.get(probe), 2000), 2)
+            finally:
+                lib.close()
+            results[f"n{n}_pack_ms"] = round(pack_ms, 2)
+            results[f"n{n}_json_disk_bytes"] = _dir_bytes(d)
+            results[f"n{n}_lib_disk_bytes"] = _disk_bytes(os.stat(lib_path))
+        finally:
+            shutil.rmtree(d, ignore_errors=True)
+    return results
+
+
+def _cli():
+    for k, v in run("--quick" in sys.argv).items():
+        print(f"{k:28s} {v}")
+
+
+if __name__ == "__main__":
+    _cli()
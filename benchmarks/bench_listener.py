@@ -0,0 +1,295 @@
+"""
+Button listener overhead under a mouse move flood.
+
+The worker fires a dense profile onto a RecordingBackend while the mouse
+reports at 8 kHz. Fire is pressed and released through the listener under
+test, so edge latency is measured too.
+
+none : no listener and no flood; the floor for the numbers below
+hook : what pynput's mouse listener does: a hook thread that enters
+       Python for every event (decode the MSLLHOOKSTRUCT, dispatch by
+       message, call the callback, which is a no-op for moves). Events
+       arrive in bursts of 8 per millisecond; a real hook re-enters
+       Python once per event, so this is if anything kind to it
+poll : SyntheticButtonSource, polled like Win32ButtonSource every 1 ms;
+       the moves stay in the OS and never reach Python
+
+Reported: process CPU while firing, worker step lateness (p50/p99 from
+the log2 histogram, exact max), the share of steps missed by >0.5 ms,
+Python entries per second from the listener, and press -> trigger edge
+latency.
+
+On Windows the real sources are measured instead (--simulate forces the
+above): a child process floods SendInput with RATE_HZ moves of +1/-1 px
+(the cursor shakes in place while it runs) and the worker fires onto a
+RecordingBackend next to
+
+none   : no listener, no flood
+pynput : PynputButtonSource, whose hook enters Python for every move
+win32  : Win32ButtonSource, held at its 1 ms rate
+
+Fire is set on the trigger directly, since a real click would land on
+the desktop, so there is no edge latency; instead win32 reports the gaps
+between its polls, and each source its CPU while idle (nothing held, no
+flood) at its default rates.
+
+    python benchmarks/bench_listener.py [--simulate]
+"""
+import ctypes
+import multiprocessing
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main  # noqa: E402
+
+RATE_HZ = 8000
+BURST = 8
+WM_MOUSEMOVE = 0x0200
+WM_LBUTTONDOWN, WM_LBUTTONUP = 0x0201, 0x0202
+WM_RBUTTONDOWN, WM_RBUTTONUP = 0x0204, 0x0205
+LLMHF_INJECTED = 0x01
+PARAMS = main.ParamSnapshot(0.0, -120.0, 60)
+
+
+class POINT(ctypes.Structure):
+    _fields_ = (("x", ctypes.c_long), ("y", ctypes.c_long))
+
+
+class MSLLHOOKSTRUCT(ctypes.Structure):
+    _fields_ = (("pt", POINT), ("mouseData", ctypes.c_ulong), ("flags", ctypes.c_ulong),
+                ("time", ctypes.c_ulong), ("dwExtraInfo", ctypes.c_void_p))
+
+
+LPMSLLHOOKSTRUCT = ctypes.POINTER(MSLLHOOKSTRUCT)
+_BUTTONS = {WM_LBUTTONDOWN: ("left", True), WM_LBUTTONUP: ("left", False),
+            WM_RBUTTONDOWN: ("right", True), WM_RBUTTONUP: ("right", False)}
+
+
+class HookListener:
+    """A pynput-style listener: every event is decoded and dispatched in Python."""
+    def __init__(self, on_edge):
+        self.on_edge = on_edge
+        self.on_move = lambda x, y, injected: None
+        self.events = 0
+        self._data = MSLLHOOKSTRUCT()
+        self._ptr = ctypes.addressof(self._data)
+
+    def handler(self, code, msg, lpdata):
+        self.events += 1
+        if code != 0:
+            return
+        data = ctypes.cast(lpdata, LPMSLLHOOKSTRUCT).contents
+        injected = bool(data.flags & LLMHF_INJECTED)
+        if msg == WM_MOUSEMOVE:
+            self.on_move(data.pt.x, data.pt.y, injected)
+        elif msg in _BUTTONS:
+            name, pressed = _BUTTONS[msg]
+            self.on_edge(name, pressed)
+
+    def flood(self, done, pending):
+        """Deliver RATE_HZ moves in bursts, plus any queued button messages."""
+        period = BURST / RATE_HZ
+        data = self._data
+        deadline = time.perf_counter()
+        i = 0
+        while not done.is_set():
+            for _ in range(BURST):
+                i += 1
+                data.pt.x = i & 1023
+                data.pt.y = (i >> 3) & 1023
+                self.handler(0, WM_MOUSEMOVE, self._ptr)
+            while pending:
+                self.handler(0, pending.pop(0), self._ptr)
+            deadline += period
+            delay = deadline - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+
+def _trial(kind, seconds):
+    rec = main.RecordingBackend(capacity=1 << 18)
+    sched = main.HybridScheduler()
+    sched.late_hist = main.Histogram()
+    trig = main.TriggerState()
+    worker = main.MotionWorker(lambda: PARAMS, rec, sched, trig)
+    done = threading.Event()
+    edge_lat = []
+    flood = source = hook = None
+
+    if kind == "hook":
+        hook = HookListener(trig.set_button)
+        pending = []
+        flood = threading.Thread(target=hook.flood, args=(done, pending), daemon=True)
+
+        def press(name, down):
+            msg = {("left", True): WM_LBUTTONDOWN, ("left", False): WM_LBUTTONUP,
+                   ("right", True): WM_RBUTTONDOWN, ("right", False): WM_RBUTTONUP}[name, down]
+            pending.append(msg)
+    elif kind == "poll":
+        source = main.SyntheticButtonSource()
+        source.start(trig.set_button)
+        press = source.set
+    else:
+        press = trig.set_button
+
+    def edge(name, down):
+        before = trig.edges
+        t = time.perf_counter()
+        press(name, down)
+        while trig.edges == before and time.perf_counter() - t < 1.0:
+            time.sleep(0.0001)
+        edge_lat.append((trig.last_edge - t) * 1e6)
+
+    worker.start()
+    if flood is not None:
+        flood.start()
+    try:
+        time.sleep(0.2)
+        c0, w0 = time.process_time(), time.perf_counter()
+        n0 = hook.events if hook else 0
+        edge("right", True)
+        edge("left", True)
+        time.sleep(seconds)
+        edge("left", False)
+        edge("right", False)
+        cpu = (time.process_time() - c0) / (time.perf_counter() - w0) * 100.0
+        wall = time.perf_counter() - w0
+        entries = (hook.events - n0) / wall if hook else (1.0 / source.poll_s if source else 0.0)
+    finally:
+        done.set()
+        if flood is not None:
+            flood.join()
+        if source is not None:
+            source.stop()
+        worker.stop()
+    late = sched.late_hist
+    edge_lat.sort()
+    return {
+        "cpu_pct": round(cpu, 1),
+        "late_p50_us": late.percentile(0.5),
+        "late_p99_us": late.percentile(0.99),
+        "late_max_us": round(late.max_us, 1),
+        "miss_pct": round(sched.misses / sched.waits * 100.0, 2) if sched.waits else None,
+        "python_entries_per_s": int(entries),
+        "edge_p50_us": round(edge_lat[len(edge_lat) // 2], 1),
+        "edge_max_us": round(edge_lat[-1], 1),
+    }
+
+
+def _send_moves(done, rate_hz):
+    """Child process: inject rate_hz relative moves that cancel out."""
+    backend = main.Win32SendInputBackend(batch_size=BURST)
+    period = BURST / rate_hz
+    deadline = time.perf_counter()
+    while not done.is_set():
+        for _ in range(BURST // 2):
+            backend.push(1, 0)
+            backend.push(-1, 0)
+        backend.flush()
+        deadline += period
+        delay = deadline - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def _make_source(kind, **kw):
+    if kind == "pynput":
+        return main.PynputButtonSource()
+    if kind == "win32":
+        return main.Win32ButtonSource(**kw)
+    return None
+
+
+def _idle_cpu(kind, seconds):
+    source = _make_source(kind)
+    if source is not None:
+        source.start(lambda name, pressed: None)
+    try:
+        time.sleep(0.2)
+        c0, w0 = time.process_time(), time.perf_counter()
+        time.sleep(seconds)
+        return round((time.process_time() - c0) / (time.perf_counter() - w0) * 100.0, 2)
+    finally:
+        if source is not None:
+            source.stop()
+
+
+def _windows_trial(kind, seconds):
+    rec = main.RecordingBackend(capacity=1 << 18)
+    sched = main.HybridScheduler()
+    sched.late_hist = main.Histogram()
+    trig = main.TriggerState()
+    worker = main.MotionWorker(lambda: PARAMS, rec, sched, trig)
+    stamps = []
+    source = _make_source(kind, idle_poll_s=main.PollingButtonSource.POLL_S)
+    if kind == "win32":
+        read = source.read
+
+        def timed_read():
+            stamps.append(time.perf_counter())
+            return read()
+        source.read = timed_read
+    done = multiprocessing.Event()
+    flood = None
+    if kind != "none":
+        flood = multiprocessing.Process(target=_send_moves, args=(done, RATE_HZ), daemon=True)
+        flood.start()
+        source.start(lambda name, pressed: None)
+    worker.start()
+    try:
+        time.sleep(0.3)
+        c0, w0 = time.process_time(), time.perf_counter()
+        trig.set_button("right", True)
+        trig.set_button("left", True)
+        time.sleep(seconds)
+        trig.set_button("left", False)
+        trig.set_button("right", False)
+        cpu = (time.process_time() - c0) / (time.perf_counter() - w0) * 100.0
+    finally:
+        done.set()
+        if source is not None:
+            source.stop()
+        if flood is not None:
+            flood.join(2.0)
+        worker.stop()
+    late = sched.late_hist
+    results = {
+        "idle_cpu_pct": _idle_cpu(kind, 1.0 if seconds < 5.0 else 3.0),
+        "cpu_pct": round(cpu, 1),
+        "late_p50_us": late.percentile(0.5),
+        "late_p99_us": late.percentile(0.99),
+        "late_max_us": round(late.max_us, 1),
+        "miss_pct": round(sched.misses / sched.waits * 100.0, 2) if sched.waits else None,
+    }
+    if len(stamps) > 1:
+        gaps = sorted((b - a) * 1e6 for a, b in zip(stamps, stamps[1:]))
+        results["poll_gap_p50_us"] = round(gaps[len(gaps) // 2], 1)
+        results["poll_gap_p99_us"] = round(gaps[min(len(gaps) - 1, int(0.99 * len(gaps)))], 1)
+        results["poll_gap_max_us"] = round(gaps[-1], 1)
+    return results
+
+
+def run(quick=False, simulate=None):
+    seconds = 1.5 if quick else 5.0
+    if simulate is None:
+        simulate = os.name != "nt"
+    trial = _trial if simulate else _windows_trial
+    kinds = ("none", "hook", "poll") if simulate else ("none", "pynput", "win32")
+    results = {"mode": "simulated" if simulate else "windows"}
+    for kind in kinds:
+        for k, v in trial(kind, seconds).items():
+            results[f"{kind}_{k}"] = v
+    return results
+
+
+def _cli():
+    simulate = True if "--simulate" in sys.argv else None
+    for k, v in run("--quick" in sys.argv, simulate).items():
+        print(f"{k:28s} {v}")
+
+
+if __name__ == "__main__":
+    _cli()
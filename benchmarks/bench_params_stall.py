@@ -0,0 +1,90 @@
+"""
+Worst-case parameter read stall on the worker thread during a resize storm.
+
+tk_vars   : the old RecoilApp._get_params — three Tk Variable.get() calls
+            from the worker, each marshalled through the Tcl interpreter
+snapshot  : the engine's ProfileSwitcher.current(), which the worker calls
+            for the published ParamSnapshot
+
+A worker thread reads parameters every ~1 ms while the Tk thread resizes
+the window continuously (background redraws included). Needs a display.
+
+    python benchmarks/bench_params_stall.py
+"""
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main  # noqa: E402
+
+
+def _old_get_params(app):
+    return {
+        "x": app.x_var.get(),
+        "y": app.y_var.get(),
+        "interval_ms": app.interval_var.get(),
+    }
+
+
+def _storm(app, reader, seconds):
+    stalls = []
+    done = threading.Event()
+
+    def worker():
+        while not done.is_set():
+            t = time.perf_counter()
+            reader()
+            stalls.append(time.perf_counter() - t)
+            time.sleep(0.001)
+
+    th = threading.Thread(target=worker, daemon=True)
+    th.start()
+    t_end = time.perf_counter() + seconds
+    i = 0
+    while time.perf_counter() < t_end:
+        w = 920 + (i * 37) % 700
+        h = 480 + (i * 23) % 400
+        app.geometry(f"{w}x{h}")
+        app.update()
+        i += 1
+    done.set()
+    # keep servicing Tcl so a worker blocked in Variable.get() can finish
+    while th.is_alive():
+        app.update()
+        th.join(0.01)
+    stalls.sort()
+    return {
+        "p99_us": round(stalls[int(len(stalls) * 0.99)] * 1e6, 1),
+        "max_us": round(stalls[-1] * 1e6, 1),
+        "reads": len(stalls),
+    }
+
+
+def run(quick=False):
+    seconds = 1.0 if quick else 3.0
+    try:
+        app = main.RecoilApp()
+    except main.tk.TclError as e:
+        print(f"[bench] skipped: {e}")
+        return {}
+    try:
+        app.update()
+        results = {}
+        for label, reader in (("tk_vars", lambda: _old_get_params(app)),
+                              ("snapshot", app.engine.switcher.current)):
+            for k, v in _storm(app, reader, seconds).items():
+                results[f"{label}_{k}"] = v
+        return results
+    finally:
+        app.destroy()
+
+
+def _cli():
+    for k, v in run("--quick" in sys.argv).items():
+        print(f"{k:24s} {v}")
+
+
+if __name__ == "__main__":
+    _cli()
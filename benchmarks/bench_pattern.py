@@ -0,0 +1,73 @@
+"""
+Per-step cost of pattern playback.
+
+accumulator : smooth_interval_move called once per segment (float DDA on
+              every microstep, as movement_loop did per interval)
+compiled    : compile_pattern once, then play_pattern's index walk
+
+Waits are stubbed out so only the per-step work is timed; moves go to a
+RecordingBackend. Patterns have 10, 100 and 1000 random segments.
+
+    python benchmarks/bench_pattern.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main  # noqa: E402
+
+
+class NoWaitScheduler:
+    clock = main.MONOTONIC
+
+    def sleep_until(self, deadline, waiter=None):
+        return True
+
+
+def make_segments(n, seed=1234):
+    rnd = random.Random(seed)
+    return [(rnd.uniform(-20, 20), rnd.uniform(-120, 10), rnd.choice((40, 80, 120, 250)))
+            for _ in range(n)]
+
+
+def run(quick=False):
+    sched = NoWaitScheduler()
+    results = {}
+    for n_seg in (10, 100, 1000):
+        segs = make_segments(n_seg)
+        steps = sum(max(1, int(d / 1000.0 * main.MICROSTEP_RATE_HZ)) for _, _, d in segs)
+        rec = main.RecordingBackend(capacity=steps + 16)
+        reps = max(1, (20_000 if quick else 200_000) // steps)
+
+        t0 = time.perf_counter()
+        for _ in range(reps):
+            rec.clear()
+            for dx, dy, d in segs:
+                main.smooth_interval_move(dx, dy, d / 1000.0, rec, sched)
+        acc_ns = (time.perf_counter() - t0) / (reps * steps) * 1e9
+
+        t0 = time.perf_counter()
+        pattern = main.compile_pattern(segs)
+        compile_ms = (time.perf_counter() - t0) * 1e3
+
+        t0 = time.perf_counter()
+        for _ in range(reps):
+            rec.clear()
+            main.play_pattern(pattern, rec, sched)
+        walk_ns = (time.perf_counter() - t0) / (reps * steps) * 1e9
+
+        results[f"seg{n_seg}_accumulator_ns_per_step"] = round(acc_ns, 1)
+        results[f"seg{n_seg}_compiled_ns_per_step"] = round(walk_ns, 1)
+        results[f"seg{n_seg}_compile_ms"] = round(compile_ms, 3)
+    return results
+
+
+def _cli():
+    for k, v in run("--quick" in sys.argv).items():
+        print(f"{k:36s} {v}")
+
+
+if __name__ == "__main__":
+    _cli()
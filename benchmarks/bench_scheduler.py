@@ -0,0 +1,104 @@
+"""
+Step-timing precision and CPU cost of the microstep wait.
+
+legacy   : the original inner loop of smooth_interval_move —
+           sleep(0.0015) while > 2 ms remain, then sleep(0) spinning
+hybrid   : HybridScheduler.sleep_until (calibrated coarse sleep + short spin)
+token    : the same, with the coarse phase going through CancelToken.wait as
+           it does in the engine, so a stop can cut it short
+
+All wait on the same 240 Hz deadline grid for the same wall time. Reports
+CPU seconds per active second (thread_time / wall) and lateness of each wake.
+
+timer_* is the overshoot of a bare 1 ms timed wait: time.sleep against a
+lock acquire with a timeout (what Event/Condition waits come down to). On
+Windows the lock timeout wakes on the ~15.6 ms system tick while time.sleep
+uses the high-resolution timer (Python 3.11+); run it there to see the
+difference the engine's sliced sleeps are for.
+
+    python benchmarks/bench_scheduler.py
+"""
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main  # noqa: E402
+
+
+def legacy_sleep_until(target):
+    while True:
+        now = time.perf_counter()
+        remaining = target - now
+        if remaining <= 0:
+            break
+        time.sleep(0.0015 if remaining > 0.002 else 0)
+
+
+def _measure(sleep_until, seconds):
+    period = 1.0 / main.MICROSTEP_RATE_HZ
+    steps = int(seconds / period)
+    late = []
+    cpu0 = time.thread_time()
+    t0 = time.perf_counter()
+    for i in range(1, steps + 1):
+        target = t0 + i * period
+        sleep_until(target)
+        late.append(time.perf_counter() - target)
+    wall = time.perf_counter() - t0
+    cpu = time.thread_time() - cpu0
+    late.sort()
+    pick = lambda q: late[min(len(late) - 1, int(q * len(late)))] * 1e6
+    return {
+        "cpu_per_active_s": round(cpu / wall, 4),
+        "late_p50_us": round(pick(0.50), 1),
+        "late_p99_us": round(pick(0.99), 1),
+        "late_max_us": round(late[-1] * 1e6, 1),
+    }
+
+
+def _overshoot(wait, n):
+    over = []
+    for _ in range(n):
+        t = time.perf_counter()
+        wait(0.001)
+        over.append(time.perf_counter() - t - 0.001)
+    over.sort()
+    return {
+        "p50_us": round(over[n // 2] * 1e6, 1),
+        "p99_us": round(over[min(n - 1, int(0.99 * n))] * 1e6, 1),
+    }
+
+
+def run(quick=False):
+    seconds = 0.5 if quick else 2.0
+    sched = main.HybridScheduler()
+    token_sched = main.HybridScheduler()
+    token = main.CancelToken()
+    results = {}
+    for label, fn in (("legacy", legacy_sleep_until), ("hybrid", sched.sleep_until),
+                      ("token", lambda target: token_sched.sleep_until(target, token.wait))):
+        for k, v in _measure(fn, seconds).items():
+            results[f"{label}_{k}"] = v
+    for label, s in (("hybrid", sched), ("token", token_sched)):
+        st = s.stats()
+        results[f"{label}_misses"] = st["misses"]
+        results[f"{label}_margin_us"] = st["margin_us"]
+
+    lock = threading.Lock()
+    lock.acquire()
+    n = 200 if quick else 1000
+    for label, wait in (("sleep", time.sleep), ("lock_timeout", lambda t: lock.acquire(True, t))):
+        for k, v in _overshoot(wait, n).items():
+            results[f"timer_{label}_{k}"] = v
+    return results
+
+
+def _cli():
+    for k, v in run("--quick" in sys.argv).items():
+        print(f"{k:28s} {v}")
+
+
+if __name__ == "__main__":
+    _cli()
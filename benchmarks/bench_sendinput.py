@@ -0,0 +1,116 @@
+"""
+Per-event cost of injecting mouse moves.
+
+legacy   : the original send_mouse_move_rel — fresh INPUT + MOUSEINPUT per
+           event, int() twice, sizeof(INPUT) and one SendInput(1, ...) each
+batched  : Win32SendInputBackend writing into its preallocated INPUT array,
+           flushed once per event (batch=1) or once per 8 due events
+
+SendInput itself is replaced by a ctypes callback with the real argtypes that
+forwards into a RecordingBackend, so the FFI boundary is still crossed and
+this runs on any platform.
+
+    python benchmarks/bench_sendinput.py
+"""
+import ctypes
+import os
+import sys
+import time
+import tracemalloc
+from ctypes import wintypes
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main  # noqa: E402
+
+SEND_INPUT_PROTO = ctypes.CFUNCTYPE(
+    wintypes.UINT, wintypes.UINT, ctypes.POINTER(main.INPUT), ctypes.c_int
+)
+
+
+def make_fake_send_input(rec):
+    def _send_input(n, p_inputs, _cb):
+        for i in range(n):
+            mi = p_inputs[i].mi
+            rec.push(mi.dx, mi.dy)
+        rec.flush()
+        return n
+    return SEND_INPUT_PROTO(_send_input)
+
+
+def legacy_sender(send_input):
+    INPUT, MOUSEINPUT = main.INPUT, main.MOUSEINPUT
+
+    def send_mouse_move_rel(dx, dy):
+        inp = INPUT()
+        inp.type = main.INPUT_MOUSE
+        inp.mi = MOUSEINPUT(dx=int(dx), dy=int(dy),
+                            mouseData=0, dwFlags=main.MOUSEEVENTF_MOVE,
+                            time=0, dwExtraInfo=None)
+        send_input(1, ctypes.byref(inp), ctypes.sizeof(INPUT))
+    return send_mouse_move_rel
+
+
+def _time_events(fn, n):
+    t0 = time.perf_counter()
+    fn(n)
+    return (time.perf_counter() - t0) / n * 1e9
+
+
+def _peak_bytes(fn, n):
+    tracemalloc.start()
+    try:
+        fn(64)  # warm caches outside the measurement
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        fn(n)
+        return tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+
+
+def run(quick=False):
+    n = 20_000 if quick else 200_000
+    rec = main.RecordingBackend(capacity=16)  # overflow is fine, only `dropped` grows
+    fake = make_fake_send_input(rec)
+
+    legacy = legacy_sender(fake)
+    batched = main.Win32SendInputBackend(batch_size=32, send_input=fake)
+
+    def run_legacy(k):
+        for _ in range(k):
+            legacy(1, -2)
+
+    def run_batched_1(k):
+        push, flush = batched.push, batched.flush
+        for _ in range(k):
+            push(1, -2)
+            flush()
+
+    def run_batched_8(k):
+        push, flush = batched.push, batched.flush
+        for i in range(k):
+            push(1, -2)
+            if i & 7 == 7:
+                flush()
+        flush()
+
+    results = {}
+    for label, fn in (("legacy", run_legacy),
+                      ("batched_x1", run_batched_1),
+                      ("batched_x8", run_batched_8)):
+        rec.clear()
+        fn(1000)
+        rec.clear()
+        results[f"{label}_ns_per_event"] = round(_time_events(fn, n), 1)
+        results[f"{label}_calls_per_event"] = round(rec.flushes / n, 3)
+        results[f"{label}_peak_alloc_bytes"] = _peak_bytes(fn, 1000)
+    return results
+
+
+def _cli():
+    for k, v in run("--quick" in sys.argv).items():
+        print(f"{k:32s} {v}")
+
+
+if __name__ == "__main__":
+    _cli()
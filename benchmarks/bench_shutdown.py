@@ -0,0 +1,124 @@
+"""
+Toggle-off latency: from stop being requested to the last injected move.
+
+legacy : the old toggle_off — one shared Event set, join(0.3), then
+         clear() whether or not the worker has exited; the worker's
+         pattern sleeps don't watch the Event
+worker : MotionWorker.stop() — per-run CancelToken that wakes every
+         wait, bounded join, a fresh token and thread for the next run
+
+Fire stays held through the stop (toggling off mid-spray) and for a
+while after it, so a worker that survives the stop shows up as moves
+recorded after the toggle. Profiles: a dense one (every microstep moves)
+and a sparse one (3 px over 2 s, so adaptive playback sleeps ~0.7 s
+between moves). Also reports how long stop() blocked and a restart.
+
+    python benchmarks/bench_shutdown.py
+"""
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main  # noqa: E402
+
+PROFILES = (
+    ("dense", main.ParamSnapshot(0.0, -60.0, 120)),
+    ("sparse", main.ParamSnapshot(0.0, 3.0, 2000)),
+)
+WATCH_S = 1.5   # how long fire stays held after the toggle
+
+
+class _LegacyStop:
+    """The old shared stop flag: no wait(), so sleeps can't be woken."""
+    def __init__(self):
+        self._e = threading.Event()
+        self.is_set = self._e.is_set
+        self.set = self._e.set
+        self.clear = self._e.clear
+
+
+class _Legacy:
+    def __init__(self, params, rec, sched, trig):
+        self.stop_flag = _LegacyStop()
+        self.args = (lambda: params, rec, sched, trig, self.stop_flag)
+        self.trig = trig
+        self.thread = None
+
+    def start(self):
+        if not (self.thread and self.thread.is_alive()):
+            self.stop_flag.clear()
+            self.thread = threading.Thread(target=main.movement_loop, args=self.args, daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        self.stop_flag.set()
+        self.trig.interrupt()
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=0.3)
+        self.stop_flag.clear()
+
+
+def _trial(kind, params, rnd):
+    rec = main.RecordingBackend(capacity=1 << 16)
+    sched = main.HybridScheduler()
+    trig = main.TriggerState()
+    if kind == "legacy":
+        w = _Legacy(params, rec, sched, trig)
+    else:
+        w = main.MotionWorker(lambda: params, rec, sched, trig)
+    w.start()
+    trig.set_button("right", True)
+    trig.set_button("left", True)
+    time.sleep(rnd.uniform(0.05, 0.3) + (0.6 if params.interval_ms > 1000 else 0.0))
+    t_off = time.perf_counter()
+    w.stop()
+    blocked = time.perf_counter() - t_off
+    thread = w.thread
+    time.sleep(WATCH_S)
+    n = rec.count
+    last = max((rec.t[i] for i in range(n) if rec.t[i] >= t_off), default=t_off)
+    after = sum(1 for i in range(n) if rec.t[i] >= t_off)
+    trig.set_button("left", False)
+    trig.set_button("right", False)
+
+    # restart right away: does a fresh run come up, and is the old one gone?
+    t_on = time.perf_counter()
+    w.start()
+    restart = time.perf_counter() - t_on
+    reused = w.thread is thread
+    if kind == "legacy":
+        w.stop_flag.set()
+        trig.interrupt()
+        w.thread.join(3.0)
+    else:
+        w.stop()
+    return (last - t_off) * 1e3, after, blocked * 1e3, restart * 1e3, reused
+
+
+def run(quick=False):
+    trials = 3 if quick else 10
+    rnd = random.Random(5)
+    results = {}
+    for label, params in PROFILES:
+        for kind in ("legacy", "worker"):
+            rows = [_trial(kind, params, rnd) for _ in range(trials)]
+            lasts = sorted(r[0] for r in rows)
+            results[f"{label}_{kind}_off_to_last_move_p50_ms"] = round(lasts[len(lasts) // 2], 2)
+            results[f"{label}_{kind}_off_to_last_move_max_ms"] = round(lasts[-1], 2)
+            results[f"{label}_{kind}_moves_after_off_max"] = max(r[1] for r in rows)
+            results[f"{label}_{kind}_stop_blocked_max_ms"] = round(max(r[2] for r in rows), 2)
+            results[f"{label}_{kind}_restart_ms"] = round(max(r[3] for r in rows), 2)
+            results[f"{label}_{kind}_restart_reused_thread"] = sum(r[4] for r in rows)
+    return results
+
+
+def _cli():
+    for k, v in run("--quick" in sys.argv).items():
+        print(f"{k:44s} {v}")
+
+
+if __name__ == "__main__":
+    _cli()
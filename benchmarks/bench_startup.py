@@ -0,0 +1,108 @@
+"""
+Startup cost of main.py.
+
+import    : cumulative `import main` time from `python -X importtime`
+            (median of several fresh interpreters), and whether PIL, pynput
+            or the Tk dialogs got pulled in by the import
+window    : wall time from spawning the interpreter to the first <Map> of
+            RecoilApp's window (needs a display; skipped otherwise)
+
+Exits non-zero if either number exceeds its threshold:
+
+    python benchmarks/bench_startup.py [--max-import-ms 150] [--max-window-ms 1500]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY = ("PIL", "pynput", "tkinter.messagebox", "tkinter.simpledialog")
+
+_WINDOW_PROBE = r"""
+import sys, time
+import main
+try:
+    app = main.RecoilApp()
+except main.tk.TclError as e:
+    print("skip", e)
+    sys.exit(0)
+def mapped(_e=None):
+    print("mapped", time.time(), flush=True)
+    app.after(0, app.destroy)
+app.bind("<Map>", mapped)
+app.mainloop()
+"""
+
+
+def _import_ms():
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         "import sys, main; print(','.join(m for m in %r if m in sys.modules))" % (HEAVY,)],
+        cwd=ROOT, capture_output=True, text=True, check=True)
+    ms = None
+    for line in out.stderr.splitlines():
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == "main":
+            ms = int(parts[1]) / 1000.0
+    heavy = [m for m in out.stdout.strip().split(",") if m]
+    return ms, heavy
+
+
+def _window_ms():
+    t0 = time.time()
+    out = subprocess.run([sys.executable, "-c", _WINDOW_PROBE], cwd=ROOT,
+                         capture_output=True, text=True, timeout=30)
+    for line in out.stdout.splitlines():
+        if line.startswith("skip"):
+            print(f"[bench] window skipped: {line[5:]}")
+            return None
+        if line.startswith("mapped"):
+            return (float(line.split()[1]) - t0) * 1e3
+    return None
+
+
+def run(quick=False):
+    samples = []
+    heavy = []
+    for _ in range(3 if quick else 7):
+        ms, heavy = _import_ms()
+        samples.append(ms)
+    results = {
+        "import_main_ms": round(statistics.median(samples), 2),
+        "heavy_modules_at_import": len(heavy),
+    }
+    win = _window_ms()
+    if win is not None:
+        results["first_window_ms"] = round(win, 1)
+    return results
+
+
+def _arg(name, default):
+    if name in sys.argv:
+        return float(sys.argv[sys.argv.index(name) + 1])
+    return default
+
+
+def _cli():
+    max_import = _arg("--max-import-ms", 150.0)
+    max_window = _arg("--max-window-ms", 1500.0)
+    res = run("--quick" in sys.argv)
+    for k, v in res.items():
+        print(f"{k:28s} {v}")
+    failed = []
+    if res["import_main_ms"] > max_import:
+        failed.append(f"import {res['import_main_ms']} ms > {max_import} ms")
+    if res["heavy_modules_at_import"]:
+        failed.append("heavy modules imported at startup")
+    if res.get("first_window_ms", 0) > max_window:
+        failed.append(f"first window {res['first_window_ms']} ms > {max_window} ms")
+    if failed:
+        print("REGRESSION: " + "; ".join(failed))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    _cli()
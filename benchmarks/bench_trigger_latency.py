@@ -0,0 +1,132 @@
+"""
+Wake latency from a button edge to the worker noticing it.
+
+poll     : the original movement_loop waits — module flags checked every
+           4 ms (idle) / 2 ms (armed) with time.sleep
+event    : TriggerState, where on_button_edge notifies a Condition
+
+Synthetic right/left presses are fed from this thread; the waiter records
+perf_counter() when it wakes. Also reports the waiter's CPU use while idle.
+
+    python benchmarks/bench_trigger_latency.py
+"""
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main  # noqa: E402
+
+
+class _Button:
+    def __init__(self, name):
+        self.name = name
+
+
+RIGHT = _Button("right")
+LEFT = _Button("left")
+
+
+def _percentiles(samples_s):
+    xs = sorted(samples_s)
+    pick = lambda q: xs[min(len(xs) - 1, int(q * len(xs)))] * 1e6
+    return {"p50_us": round(pick(0.50), 1),
+            "p99_us": round(pick(0.99), 1),
+            "max_us": round(xs[-1] * 1e6, 1)}
+
+
+def _poll_trial(trials):
+    """Replica of the old sleep-poll loop driven by plain globals."""
+    state = {"right": False, "left": False, "stop": False}
+    woke = []
+
+    def worker():
+        while not state["stop"]:
+            while not state["right"] and not state["stop"]:
+                time.sleep(0.004)
+            while state["right"] and not state["left"] and not state["stop"]:
+                time.sleep(0.002)
+            if state["right"] and state["left"]:
+                woke.append(time.perf_counter())
+            while state["right"] and not state["stop"]:
+                time.sleep(0.002)
+
+    return _drive(worker, trials, woke,
+                  press=lambda: (state.__setitem__("right", True),
+                                 state.__setitem__("left", True)),
+                  release=lambda: (state.__setitem__("left", False),
+                                   state.__setitem__("right", False)),
+                  stop=lambda: state.__setitem__("stop", True))
+
+
+def _event_trial(trials):
+    trig = main.TriggerState()
+    stop = threading.Event()
+    woke = []
+
+    def worker():
+        while not stop.is_set():
+            if not trig.wait_armed(stop):
+                continue
+            if trig.wait_fire(stop):
+                woke.append(time.perf_counter())
+                trig.wait_release(stop, None)
+
+    def press():
+        trig.set_button("right", True)
+        trig.set_button("left", True)
+
+    def release():
+        trig.set_button("left", False)
+        trig.set_button("right", False)
+
+    def halt():
+        stop.set()
+        trig.interrupt()
+
+    return _drive(worker, trials, woke, press, release, halt)
+
+
+def _drive(worker, trials, woke, press, release, stop):
+    th = threading.Thread(target=worker, daemon=True)
+    cpu0 = time.process_time()
+    th.start()
+    time.sleep(0.25)
+    idle_cpu = (time.process_time() - cpu0) / 0.25
+
+    lat = []
+    for i in range(trials):
+        time.sleep(0.003 + (i % 7) * 0.0007)  # de-phase from the poll period
+        n = len(woke)
+        t_edge = time.perf_counter()
+        press()
+        deadline = t_edge + 0.1
+        while len(woke) == n and time.perf_counter() < deadline:
+            time.sleep(0)
+        if len(woke) > n:
+            lat.append(woke[n] - t_edge)
+        release()
+    stop()
+    th.join(1.0)
+    out = _percentiles(lat)
+    out["idle_cpu_pct"] = round(idle_cpu * 100, 2)
+    return out
+
+
+def run(quick=False):
+    trials = 60 if quick else 300
+    results = {}
+    for label, fn in (("poll", _poll_trial), ("event", _event_trial)):
+        for k, v in fn(trials).items():
+            results[f"{label}_{k}"] = v
+    return results
+
+
+def _cli():
+    for k, v in run("--quick" in sys.argv).items():
+        print(f"{k:24s} {v}")
+
+
+if __name__ == "__main__":
+    _cli()
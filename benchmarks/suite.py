@@ -0,0 +1,396 @@
+"""
+Hot-path benchmark suite with a stored baseline and regression gating.
+
+Cases (all on a RecordingBackend, so it runs on Linux without a desktop):
+
+send      : send_mouse_move_rel call overhead through the installed backend
+dda       : smooth_interval_move's DDA loop, ns per microstep (waits stubbed)
+wake      : movement_loop wake latency, LEFT press -> first injected move
+cover_fit : ImageBackground._cover_fit from the screen-sized working copy
+            at common window sizes (skipped without PIL)
+configs   : list_configs / load_config at 10, 1k and 10k profiles
+alloc     : traced-memory growth and transient peak of the warmed-up fire
+            path (worst case over bench_alloc's profiles); any net growth
+            fails against a baseline of 0
+
+Timings are the best of several repeats, each averaging many calls (a
+config change and reload is repeated per sample too), latencies are
+percentiles over many samples; lower is better for every metric. Each
+run also times a fixed pure-Python reference loop, and CPU-bound metrics
+are scaled by the reference ratio before comparing, so a baseline
+survives a slower or throttled machine. The results are written as JSON
+and compared with benchmarks/baseline.json.
+A metric counts as a regression when it exceeds its baseline by more than
+--tolerance; the baseline's "tolerance" map can widen it for noisy keys,
+matched by key prefix (null there means report only). Both the baseline
+and a check combine --runs full runs (default 3): the baseline keeps each
+metric's median, a check its best run, so only a slowdown that shows up
+in every run fails.
+
+    python benchmarks/suite.py                      # run, compare, exit 1 on regression
+    python benchmarks/suite.py --out results.json   # also keep the results
+    python benchmarks/suite.py --update-baseline    # accept the current numbers
+    python benchmarks/suite.py --only send dda --tolerance 0.5 --runs 3
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+import main  # noqa: E402
+from bench_configs import populate, age_dir  # noqa: E402
+from bench_pattern import NoWaitScheduler  # noqa: E402
+from bench_alloc import alloc_cases  # noqa: E402
+
+BASELINE = os.path.join(HERE, "baseline.json")
+WINDOW_SIZES = ((980, 620), (1280, 720), (1600, 900), (1920, 1080))
+
+
+def _best(fn, repeats):
+    # CPU-bound timings only ever get slower from interference, so the
+    # fastest repeat is the stable estimate
+    return min(fn() for _ in range(repeats))
+
+
+def reference_ns():
+    """ns per iteration of a fixed interpreter-bound loop: the machine-speed yardstick."""
+    def once():
+        t0 = time.perf_counter()
+        acc = 0
+        for i in range(100_000):
+            acc += i & 7
+        return (time.perf_counter() - t0) / 100_000 * 1e9
+    return round(_best(once, 15), 2)
+
+
+def _percentile(sorted_samples, q):
+    return sorted_samples[min(len(sorted_samples) - 1, int(len(sorted_samples) * q))]
+
+
+def case_send(quick):
+    calls = 20_000
+    rec = main.RecordingBackend(capacity=calls)
+    prev = main.set_injection_backend(rec)
+    send = main.send_mouse_move_rel
+    try:
+        def once():
+            rec.clear()
+            t0 = time.perf_counter()
+            for _ in range(calls):
+                send(1, -2)
+            return (time.perf_counter() - t0) / calls * 1e9
+        return {"send_ns_per_call": round(_best(once, 5 if quick else 15), 1)}
+    finally:
+        main.set_injection_backend(prev)
+
+
+def case_dda(quick):
+    sched = NoWaitScheduler()
+    stop = threading.Event()
+    interval_s = 0.5
+    steps = int(interval_s * main.MICROSTEP_RATE_HZ)
+    rec = main.RecordingBackend(capacity=steps * 16)
+
+    def once():
+        rec.clear()
+        t0 = time.perf_counter()
+        for _ in range(16):
+            main.smooth_interval_move(7.0, -93.0, interval_s, rec, sched, stop)
+        return (time.perf_counter() - t0) / (16 * steps) * 1e9
+    return {"dda_ns_per_step": round(_best(once, 5 if quick else 15), 1)}
+
+
+def case_wake(quick):
+    rec = main.RecordingBackend(capacity=1 << 16)
+    sched = main.HybridScheduler()
+    trig = main.TriggerState()
+    stop = threading.Event()
+    # a short interval: a pattern plays out after release, so each sample
+    # waits for the last one to finish before pressing again
+    params = main.ParamSnapshot(0.0, -50.0, 20)
+    th = threading.Thread(target=main.movement_loop,
+                          args=(lambda: params, rec, sched, trig, stop), daemon=True)
+    th.start()
+    samples = []
+    try:
+        for _ in range(40 if quick else 200):
+            trig.set_button("right", True)
+            time.sleep(0.003)
+            before = rec.count
+            t_edge = time.perf_counter()
+            trig.set_button("left", True)
+            deadline = t_edge + 1.0
+            while rec.count == before and time.perf_counter() < deadline:
+                time.sleep(0.0002)
+            if rec.count > before:
+                samples.append((rec.t[before] - t_edge) * 1e6)
+            trig.set_button("left", False)
+            trig.set_button("right", False)
+            time.sleep(params.pattern.duration_s + 0.005)
+            if rec.count > rec.capacity // 2:
+                rec.clear()
+    finally:
+        stop.set()
+        trig.interrupt()
+        th.join(1.0)
+    samples.sort()
+    return {
+        "wake_p50_us": round(_percentile(samples, 0.5), 1),
+        "wake_p99_us": round(_percentile(samples, 0.99), 1),
+    }
+
+
+def case_cover_fit(quick):
+    try:
+        from PIL import Image
+    except ImportError:
+        print("[suite] cover_fit skipped: PIL not installed", file=sys.stderr)
+        return {}
+    src = Image.effect_noise((3840, 2160), 48).convert("RGB")
+    work = main.ImageBackground._working_copy(src, 1920, 1080)
+    out = {}
+    for w, h in WINDOW_SIZES:
+        def once():
+            t0 = time.perf_counter()
+            main.ImageBackground._cover_fit(work, w, h)
+            return (time.perf_counter() - t0) * 1e3
+        out[f"cover_fit_{w}x{h}_ms"] = round(_best(once, 5 if quick else 11), 3)
+    return out
+
+
+def case_configs(quick):
+    out = {}
+    saved = main.config_store
+    try:
+        for n in ((10, 1000) if quick else (10, 1000, 10_000)):
+            d = tempfile.mkdtemp(prefix="recoil-suite-")
+            try:
+                populate(d, n)
+                main.config_store = main.ConfigStore(d)
+                names = main.list_configs()
+                probe = names[len(names) // 2]
+                reps = max(20, 20_000 // n)
+                # one change + reload per sample is mostly timer and page
+                # cache noise, so each sample averages several cycles; only
+                # the call after the change is timed
+                cycles = max(5, 2_000 // n)
+
+                def listed():
+                    t0 = time.perf_counter()
+                    for _ in range(reps):
+                        main.list_configs()
+                    return (time.perf_counter() - t0) / reps * 1e6
+
+                def changed():
+                    p = os.path.join(d, "zz new.json")
+                    dt = 0.0
+                    for _ in range(cycles):
+                        with open(p, "w") as f:
+                            f.write("{}")
+                        age_dir(d)
+                        t0 = time.perf_counter()
+                        main.list_configs()
+                        dt += time.perf_counter() - t0
+                        os.remove(p)
+                        age_dir(d)
+                        main.list_configs()
+                    return dt / cycles * 1e6
+
+                def loaded():
+                    main.load_config(probe)
+                    t0 = time.perf_counter()
+                    for _ in range(200):
+                        main.load_config(probe)
+                    return (time.perf_counter() - t0) / 200 * 1e6
+
+                def reparsed():
+                    # file grown by a byte before each load: forces a stat + parse
+                    main.save_config(probe, {"x": 1, "y": -40.0, "interval_ms": 120})
+                    path = os.path.join(d, f"{probe}.json")
+                    dt = 0.0
+                    for _ in range(100):
+                        with open(path, "a") as f:
+                            f.write(" ")
+                        t0 = time.perf_counter()
+                        main.load_config(probe)
+                        dt += time.perf_counter() - t0
+                    return dt / 100 * 1e6
+
+                r = 5 if quick else 15
+                out[f"configs_n{n}_list_us"] = round(_best(listed, r), 2)
+                out[f"configs_n{n}_list_changed_us"] = round(_best(changed, r), 1)
+                out[f"configs_n{n}_load_us"] = round(_best(loaded, r), 2)
+                out[f"configs_n{n}_load_changed_us"] = round(_best(reparsed, r), 1)
+            finally:
+                shutil.rmtree(d, ignore_errors=True)
+    finally:
+        main.config_store = saved
+    return out
+
+
+def case_alloc(quick):
+    out, _ = alloc_cases(quick)
+    return {
+        "alloc_net_bytes": max(v for k, v in out.items() if k.endswith("_net_bytes")),
+        "alloc_transient_bytes": max(v for k, v in out.items() if k.endswith("_transient_bytes")),
+    }
+
+
+# scaled by the reference ratio when comparing; wake latency is mostly OS
+# scheduling and the configs timings mostly stat/listdir/open, so those are
+# compared as measured
+CPU_BOUND = ("send_", "dda_", "cover_fit_")
+
+CASES = {
+    "send": case_send,
+    "dda": case_dda,
+    "wake": case_wake,
+    "cover_fit": case_cover_fit,
+    "configs": case_configs,
+    "alloc": case_alloc,
+}
+
+
+def run(quick=False, only=None):
+    results = {}
+    for name, fn in CASES.items():
+        if only and name not in only:
+            continue
+        results.update(fn(quick))
+    return results
+
+
+def meta(quick, ref):
+    return {
+        "reference_ns": ref,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "quick": bool(quick),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def compare(results, baseline, tolerance, ref=None):
+    """
+    Rows of (key, base, new, ratio, limit, status) plus the regressed keys.
+    With `ref` (this run's reference_ns) and one in the baseline's meta,
+    CPU-bound ratios are divided by the machine-speed ratio.
+    """
+    base = baseline.get("results", {})
+    base_ref = baseline.get("meta", {}).get("reference_ns")
+    speed = ref / base_ref if ref and base_ref else 1.0
+    overrides = baseline.get("tolerance", {})
+    rows, regressed = [], []
+    for key in sorted(set(results) | set(base)):
+        new, old = results.get(key), base.get(key)
+        if new is None:
+            rows.append((key, old, None, None, None, "skipped"))
+            continue
+        if old is None:
+            rows.append((key, None, new, None, None, "new"))
+            continue
+        tol = tolerance
+        for prefix, t in overrides.items():
+            if key.startswith(prefix):
+                tol = t
+        if tol is None:
+            rows.append((key, old, new, new / old if old else None, None, "info"))
+            continue
+        ratio = new / old if old else float("inf") if new else 1.0
+        if key.startswith(CPU_BOUND):
+            ratio /= speed
+        status = "ok"
+        if ratio > 1.0 + tol:
+            status = "REGRESSED"
+            regressed.append(key)
+        elif ratio < 1.0 - tol:
+            status = "improved"
+        rows.append((key, old, new, ratio, 1.0 + tol, status))
+    return rows, regressed
+
+
+def _cli():
+    ap = argparse.ArgumentParser(description="hot-path benchmark suite")
+    ap.add_argument("--quick", action="store_true", help="fewer repeats and sizes")
+    ap.add_argument("--only", nargs="+", choices=sorted(CASES), help="run just these cases")
+    ap.add_argument("--out", metavar="PATH", help="write the results JSON here")
+    ap.add_argument("--baseline", metavar="PATH", default=BASELINE)
+    ap.add_argument("--tolerance", type=float, default=0.25,
+                    help="allowed slowdown as a fraction of the baseline (default 0.25)")
+    ap.add_argument("--update-baseline", action="store_true",
+                    help="write these results as the new baseline instead of comparing")
+    ap.add_argument("--runs", type=int, default=3, help="full runs to combine (default 3)")
+    args = ap.parse_args()
+
+    runs = max(1, args.runs)
+    refs, samples = [], {}
+    for _ in range(runs):
+        refs.append(reference_ns())
+        for k, v in run(args.quick, args.only).items():
+            samples.setdefault(k, []).append(v)
+        refs.append(reference_ns())
+    if args.update_baseline:
+        ref = statistics.median(refs)
+        results = {k: statistics.median(v) for k, v in samples.items()}
+    else:
+        ref = min(refs)
+        results = {k: min(v) for k, v in samples.items()}
+    doc = {"meta": meta(args.quick, ref), "results": results}
+    doc["meta"]["runs"] = runs
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(doc, f, indent=2, sort_keys=True)
+
+    if args.update_baseline:
+        prev = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                prev = json.load(f)
+        results = dict(prev.get("results", {})) if args.only else {}
+        results.update(doc["results"])
+        out = {"meta": doc["meta"], "tolerance": prev.get("tolerance", {}), "results": results}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(out, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"[suite] baseline written to {args.baseline} ({len(results)} metrics)")
+        return
+
+    if not args.out:
+        print(json.dumps(doc, indent=2, sort_keys=True))
+    if not os.path.exists(args.baseline):
+        print(f"[suite] no baseline at {args.baseline}; run with --update-baseline", file=sys.stderr)
+        return
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("meta", {}).get("quick") != bool(args.quick):
+        print("[suite] warning: baseline was recorded with a different --quick setting", file=sys.stderr)
+    if args.only:
+        baseline["results"] = {k: v for k, v in baseline.get("results", {}).items()
+                               if k in doc["results"]}
+    base_ref = baseline.get("meta", {}).get("reference_ns")
+    if base_ref:
+        print(f"[suite] machine speed vs baseline: x{base_ref / ref:.2f}", file=sys.stderr)
+    rows, regressed = compare(doc["results"], baseline, args.tolerance, ref)
+    for key, old, new, ratio, limit, status in rows:
+        r = f"x{ratio:.2f}" if ratio is not None else ""
+        if limit is not None:
+            r += f" (limit x{limit:.2f})"
+        print(f"{key:34s} {old if old is not None else '-':>12} -> "
+              f"{new if new is not None else '-':<12} {r:24s} {status}", file=sys.stderr)
+    if regressed:
+        print(f"[suite] {len(regressed)} regressions: {', '.join(regressed)}", file=sys.stderr)
+        sys.exit(1)
+    print("[suite] no regressions", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    _cli()
@@ -1,16 +1,53 @@
 import os
+import gc
 import json
 import re
 import threading
 import time
+import math
+import importlib
+import functools
+import heapq
+import sys
+import csv
+import bisect
+import struct
+import mmap
+import tempfile
+import argparse
+import select
+import ipaddress
+import socket
+import stat
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
+from tkinter import ttk
 from tkinter import StringVar, DoubleVar, IntVar
+from array import array
+from collections import OrderedDict, Counter
 
-from pynput import mouse, keyboard
 import ctypes
 from ctypes import wintypes
-from PIL import Image, ImageTk
+
+class _LazyModule:
+    """
+    Stand-in that imports the real module on first attribute access.
+    Keeps PIL and the Tk dialogs off the startup path until they're used.
+    """
+    def __init__(self, name):
+        self._name = name
+        self._mod = None
+
+    def __getattr__(self, attr):
+        mod = self._mod
+        if mod is None:
+            mod = self._mod = importlib.import_module(self._name)
+        return getattr(mod, attr)
+
+Image         = _LazyModule("PIL.Image")
+ImageTk       = _LazyModule("PIL.ImageTk")
+messagebox    = _LazyModule("tkinter.messagebox")
+simpledialog  = _LazyModule("tkinter.simpledialog")
+filedialog    = _LazyModule("tkinter.filedialog")
 
 # ===================== Win32 SendInput =====================
 ULONG_PTR = ctypes.POINTER(ctypes.c_ulong)
@@ -31,50 +68,745 @@ class INPUT(ctypes.Structure):
     _anonymous_ = ("i",)
     _fields_ = (("type", wintypes.DWORD), ("i", _I))
 
-SendInput = ctypes.windll.user32.SendInput
-SendInput.argtypes = (wintypes.UINT, ctypes.POINTER(INPUT), ctypes.c_int)
-SendInput.restype  = wintypes.UINT
-
 INPUT_MOUSE = 0
 MOUSEEVENTF_MOVE = 0x0001
 
+def _bind_send_input():
+    """Resolve user32.SendInput; only exists on Windows."""
+    fn = ctypes.windll.user32.SendInput
+    fn.argtypes = (wintypes.UINT, ctypes.POINTER(INPUT), ctypes.c_int)
+    fn.restype  = wintypes.UINT
+    return fn
+
+# ===================== Injection backends =====================
+class InjectionBackend:
+    """
+    Where relative mouse moves end up. The motion engine queues moves with
+    push() and hands them off with flush(), so several microsteps that fall
+    due together go out in one call. move_rel() is push + flush.
+    """
+    name = "base"
+
+    def push(self, dx, dy):
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def move_rel(self, dx, dy):
+        self.push(int(dx), int(dy))
+        self.flush()
+
+    def close(self):
+        pass
+
+class Win32SendInputBackend(InjectionBackend):
+    """
+    SendInput from one (INPUT * batch_size) array allocated up front. Queued
+    moves are written into the array in place and flushed with a single
+    SendInput(n, ...) call; the structs are never rebuilt per event.
+    """
+    name = "win32"
+
+    def __init__(self, batch_size=32, send_input=None):
+        self._send_input = send_input or _bind_send_input()
+        self.batch_size = max(1, int(batch_size))
+        self._buf = (INPUT * self.batch_size)()
+        self._cb = ctypes.sizeof(INPUT)
+        for inp in self._buf:
+            inp.type = INPUT_MOUSE
+            inp.mi.dwFlags = MOUSEEVENTF_MOVE
+        # views into the array; assigning dx/dy on these writes in place
+        self._mi = [inp.mi for inp in self._buf]
+        self._n = 0
+
+    def push(self, dx, dy):
+        n = self._n
+        mi = self._mi[n]
+        mi.dx = dx
+        mi.dy = dy
+        n += 1
+        self._n = n
+        if n == self.batch_size:
+            self.flush()
+
+    def flush(self):
+        n = self._n
+        if n:
+            self._n = 0
+            self._send_input(n, self._buf, self._cb)
+
+class NullBackend(InjectionBackend):
+    """Swallows every move; handy for measuring pure engine overhead."""
+    name = "null"
+
+    def push(self, dx, dy):
+        pass
+
+    def move_rel(self, dx, dy):
+        pass
+
+class RecordingBackend(InjectionBackend):
+    """
+    Stores (timestamp, dx, dy) for every move in preallocated arrays so the
+    recording itself doesn't allocate per event. Once full, further moves are
+    counted in `dropped` but not stored.
+    """
+    name = "recording"
+
+    def __init__(self, capacity=65536, clock=time.perf_counter):
+        self.capacity = int(capacity)
+        self._clock = clock
+        self.t  = array("d", bytes(8 * self.capacity))
+        self.dx = array("l", [0]) * self.capacity
+        self.dy = array("l", [0]) * self.capacity
+        self.count = 0
+        self.dropped = 0
+        self.flushes = 0
+
+    def push(self, dx, dy):
+        i = self.count
+        if i >= self.capacity:
+            self.dropped += 1
+            return
+        self.t[i] = self._clock()
+        self.dx[i] = int(dx)
+        self.dy[i] = int(dy)
+        self.count = i + 1
+
+    def flush(self):
+        self.flushes += 1
+
+    def clear(self):
+        self.count = 0
+        self.dropped = 0
+        self.flushes = 0
+
+    def events(self):
+        """Recorded moves as a list of (timestamp, dx, dy) tuples."""
+        n = self.count
+        return list(zip(self.t[:n], self.dx[:n], self.dy[:n]))
+
+    def total(self):
+        n = self.count
+        return sum(self.dx[:n]), sum(self.dy[:n])
+
+def default_backend() -> InjectionBackend:
+    if os.name == "nt":
+        return Win32SendInputBackend()
+    print("[input] SendInput unavailable on this platform — using null backend")
+    return NullBackend()
+
+_backend = None
+
+def get_injection_backend() -> InjectionBackend:
+    global _backend
+    if _backend is None:
+        _backend = default_backend()
+    return _backend
+
+def set_injection_backend(backend: InjectionBackend) -> InjectionBackend:
+    """Install `backend` for the engine; returns the previous one (may be None)."""
+    global _backend
+    prev, _backend = _backend, backend
+    return prev
+
 def send_mouse_move_rel(dx, dy):
-    inp = INPUT()
-    inp.type = INPUT_MOUSE
-    inp.mi = MOUSEINPUT(dx=int(dx), dy=int(dy),
-                        mouseData=0, dwFlags=MOUSEEVENTF_MOVE,
-                        time=0, dwExtraInfo=None)
-    SendInput(1, ctypes.byref(inp), ctypes.sizeof(INPUT))
+    get_injection_backend().move_rel(dx, dy)
+
+# ===================== Clocks =====================
+class MonotonicClock:
+    """Real time: perf_counter, time.sleep and plain condition waits."""
+    virtual = False
+    now = staticmethod(time.perf_counter)
+    sleep = staticmethod(time.sleep)
+
+    @staticmethod
+    def wait_for(cond, predicate, timeout=None):
+        return cond.wait_for(predicate, timeout)
+
+MONOTONIC = MonotonicClock()
+
+# Timed waits on the motion path sleep with clock.sleep in slices of at most
+# this, checking their flag in between, instead of a lock/Event timeout: on
+# Windows only time.sleep gets the high-resolution timer, while a timed
+# acquire wakes on the ~15.6 ms system tick. A flag set mid-slice is seen
+# within WAIT_SLICE_S.
+WAIT_SLICE_S = 0.002
+
+class VirtualClock:
+    """
+    Simulated time for driving the engine without waiting on it. sleep()
+    jumps straight to the wake-up time, running any scheduled callbacks
+    (e.g. scripted button edges) on the way; wait_for() jumps to the next
+    callback until the predicate holds or the timeout is reached.
+    Single-threaded: everything runs on the thread that drives the clock.
+    """
+    virtual = True
+    TICK = 1e-9    # sleep(0) still has to move time forward for spin loops
+
+    def __init__(self, start=0.0):
+        self.t = start
+        self._events = []   # heap of (t, seq, fn)
+        self._seq = 0
+
+    def now(self):
+        return self.t
+
+    def at(self, t, fn):
+        heapq.heappush(self._events, (t, self._seq, fn))
+        self._seq += 1
+
+    def _advance(self, target):
+        events = self._events
+        while events and events[0][0] <= target:
+            te, _, fn = heapq.heappop(events)
+            if te > self.t:
+                self.t = te
+            fn()
+        if target > self.t:
+            self.t = target
+
+    def sleep(self, s):
+        self._advance(self.t + (s if s > 0 else self.TICK))
+
+    def wait_for(self, cond, predicate, timeout=None):
+        deadline = math.inf if timeout is None else self.t + timeout
+        while not predicate():
+            if not self._events or self._events[0][0] > deadline:
+                if deadline == math.inf:
+                    raise RuntimeError("virtual clock: waiting forever with nothing scheduled")
+                self._advance(deadline)
+                return predicate()
+            self._advance(self._events[0][0])
+        return True
+
+# ===================== Step scheduler =====================
+class HybridScheduler:
+    """
+    Deadline waits for the motion loops: sleep coarsely until `margin` before
+    the deadline, then spin for the rest. The margin starts from a startup
+    calibration of how far this OS overshoots short sleeps and keeps learning
+    from every coarse sleep (grows quickly, shrinks slowly) and decays on
+    waits that only spin, so it can't settle above the step period.
+    """
+    MIN_MARGIN = 0.00015
+    MAX_MARGIN = 0.002      # under half a 240 Hz microstep: every step keeps a coarse sleep
+    OUTLIER_S = 0.002       # overshoot beyond this is a preemption, not the timer
+
+    def __init__(self, margin=None, miss_tolerance=0.0005, clock=None):
+        self.clock = clock or MONOTONIC
+        # virtual time sleeps exactly: no margin to calibrate or learn
+        self._adaptive = not self.clock.virtual
+        if not self._adaptive:
+            margin = 0.0
+        else:
+            if margin is None:
+                margin = self.calibrate()
+            margin = min(self.MAX_MARGIN, max(self.MIN_MARGIN, margin))
+        self.margin = margin
+        self.miss_tolerance = miss_tolerance
+        self.late_hist = None      # optional Histogram of every wait's lateness (us)
+        self.reset_stats()
+
+    @staticmethod
+    def calibrate(samples=24, request_s=0.001):
+        """Overshoot of time.sleep(request_s), ~90th percentile plus a pad."""
+        over = []
+        for _ in range(samples):
+            t = time.perf_counter()
+            time.sleep(request_s)
+            over.append(time.perf_counter() - t - request_s)
+        over.sort()
+        return max(0.0, over[int(len(over) * 0.9) - 1]) * 1.25 + 0.00005
+
+    def reset_stats(self):
+        self.waits = 0
+        self.misses = 0
+        self.max_late_s = 0.0
+        self.total_late_s = 0.0
+        self.spin_s = 0.0
+
+    def stats(self) -> dict:
+        return {
+            "waits": self.waits,
+            "misses": self.misses,
+            "margin_us": round(self.margin * 1e6, 1),
+            "max_late_us": round(self.max_late_s * 1e6, 1),
+            "mean_late_us": round(self.total_late_s / self.waits * 1e6, 1) if self.waits else 0.0,
+            "spin_ms": round(self.spin_s * 1e3, 2),
+        }
+
+    def sleep_until(self, deadline, waiter=None) -> bool:
+        """
+        Wait until clock.now() >= deadline. `waiter(timeout)` may replace
+        clock.sleep for the coarse phase and returns True when interrupted,
+        in which case this returns False right away without spinning.
+        """
+        clock = self.clock.now
+        sleep = self.clock.sleep
+        coarse = False
+        while True:
+            now = clock()
+            chunk = deadline - now - self.margin
+            if chunk <= 0:
+                if not coarse and self._adaptive:
+                    # nothing learned from a wait that only spins; let the
+                    # margin drift down so a late streak can't pin it high
+                    self.margin = max(self.MIN_MARGIN, self.margin * 0.98)
+                break
+            coarse = True
+            if waiter is not None:
+                if waiter(chunk):
+                    return False
+            else:
+                sleep(chunk)
+            if not self._adaptive:
+                continue
+            # one preempted sleep shouldn't make every later wait spin, so
+            # outliers are clipped to a fixed cap before they feed the estimate
+            over = min(clock() - now - chunk, self.OUTLIER_S)
+            if over > self.margin:
+                self.margin = min(self.MAX_MARGIN, self.margin + (over - self.margin) * 0.25)
+            else:
+                self.margin = max(self.MIN_MARGIN, self.margin - (self.margin - over) * 0.02)
+
+        t_spin = clock()
+        now = t_spin
+        while now < deadline:
+            sleep(0)  # yields the GIL while spinning
+            now = clock()
+        self.spin_s += now - t_spin
+
+        late = now - deadline
+        self.waits += 1
+        self.total_late_s += late
+        if late > self.max_late_s:
+            self.max_late_s = late
+        if late > self.miss_tolerance:
+            self.misses += 1
+        if self.late_hist is not None:
+            self.late_hist.add(late * 1e6)
+        return True
+
+_scheduler = None
+
+def get_scheduler() -> HybridScheduler:
+    """Shared scheduler; calibrated the first time the engine needs it."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = HybridScheduler()
+        print(f"[timer] sleep margin calibrated to {_scheduler.margin * 1e6:.0f} us")
+    return _scheduler
+
+# ===================== Telemetry =====================
+class Telemetry:
+    """
+    Opt-in per-wake records from the motion loops. The worker writes into
+    preallocated arrays and bumps `head` only after a slot is filled, so it
+    never locks or allocates; readers copy out a range and re-check `head`
+    to discard any slots the writer lapped while they were copying.
+    One record per wake: scheduled and actual perf_counter() time, time
+    spent in the backend flush, first step index and steps sent.
+    """
+    def __init__(self, capacity=1 << 14):
+        cap = 1 << max(4, (int(capacity) - 1).bit_length())
+        self.capacity = cap
+        self.mask = cap - 1
+        self.sched = array("d", bytes(8 * cap))
+        self.actual = array("d", bytes(8 * cap))
+        self.send = array("d", bytes(8 * cap))
+        self.step = array("l", [0]) * cap
+        self.count = array("l", [0]) * cap
+        self.head = 0
+        self.skipped = 0     # steps abandoned because stop was requested
+
+    def record(self, sched, actual, send_s, step, count):
+        i = self.head & self.mask
+        self.sched[i] = sched
+        self.actual[i] = actual
+        self.send[i] = send_s
+        self.step[i] = step
+        self.count[i] = count
+        self.head += 1
+
+    def read(self, since=0):
+        """
+        Records written since sequence `since` (oldest may have been
+        overwritten). Returns (rows, next_since, lost).
+        """
+        head = self.head
+        # slot `head` (seq head - capacity) may already be half rewritten
+        start = max(since, head - self.capacity + 1)
+        rows = []
+        mask = self.mask
+        for seq in range(start, head):
+            i = seq & mask
+            rows.append((self.sched[i], self.actual[i], self.send[i],
+                         self.step[i], self.count[i]))
+        # anything the writer reached while we copied may be torn, and so
+        # may the slot it is filling now
+        lapped = self.head - self.capacity + 1
+        if lapped > start:
+            rows = rows[lapped - start:]
+            start = lapped
+        return rows, head, start - since
+
+class Histogram:
+    """Log2 buckets in microseconds: bucket 0 is <1 us, bucket k is [2^(k-1), 2^k)."""
+    BUCKETS = 24
+
+    def __init__(self):
+        self.counts = [0] * self.BUCKETS
+        self.n = 0
+        self.max_us = 0.0
+
+    def add(self, us):
+        k = int(us).bit_length() if us >= 1 else 0
+        self.counts[min(k, self.BUCKETS - 1)] += 1
+        self.n += 1
+        if us > self.max_us:
+            self.max_us = us
+
+    def percentile(self, q):
+        """Upper edge (us) of the bucket holding the q-quantile."""
+        if not self.n:
+            return 0.0
+        want = q * self.n
+        seen = 0
+        for k, c in enumerate(self.counts):
+            seen += c
+            if seen >= want:
+                return float(1 << k)
+        return self.max_us
+
+    def as_dict(self):
+        return {
+            "n": self.n,
+            "max_us": round(self.max_us, 1),
+            "buckets": {f"<{1 << k}us": c for k, c in enumerate(self.counts) if c},
+        }
+
+class TelemetryReader:
+    """Aggregates a Telemetry ring into lateness, jitter and send-time histograms."""
+    MISS_US = 500.0
+
+    def __init__(self, telemetry):
+        self.telemetry = telemetry
+        self.reset()
+
+    def reset(self):
+        self._since = self.telemetry.head
+        self._prev = None
+        self.late = Histogram()
+        self.jitter = Histogram()
+        self.send = Histogram()
+        self.wakes = 0
+        self.steps = 0
+        self.misses = 0
+        self.lost = 0
+
+    def poll(self):
+        rows, self._since, lost = self.telemetry.read(self._since)
+        self.lost += lost
+        prev = self._prev
+        for sched, actual, send_s, _step, count in rows:
+            late_us = max(0.0, (actual - sched) * 1e6)
+            self.late.add(late_us)
+            if late_us > self.MISS_US:
+                self.misses += 1
+            self.send.add(send_s * 1e6)
+            if prev is not None:
+                self.jitter.add(abs((actual - prev[1]) - (sched - prev[0])) * 1e6)
+            prev = (sched, actual)
+            self.wakes += 1
+            self.steps += count
+        self._prev = prev
+        return len(rows)
+
+    def summary(self) -> dict:
+        return {
+            "wakes": self.wakes,
+            "steps": self.steps,
+            "misses": self.misses,
+            "skipped": self.telemetry.skipped,
+            "lost": self.lost,
+            "late_p50_us": self.late.percentile(0.50),
+            "late_p99_us": self.late.percentile(0.99),
+            "late_max_us": round(self.late.max_us, 1),
+            "jitter_p99_us": self.jitter.percentile(0.99),
+            "send_p99_us": self.send.percentile(0.99),
+        }
+
+    def dump_csv(self, path):
+        rows, _, _ = self.telemetry.read(0)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(("scheduled_s", "actual_s", "late_us", "send_us", "step", "count"))
+            for sched, actual, send_s, step, count in rows:
+                w.writerow((f"{sched:.6f}", f"{actual:.6f}", f"{(actual - sched) * 1e6:.1f}",
+                            f"{send_s * 1e6:.1f}", step, count))
+
+    def dump_json(self, path, extra=None):
+        self.poll()
+        out = {
+            "summary": self.summary(),
+            "late": self.late.as_dict(),
+            "jitter": self.jitter.as_dict(),
+            "send": self.send.as_dict(),
+        }
+        if extra:
+            out.update(extra)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(out, f, indent=2)
+
+class SamplingProfiler:
+    """
+    Samples one thread's Python stack at `hz` from a side thread. Cheap
+    enough to switch on and off while the engine runs.
+    """
+    def __init__(self, thread_id, hz=250):
+        self.thread_id = thread_id
+        self.interval = 1.0 / hz
+        self.leaf = Counter()
+        self.cumulative = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(1.0)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            self.samples += 1
+            code = frame.f_code
+            self.leaf[f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"] += 1
+            seen = set()
+            while frame is not None:
+                code = frame.f_code
+                key = f"{code.co_name} ({os.path.basename(code.co_filename)})"
+                if key not in seen:
+                    seen.add(key)
+                    self.cumulative[key] += 1
+                frame = frame.f_back
+
+    def top(self, n=10) -> dict:
+        return {
+            "samples": self.samples,
+            "leaf": self.leaf.most_common(n),
+            "cumulative": self.cumulative.most_common(n),
+        }
+
+telemetry = None   # Telemetry while recording is switched on
+
+def enable_telemetry(capacity=1 << 14) -> Telemetry:
+    global telemetry
+    if telemetry is None:
+        telemetry = Telemetry(capacity)
+    return telemetry
+
+def disable_telemetry() -> None:
+    global telemetry
+    telemetry = None
 
 # ===================== Smooth movement core =====================
 MICROSTEP_RATE_HZ = 240  # micro-steps for butter-smooth motion
+ADAPTIVE_WAKEUPS = True  # sleep until the next microstep that actually moves
+GC_WHILE_FIRING = "on"   # cyclic GC while fire is held: "on", "freeze" or "off"
 
-left_down = False
-right_down = False
+class TriggerState:
+    """
+    Left/right button state shared by the listener and the worker.
+    Every edge is published through a Condition, so the worker blocks with
+    zero CPU while idle and wakes as soon as the arm/fire state changes.
+    Anything that sets the stop event must call interrupt() to wake waiters.
+    Waits go through `clock`, so a VirtualClock can drive them in simulation
+    (edges are then fired from inside the wait, hence the re-entrant lock).
+    observers are called as fn(left, right) under the lock on every change.
+    """
+    def __init__(self, clock=None):
+        self._clock = clock or MONOTONIC
+        self._cond = threading.Condition(threading.RLock())
+        self.left = False
+        self.right = False
+        self.edges = 0
+        self.last_edge = 0.0   # clock time of the most recent edge
+        self.observers = []
+
+    @property
+    def firing(self):
+        return self.right and self.left
+
+    def set_button(self, name, pressed):
+        with self._cond:
+            if name == "left":
+                if self.left == pressed:
+                    return
+                self.left = pressed
+            elif name == "right":
+                if self.right == pressed:
+                    return
+                self.right = pressed
+            else:
+                return
+            self.edges += 1
+            self.last_edge = self._clock.now()
+            self._cond.notify_all()
+            for fn in self.observers:
+                fn(self.left, self.right)
+
+    def reset(self):
+        with self._cond:
+            self.left = False
+            self.right = False
+            self._cond.notify_all()
+            for fn in self.observers:
+                fn(False, False)
+
+    def interrupt(self):
+        with self._cond:
+            self._cond.notify_all()
+
+    def wait_armed(self, stop, timeout=None):
+        """Block until RIGHT is held (True) or stop is set / timeout (False)."""
+        with self._cond:
+            self._clock.wait_for(self._cond, lambda: self.right or stop.is_set(), timeout)
+            return self.right and not stop.is_set()
+
+    def wait_fire(self, stop, timeout=None):
+        """While armed, block until LEFT joins (True) or RIGHT is released (False)."""
+        with self._cond:
+            self._clock.wait_for(
+                self._cond, lambda: self.left or not self.right or stop.is_set(), timeout)
+            return self.right and self.left and not stop.is_set()
+
+    def wait_release(self, stop, timeout):
+        """
+        Block for up to `timeout` seconds while firing. Returns True if still
+        firing when the time is up, False once a button or stop ends it.
+        Timed, this is the cadence sleep between intervals, so on a real
+        clock it sleeps in WAIT_SLICE_S slices (no lock, no allocation)
+        rather than waiting on the Condition.
+        """
+        if timeout is not None and not self._clock.virtual:
+            now = self._clock.now
+            sleep = self._clock.sleep
+            deadline = now() + timeout
+            while self.right and self.left and not stop.is_set():
+                remaining = deadline - now()
+                if remaining <= 0:
+                    return True
+                sleep(remaining if remaining < WAIT_SLICE_S else WAIT_SLICE_S)
+            return False
+        with self._cond:
+            self._clock.wait_for(
+                self._cond, lambda: not (self.right and self.left) or stop.is_set(), timeout)
+            return self.right and self.left and not stop.is_set()
+
+class CancelToken:
+    """
+    Per-run stop flag for one worker. Quacks like a threading.Event
+    (is_set/set/wait) so the loops take either, but wait() goes through
+    `clock`: every sleep in the motion path waits on the token and returns
+    the moment cancel() is called. A cancelled token is never reset; the
+    next run gets a new one.
+    On a real clock a timed wait sleeps in WAIT_SLICE_S slices, checking
+    the flag in between: the motion path waits on the token every step, so
+    it must neither allocate (Condition.wait makes a waiter lock per call)
+    nor wake on the Windows timer tick (a lock timeout does). An untimed
+    wait blocks on a lock held until cancel().
+    """
+    def __init__(self, clock=None):
+        self._clock = clock or MONOTONIC
+        self._cond = threading.Condition(threading.RLock())
+        self._set = False
+        self.cancelled_at = None    # clock time of cancel()
+        self._gate = None
+        if not self._clock.virtual:
+            self._gate = threading.Lock()
+            self._gate.acquire()
+
+    def is_set(self):
+        return self._set
+
+    def set(self):
+        with self._cond:
+            if not self._set:
+                self._set = True
+                self.cancelled_at = self._clock.now()
+                if self._gate is not None:
+                    self._gate.release()
+            self._cond.notify_all()
+
+    cancel = set
+
+    def wait(self, timeout=None):
+        """Sleep up to `timeout`; True as soon as the token is cancelled."""
+        gate = self._gate
+        if gate is not None:
+            if self._set:
+                return True
+            if timeout is None:
+                gate.acquire()
+                gate.release()      # pass it on to any other waiter
+                return True
+            now = self._clock.now
+            sleep = self._clock.sleep
+            deadline = now() + timeout
+            while not self._set:
+                remaining = deadline - now()
+                if remaining <= 0:
+                    return False
+                sleep(remaining if remaining < WAIT_SLICE_S else WAIT_SLICE_S)
+            return True
+        with self._cond:
+            self._clock.wait_for(self._cond, self.is_set, timeout)
+            return self._set
+
+trigger = TriggerState()
+hotkeys = {}            # key name -> profile name; keyboard listener runs only if set
 listener_mouse = None
 listener_kb = None
-stop_event = threading.Event()
 
-def on_mouse_click(x, y, button, pressed):
-    global left_down, right_down
+def on_button_edge(name, pressed):
     try:
-        if button == mouse.Button.left:
-            left_down = pressed
-        elif button == mouse.Button.right:
-            right_down = pressed
+        trigger.set_button(name, pressed)
     except Exception:
         pass
 
-def on_key_press(_key):  # no emergency stop hotkey in this build
-    pass
+def on_key_press(key):  # profile hotkeys only; no emergency stop hotkey in this build
+    try:
+        profile_switcher.press(key_name(key))
+    except Exception:
+        pass
 
 def start_listeners():
     global listener_mouse, listener_kb
     if listener_mouse is None:
-        listener_mouse = mouse.Listener(on_click=on_mouse_click)
-        listener_mouse.daemon = True
-        listener_mouse.start()
-    if listener_kb is None:
+        listener_mouse = make_button_source()
+        listener_mouse.start(on_button_edge)
+    if listener_kb is None and hotkeys:
+        # pynput needs a live desktop session (X server on Linux), so import
+        # it only when the listener is actually started
+        from pynput import keyboard
         listener_kb = keyboard.Listener(on_press=on_key_press)
         listener_kb.daemon = True
         listener_kb.start()
@@ -88,14 +820,27 @@ def stop_listeners():
         listener_kb.stop()
         listener_kb = None
 
-def smooth_interval_move(dx_total, dy_total, interval_s):
+def smooth_interval_move(dx_total, dy_total, interval_s, backend=None, scheduler=None, stop=None):
     """
     Render total (dx, dy) over interval_s at a fixed microstep rate
     using DDA accumulators to avoid rounding jitter.
+    If the thread wakes late, every microstep that has fallen due is
+    queued and sent in one flush instead of one call per step.
     """
+    if backend is None:
+        backend = get_injection_backend()
+    if scheduler is None:
+        scheduler = get_scheduler()
+    if stop is None:
+        stop = CancelToken(scheduler.clock)    # nothing will cancel it
+    sleep_until = scheduler.sleep_until
+    clock = scheduler.clock.now
+    wake = getattr(stop, "wait", None)   # cancelling stop cuts the coarse sleep short
+    push = backend.push
+    flush = backend.flush
     steps = max(1, int(interval_s * MICROSTEP_RATE_HZ))
     if steps == 1:
-        send_mouse_move_rel(dx_total, dy_total)
+        backend.move_rel(int(dx_total), int(dy_total))
         return
 
     step_dx_f = dx_total / steps
@@ -104,66 +849,634 @@ def smooth_interval_move(dx_total, dy_total, interval_s):
     acc_y = 0.0
 
     step_period = interval_s / steps
-    t0 = time.perf_counter()
+    t0 = clock()
+
+    tel = telemetry
+    i = 0
+    while i < steps:
+        if stop.is_set():
+            if tel is not None:
+                tel.skipped += steps - i
+            return
+
+        # steps [i, due) are due now; normally that's just step i
+        now = clock()
+        due = int((now - t0) / step_period) + 1
+        if due <= i:
+            due = i + 1
+        elif due > steps:
+            due = steps
+
+        first = i
+        while i < due:
+            acc_x += step_dx_f
+            acc_y += step_dy_f
+            move_x = int(round(acc_x)); acc_x -= move_x
+            move_y = int(round(acc_y)); acc_y -= move_y
+            if move_x or move_y:
+                push(move_x, move_y)
+            i += 1
+        if tel is None:
+            flush()
+        else:
+            t_send = clock()
+            flush()
+            tel.record(t0 + first * step_period, now,
+                       clock() - t_send, first, i - first)
+
+        sleep_until(t0 + i * step_period, wake)
+
+# ===================== Button sources =====================
+# Only left/right state edges reach the trigger. Where the OS can be asked
+# for the button state directly, it is polled, so the cost doesn't scale
+# with the mouse's report rate and our own injected moves are never seen.
+VK_LBUTTON = 0x01
+VK_RBUTTON = 0x02
+SM_SWAPBUTTON = 23
+BUTTON_SOURCE = "auto"   # "auto" (polling where available, else pynput) or "pynput"
+
+class ButtonSource:
+    """
+    Where the trigger's button edges come from. start(on_edge) calls
+    on_edge(name, pressed) with name "left" or "right", from the source's
+    own thread, once per state change and for nothing else; stop() ends
+    delivery.
+    """
+    name = "base"
 
-    for i in range(steps):
-        if stop_event.is_set():
+    def start(self, on_edge):
+        raise NotImplementedError
+
+    def stop(self):
+        pass
+
+class PollingButtonSource(ButtonSource):
+    """
+    Samples read() -> (left, right) on a thread of its own and delivers the
+    changes: every poll_s while a button is held, every idle_poll_s while
+    none is, so an idle app isn't woken a thousand times a second. Its cost
+    is fixed by the poll rate however many events the mouse produces; the
+    price is up to one period of edge latency, and a click shorter than the
+    period can be missed. Fire needs right held, so the taps that matter
+    (left while right is down) are sampled at the fast rate; only the first
+    press out of idle waits up to idle_poll_s. The waits are CancelToken
+    sleeps, i.e. time.sleep, which unlike a lock timeout keeps 1 ms
+    resolution on Windows. A button already held at start() is delivered
+    as a press.
+    """
+    name = "poll"
+    POLL_S = 0.001
+    IDLE_POLL_S = 0.004
+
+    def __init__(self, read=None, poll_s=None, idle_poll_s=None):
+        if read is not None:
+            self.read = read
+        self.poll_s = self.POLL_S if poll_s is None else poll_s
+        self.idle_poll_s = max(self.poll_s,
+                               self.IDLE_POLL_S if idle_poll_s is None else idle_poll_s)
+        self.thread = None
+        self._token = None
+
+    def read(self):
+        raise NotImplementedError
+
+    def start(self, on_edge):
+        if self.thread is not None and self.thread.is_alive():
             return
+        token = self._token = CancelToken()
+        self.thread = threading.Thread(target=self._run, args=(on_edge, token),
+                                       name=f"buttons-{self.name}", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if self._token is not None:
+            self._token.cancel()
+        if self.thread is not None:
+            self.thread.join(1.0)
+            self.thread = None
+
+    def _run(self, on_edge, token):
+        read = self.read
+        wait = token.wait
+        poll_s = self.poll_s
+        idle_poll_s = self.idle_poll_s
+        left = right = False
+        while not wait(poll_s if left or right else idle_poll_s):
+            l, r = read()
+            if l != left:
+                left = l
+                on_edge("left", l)
+            if r != right:
+                right = r
+                on_edge("right", r)
+
+class Win32ButtonSource(PollingButtonSource):
+    """
+    GetAsyncKeyState polling. It reports the physical buttons, so when
+    they are swapped in the mouse settings (SM_SWAPBUTTON) the physical
+    right button is the logical left one; the setting is re-read every
+    second.
+    """
+    name = "win32"
+
+    def __init__(self, poll_s=None, idle_poll_s=None):
+        super().__init__(poll_s=poll_s, idle_poll_s=idle_poll_s)
+        user32 = ctypes.windll.user32
+        self._key_state = user32.GetAsyncKeyState
+        self._key_state.argtypes = (ctypes.c_int,)
+        self._key_state.restype = ctypes.c_short
+        self._metric = user32.GetSystemMetrics
+        self._swapped = False
+        self._swap_checked = -1.0
+
+    def read(self):
+        now = MONOTONIC.now()
+        if now - self._swap_checked >= 1.0:
+            self._swapped = bool(self._metric(SM_SWAPBUTTON))
+            self._swap_checked = now
+        key = self._key_state
+        first = key(VK_LBUTTON) < 0      # high bit: down right now
+        second = key(VK_RBUTTON) < 0
+        return (second, first) if self._swapped else (first, second)
+
+class PynputButtonSource(ButtonSource):
+    """
+    pynput's mouse listener with only on_click. Its hook still runs Python
+    for every mouse event, moves included, before dropping the ones with
+    no callback; the fallback where no polling source exists.
+    """
+    name = "pynput"
 
-        acc_x += step_dx_f
-        acc_y += step_dy_f
-        move_x = int(round(acc_x)); acc_x -= move_x
-        move_y = int(round(acc_y)); acc_y -= move_y
+    def __init__(self):
+        self.listener = None
+
+    def start(self, on_edge):
+        if self.listener is not None:
+            return
+        # pynput needs a live desktop session (X server on Linux), so import
+        # it only when a listener is actually started
+        from pynput import mouse
+
+        def on_click(x, y, button, pressed):
+            # compare by name so this module never needs pynput at import time
+            name = getattr(button, "name", None)
+            if name == "left" or name == "right":
+                on_edge(name, pressed)
+        self.listener = mouse.Listener(on_click=on_click)
+        self.listener.daemon = True
+        self.listener.start()
+
+    def stop(self):
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+class SyntheticButtonSource(PollingButtonSource):
+    """
+    Stand-in device for benchmarks and tests: set() changes the state a
+    real source would read, and it is polled like one.
+    """
+    name = "synthetic"
+
+    def __init__(self, poll_s=None, idle_poll_s=None):
+        super().__init__(poll_s=poll_s, idle_poll_s=idle_poll_s)
+        self.left = False
+        self.right = False
+
+    def set(self, name, pressed):
+        if name == "left":
+            self.left = bool(pressed)
+        elif name == "right":
+            self.right = bool(pressed)
+
+    def read(self):
+        return self.left, self.right
+
+def make_button_source(kind=None) -> ButtonSource:
+    kind = kind or BUTTON_SOURCE
+    if kind == "auto" and os.name == "nt":
+        return Win32ButtonSource()
+    return PynputButtonSource()
+
+# ===================== Recoil patterns =====================
+class CompiledPattern:
+    """
+    A profile flattened once into per-microstep integer deltas. Step k goes
+    out at offset t[k-1] from the start of playback (step 0 at 0) and
+    t[-1] is the pattern's total duration.
+    The ex/ey/et/estep arrays are the same pattern with the empty steps
+    dropped: only the steps where a whole pixel is due, with their due
+    offsets, for playback that sleeps straight to the next real move.
+    residual_x/y is the sub-pixel part of the exact totals that rounding
+    left behind; the engine carries it over to the next interval.
+    """
+    __slots__ = ("dx", "dy", "t", "steps", "duration_s", "segments",
+                 "ex", "ey", "et", "estep", "events", "residual_x", "residual_y")
+
+    def __init__(self, dx, dy, t, segments, exact_x=None, exact_y=None):
+        self.dx = dx
+        self.dy = dy
+        self.t = t
+        self.steps = len(dx)
+        self.duration_s = t[-1] if len(t) else 0.0
+        self.segments = segments
+        self.ex = array("l")
+        self.ey = array("l")
+        self.et = array("d")
+        self.estep = array("l")
+        for k in range(self.steps):
+            if dx[k] or dy[k]:
+                self.ex.append(dx[k])
+                self.ey.append(dy[k])
+                self.et.append(t[k - 1] if k else 0.0)
+                self.estep.append(k)
+        self.events = len(self.ex)
+        sx, sy = self.total()
+        self.residual_x = (exact_x - sx) if exact_x is not None else 0.0
+        self.residual_y = (exact_y - sy) if exact_y is not None else 0.0
+
+    @classmethod
+    def from_arrays(cls, dx, dy, t, segments, ex, ey, et, estep, residual_x, residual_y):
+        """Rebuild an already compiled pattern from its arrays without another pass."""
+        self = cls.__new__(cls)
+        self.dx, self.dy, self.t = dx, dy, t
+        self.steps = len(dx)
+        self.duration_s = t[-1] if len(t) else 0.0
+        self.segments = segments
+        self.ex, self.ey, self.et, self.estep = ex, ey, et, estep
+        self.events = len(ex)
+        self.residual_x = residual_x
+        self.residual_y = residual_y
+        return self
+
+    def total(self):
+        return sum(self.dx), sum(self.dy)
+
+class MotionState:
+    """
+    Per-run state for the engine: the sub-pixel carry kept across
+    intervals, and (once bind() is called) the backend/scheduler/stop
+    callables play_pattern would otherwise look up and bind again every
+    interval.
+    """
+    __slots__ = ("carry_x", "carry_y", "push", "flush", "sleep_until", "now", "wake")
 
+    def __init__(self):
+        self.carry_x = 0.0
+        self.carry_y = 0.0
+        self.push = None
+        self.flush = None
+        self.sleep_until = None
+        self.now = None
+        self.wake = None
+
+    def bind(self, backend, scheduler, stop):
+        self.push = backend.push
+        self.flush = backend.flush
+        self.sleep_until = scheduler.sleep_until
+        self.now = scheduler.clock.now
+        self.wake = getattr(stop, "wait", None)
+        return self
+
+def profile_segments(data: dict) -> list:
+    """
+    [(dx, dy, duration_ms), ...] for a config dict. Configs with a
+    "segments" list use it ({"x", "y", "duration_ms"} per entry); plain
+    configs are a single segment of (x, y, interval_ms). Segment moves and
+    durations are clamped to the slider ranges like the plain values; more
+    than MAX_SEGMENTS segments, or a non-finite value, is a ValueError.
+    """
+    segs = data.get("segments")
+    if segs:
+        if len(segs) > MAX_SEGMENTS:
+            raise ValueError(f"{len(segs)} segments; a profile takes at most {MAX_SEGMENTS}")
+        out = []
+        for seg in segs:
+            dx, dy = float(seg.get("x", 0.0)), float(seg.get("y", 0.0))
+            duration_ms = float(seg.get("duration_ms", 1.0))
+            if not (math.isfinite(dx) and math.isfinite(dy) and math.isfinite(duration_ms)):
+                raise ValueError(f"segment values must be finite numbers: {seg!r}")
+            out.append((float(_clamp(dx, MOVE_RANGE)), float(_clamp(dy, MOVE_RANGE)),
+                        float(_clamp(duration_ms, INTERVAL_RANGE))))
+        return out
+    return [(float(data.get("x", 0.0)), float(data.get("y", -50.0)),
+             max(1.0, float(data.get("interval_ms", 120))))]
+
+def compile_pattern(segments, rate_hz=MICROSTEP_RATE_HZ) -> CompiledPattern:
+    """
+    Run the same DDA as smooth_interval_move over every segment ahead of
+    time. The rounding remainder carries across segment boundaries, so the
+    pattern's total displacement is exact.
+    """
+    dxs = array("l")
+    dys = array("l")
+    ts = array("d")
+    acc_x = 0.0
+    acc_y = 0.0
+    t_base = 0.0
+    for dx_total, dy_total, duration_ms in segments:
+        duration_s = duration_ms / 1000.0
+        steps = max(1, int(duration_s * rate_hz))
+        step_dx_f = dx_total / steps
+        step_dy_f = dy_total / steps
+        step_period = duration_s / steps
+        for i in range(steps):
+            acc_x += step_dx_f
+            acc_y += step_dy_f
+            move_x = int(round(acc_x)); acc_x -= move_x
+            move_y = int(round(acc_y)); acc_y -= move_y
+            dxs.append(move_x)
+            dys.append(move_y)
+            ts.append(t_base + (i + 1) * step_period)
+        t_base += duration_s
+    return CompiledPattern(dxs, dys, ts, len(segments),
+                           sum(seg[0] for seg in segments), sum(seg[1] for seg in segments))
+
+def play_pattern(pattern: CompiledPattern, backend=None, scheduler=None, stop=None,
+                 adaptive=False, state=None):
+    """
+    Play a compiled pattern: a plain index walk over its step arrays.
+    Steps that fall due together after a late wake go out in one flush.
+    adaptive=True walks only the steps that move (ex/ey/et) and sleeps
+    straight to the next one instead of waking on every microstep tick;
+    the moves and their grid times are the same either way.
+    With a MotionState, the pattern's rounding residual is carried and
+    paid out as whole pixels at the end of the interval; a bound one
+    (MotionState.bind with the same backend, scheduler and stop) also
+    supplies the callables, so steady-state playback allocates nothing.
+    """
+    if state is not None and state.push is not None:
+        push = state.push
+        flush = state.flush
+        sleep_until = state.sleep_until
+        clock = state.now
+        wake = state.wake
+    else:
+        if backend is None:
+            backend = get_injection_backend()
+        if scheduler is None:
+            scheduler = get_scheduler()
+        sleep_until = scheduler.sleep_until
+        clock = scheduler.clock.now
+        wake = getattr(stop, "wait", None)   # cancelling stop cuts the coarse sleep short
+        push = backend.push
+        flush = backend.flush
+    if stop is None:
+        stop = CancelToken()    # nothing will cancel it; only is_set() is used
+    tel = telemetry
+
+    if adaptive:
+        dxs = pattern.ex
+        dys = pattern.ey
+        ets = pattern.et
+        n = pattern.events
+        t0 = clock()
+        i = 0
+        while i < n:
+            sleep_until(t0 + ets[i], wake)
+            if stop.is_set():
+                if tel is not None:
+                    tel.skipped += pattern.steps - pattern.estep[i]
+                return
+            now = clock()
+            elapsed = now - t0
+            first = i
+            while True:
+                push(dxs[i], dys[i])
+                i += 1
+                if i >= n or ets[i] > elapsed:
+                    break
+            if tel is None:
+                flush()
+            else:
+                t_send = clock()
+                flush()
+                tel.record(t0 + ets[first], now, clock() - t_send,
+                           pattern.estep[first], i - first)
+    else:
+        dxs = pattern.dx
+        dys = pattern.dy
+        ts = pattern.t
+        n = pattern.steps
+        t0 = clock()
+        i = 0
+        while i < n:
+            if stop.is_set():
+                if tel is not None:
+                    tel.skipped += n - i
+                return
+            now = clock()
+            elapsed = now - t0
+            first = i
+            while True:
+                move_x = dxs[i]
+                move_y = dys[i]
+                if move_x or move_y:
+                    push(move_x, move_y)
+                i += 1
+                if i >= n or ts[i - 1] > elapsed:
+                    break
+            if tel is None:
+                flush()
+            else:
+                t_send = clock()
+                flush()
+                tel.record(t0 + ts[first - 1] if first else t0, now,
+                           clock() - t_send, first, i - first)
+
+            sleep_until(t0 + ts[i - 1], wake)
+
+    if state is not None:
+        cx = state.carry_x + pattern.residual_x
+        cy = state.carry_y + pattern.residual_y
+        move_x = int(round(cx))
+        move_y = int(round(cy))
         if move_x or move_y:
-            send_mouse_move_rel(move_x, move_y)
+            push(move_x, move_y)
+            flush()
+        state.carry_x = cx - move_x
+        state.carry_y = cy - move_y
 
-        target = t0 + (i + 1) * step_period
-        while True:
-            now = time.perf_counter()
-            remaining = target - now
-            if remaining <= 0:
-                break
-            time.sleep(0.0015 if remaining > 0.002 else 0)
+# ===================== Parameter snapshots =====================
+MOVE_RANGE     = (-200, 200)   # X / Y slider limits
+INTERVAL_RANGE = (1, 2000)     # interval slider limits (ms)
+MAX_SEGMENTS   = 1024          # segments per pattern profile
 
-def movement_loop(get_params):
+def _clamp(v, lo_hi):
+    lo, hi = lo_hi
+    return lo if v < lo else hi if v > hi else v
+
+class ParamSnapshot:
+    """
+    Validated, immutable engine parameters with their compiled pattern.
+    The UI builds a new one whenever a control changes and swaps it in with
+    one reference assignment; the worker only ever reads that reference,
+    so the Tcl interpreter never sits on the movement hot path.
+    """
+    __slots__ = ("x", "y", "interval_ms", "segments", "pattern")
+
+    def __init__(self, x, y, interval_ms, segments=None, pattern=None):
+        x = float(_clamp(float(x), MOVE_RANGE))
+        y = float(_clamp(float(y), MOVE_RANGE))
+        interval_ms = int(_clamp(int(float(interval_ms)), INTERVAL_RANGE))
+        segments = tuple(profile_segments({"segments": segments})) if segments else None
+        if pattern is None:
+            pattern = compile_pattern(
+                segments or profile_segments({"x": x, "y": y, "interval_ms": interval_ms}))
+        for k, v in (("x", x), ("y", y), ("interval_ms", interval_ms),
+                     ("segments", segments), ("pattern", pattern)):
+            object.__setattr__(self, k, v)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ParamSnapshot is immutable")
+
+    @classmethod
+    def from_config(cls, data: dict) -> "ParamSnapshot":
+        return cls(data.get("x", 0.0), data.get("y", -50.0),
+                   data.get("interval_ms", 120), data.get("segments") or None)
+
+def gc_pause(mode):
+    """
+    Apply a GC_WHILE_FIRING mode when fire starts; returns what gc_resume
+    needs to undo it. "freeze" moves everything alive into the permanent
+    generation so collections during the fire only look at new objects;
+    "off" disables the collector until release. Both are process-wide
+    (only the engine's process with --isolate), and gc_resume unfreezes
+    everything, including anything frozen before the fire.
+    """
+    if mode == "off" and gc.isenabled():
+        gc.disable()
+        return "off"
+    if mode == "freeze":
+        gc.freeze()
+        return "freeze"
+    return None
+
+def gc_resume(paused):
+    if paused == "off":
+        gc.enable()
+    elif paused == "freeze":
+        gc.unfreeze()
+
+def movement_loop(get_params, backend=None, scheduler=None, trig=None, stop=None,
+                  adaptive=None, gc_mode=None):
     """
     RIGHT = arm; while RIGHT is held, holding LEFT applies the movement each interval.
+    get_params() returns the current ParamSnapshot; it's read once per interval.
+    Time comes from scheduler.clock, so a VirtualClock-backed scheduler and
+    TriggerState run the whole loop in simulated time.
+    adaptive (default ADAPTIVE_WAKEUPS) wakes only when a pixel is due.
+    gc_mode (default GC_WHILE_FIRING) is applied for as long as fire is held.
+    Once firing, an interval allocates nothing: the per-run state and bound
+    callables are set up here, and the waits sleep rather than block.
     UI shows only 'toggled on/off'.
     """
-    global left_down, right_down
-    try:
-        while not stop_event.is_set():
-            while not right_down and not stop_event.is_set():
-                time.sleep(0.004)
-            if stop_event.is_set():
-                break
-
-            while right_down and not left_down and not stop_event.is_set():
-                time.sleep(0.002)
-            if stop_event.is_set():
-                break
-
-            while right_down and left_down and not stop_event.is_set():
-                p = get_params()
-                dx_total = float(p["x"])
-                dy_total = float(p["y"])
-                interval_ms = max(1.0, float(p["interval_ms"]))
-                interval_s  = interval_ms / 1000.0
+    if adaptive is None:
+        adaptive = ADAPTIVE_WAKEUPS
+    if gc_mode is None:
+        gc_mode = GC_WHILE_FIRING
+    if backend is None:
+        backend = get_injection_backend()
+    if scheduler is None:
+        scheduler = get_scheduler()
+    if trig is None:
+        trig = trigger
+    if stop is None:
+        stop = CancelToken(scheduler.clock)    # nothing will cancel it
+    clock = scheduler.clock.now
+
+    state = MotionState().bind(backend, scheduler, stop)
+
+    def interrupted(timeout):
+        return not trig.wait_release(stop, timeout)
+
+    while not stop.is_set():
+        if not trig.wait_armed(stop):
+            continue
+        if not trig.wait_fire(stop):
+            continue
+
+        paused = gc_pause(gc_mode)
+        try:
+            while trig.firing and not stop.is_set():
+                pattern = get_params().pattern   # ParamSnapshot; one reference read
+                t_start = clock()
+                play_pattern(pattern, backend, scheduler, stop, adaptive, state)
 
-                t_start = time.perf_counter()
-                smooth_interval_move(dx_total, dy_total, interval_s)
+                # keep cadence; a release or stop ends this within WAIT_SLICE_S
+                scheduler.sleep_until(t_start + pattern.duration_s, interrupted)
+        finally:
+            gc_resume(paused)
 
-                # keep cadence
-                while (interval_s - (time.perf_counter() - t_start) > 0 and
-                       right_down and left_down and not stop_event.is_set()):
-                    time.sleep(0.0015)
-    finally:
-        pass
+class MotionWorker:
+    """
+    Runs movement_loop on its own thread, one thread and one CancelToken per
+    run. stop() cancels the token, which wakes every wait on the motion
+    path (pattern sleeps, cadence sleep, trigger waits), then joins for at
+    most STOP_TIMEOUT_S. A thread still alive after that is kept as stale:
+    its token stays cancelled, so it can't get past the batch it is in.
+    Backends aren't safe to share between threads, so start() waits up to
+    STOP_TIMEOUT_S for stale threads and refuses to start (RuntimeError)
+    while one is still alive. A run is never resumed or shared.
+    """
+    STOP_TIMEOUT_S = 0.1
+
+    def __init__(self, get_params, backend=None, scheduler=None, trig=None):
+        self.get_params = get_params
+        self.backend = backend
+        self.scheduler = scheduler
+        self.trig = trig if trig is not None else trigger
+        self.thread = None
+        self.token = None
+        self._stale = []
+        self.last_stop_s = None     # cancel -> thread exit of the last stop()
+
+    @property
+    def running(self) -> bool:
+        return (self.token is not None and not self.token.is_set()
+                and self.thread is not None and self.thread.is_alive())
+
+    def start(self):
+        if self.running:
+            return
+        self._reap(self.STOP_TIMEOUT_S)
+        if self._stale:
+            raise RuntimeError(f"{len(self._stale)} cancelled worker(s) still inside the "
+                               "backend; not starting until they exit, try again")
+        token = CancelToken()
+        th = threading.Thread(
+            target=movement_loop, name="movement",
+            args=(self.get_params, self.backend, self.scheduler, self.trig, token),
+            daemon=True,
+        )
+        self.token = token
+        self.thread = th
+        th.start()
+
+    def stop(self):
+        """Cancel the run; returns once the thread exits or STOP_TIMEOUT_S passes."""
+        token, th = self.token, self.thread
+        if token is None:
+            return
+        token.cancel()
+        self.trig.interrupt()
+        if th is not None:
+            th.join(self.STOP_TIMEOUT_S)
+            if th.is_alive():
+                self._stale.append(th)
+                self.last_stop_s = None
+                print(f"[worker] still running {self.STOP_TIMEOUT_S * 1e3:.0f} ms after stop; left cancelled")
+            else:
+                self.last_stop_s = MONOTONIC.now() - token.cancelled_at
+
+    def _reap(self, timeout):
+        deadline = MONOTONIC.now() + timeout
+        for th in self._stale:
+            th.join(max(0.0, deadline - MONOTONIC.now()))
+        self._stale = [th for th in self._stale if th.is_alive()]
 
 # ===================== Config files =====================
 CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "configs")
-os.makedirs(CONFIG_DIR, exist_ok=True)
 
 def sanitize_name(name: str) -> str:
     name = (name or "").strip()
@@ -174,24 +1487,1597 @@ def sanitize_name(name: str) -> str:
 def config_path(name: str) -> str:
     return os.path.join(CONFIG_DIR, f"{name}.json")
 
+class ConfigStore:
+    """
+    In-memory index of a config directory: name -> (filename, mtime_ns, size,
+    parsed data). refresh() skips the listing entirely while the directory's
+    own mtime is unchanged; otherwise it rescans names and stats only new or
+    already-parsed entries. load() re-stats one file and reparses it only
+    when mtime/size moved. Saves and deletes made through the store update
+    the index directly.
+    """
+    RACY_WINDOW_NS = 2_000_000_000   # dir mtimes this fresh may hide a change
+
+    def __init__(self, directory=None):
+        self.directory = directory or CONFIG_DIR
+        self._lock = threading.RLock()
+        self._index = {}        # name -> [filename, mtime_ns, size, data or None]
+        self._names = []        # sorted case-insensitively
+        self._dir_mtime = None
+        self.parses = 0
+
+    def _path(self, filename):
+        return os.path.join(self.directory, filename)
+
+    @staticmethod
+    def _check_name(name):
+        # a profile name is a file name in this directory, never a path
+        if (not name or name in (".", "..") or "\0" in name
+                or any(sep and sep in name for sep in ("/", "\\", os.sep, os.altsep))):
+            raise ValueError(f"not a profile name: {name!r}")
+
+    def refresh(self, force=False) -> list:
+        """Bring the index up to date and return the sorted profile names."""
+        with self._lock:
+            try:
+                st = os.stat(self.directory)
+            except FileNotFoundError:
+                self._index.clear()
+                self._names = []
+                self._dir_mtime = None
+                return []
+            racy = time.time_ns() - st.st_mtime_ns < self.RACY_WINDOW_NS
+            if not force and not racy and st.st_mtime_ns == self._dir_mtime:
+                return list(self._names)
+
+            seen = {}
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    fn = entry.name
+                    if not fn.lower().endswith(".json") or not entry.is_file():
+                        continue
+                    seen[os.path.splitext(fn)[0]] = entry
+
+            index = self._index
+            changed = False
+            for name in [n for n in index if n not in seen]:
+                del index[name]
+                changed = True
+            for name, entry in seen.items():
+                rec = index.get(name)
+                if rec is None:
+                    est = entry.stat()
+                    index[name] = [entry.name, est.st_mtime_ns, est.st_size, None]
+                    changed = True
+                elif rec[3] is not None:
+                    # only parsed entries need a stat here; the rest are
+                    # checked by load() when they're actually used
+                    est = entry.stat()
+                    if rec[1] != est.st_mtime_ns or rec[2] != est.st_size or rec[0] != entry.name:
+                        index[name] = [entry.name, est.st_mtime_ns, est.st_size, None]
+            if changed or force:
+                self._names = sorted(index, key=str.lower)
+            self._dir_mtime = st.st_mtime_ns
+            return list(self._names)
+
+    def names(self) -> list:
+        with self._lock:
+            return list(self._names)
+
+    def load(self, name: str) -> dict:
+        self._check_name(name)
+        with self._lock:
+            rec = self._index.get(name)
+            filename = rec[0] if rec else f"{name}.json"
+            st = os.stat(self._path(filename))
+            if rec and rec[3] is not None and rec[1] == st.st_mtime_ns and rec[2] == st.st_size:
+                return dict(rec[3])
+            with open(self._path(filename), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.parses += 1
+            if rec is None:
+                self._insert_name(name)
+            self._index[name] = [filename, st.st_mtime_ns, st.st_size, data]
+            return dict(data)
+
+    def save(self, name: str, data: dict) -> None:
+        self._check_name(name)
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            rec = self._index.get(name)
+            filename = rec[0] if rec else f"{name}.json"
+            with open(self._path(filename), "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            st = os.stat(self._path(filename))
+            if rec is None:
+                self._insert_name(name)
+            self._index[name] = [filename, st.st_mtime_ns, st.st_size, dict(data)]
+
+    def delete(self, name: str) -> None:
+        self._check_name(name)
+        with self._lock:
+            rec = self._index.pop(name, None)
+            p = self._path(rec[0] if rec else f"{name}.json")
+            if os.path.exists(p):
+                os.remove(p)
+            if rec is not None:
+                self._names.remove(name)
+
+    def _insert_name(self, name):
+        bisect.insort(self._names, name, key=str.lower)
+
+config_store = ConfigStore()
+
 def list_configs() -> list:
-    return sorted(
-        [os.path.splitext(f)[0] for f in os.listdir(CONFIG_DIR) if f.lower().endswith(".json")],
-        key=str.lower
-    )
+    return config_store.refresh()
 
 def save_config(name: str, data: dict) -> None:
-    with open(config_path(name), "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    config_store.save(name, data)
 
 def load_config(name: str) -> dict:
-    with open(config_path(name), "r", encoding="utf-8") as f:
-        return json.load(f)
+    return config_store.load(name)
 
 def delete_config(name: str) -> None:
-    p = config_path(name)
-    if os.path.exists(p):
-        os.remove(p)
+    config_store.delete(name)
+
+# ===================== Hotkey profile switching =====================
+def key_name(key) -> str:
+    """Stable lowercase name for a pynput key: 'f1', 'home', 'a', 'vk97'."""
+    name = getattr(key, "name", None) or getattr(key, "char", None)
+    if not name:
+        vk = getattr(key, "vk", None)
+        name = f"vk{vk}" if vk is not None else str(key)
+    return name.strip().lower()
+
+class ProfileSwitcher:
+    """
+    The single slot the worker takes its parameters from. The UI publishes
+    its snapshot here; hotkeys publish a preloaded one. Every profile that
+    declares a "hotkey" is parsed and compiled by preload(), so a key press
+    is one tuple assignment (seq, name, snapshot, t_press) with no disk or
+    Tk work. The worker calls current() once per interval and adopts a new
+    sequence number there, so a switch always lands on an interval boundary.
+    """
+    def __init__(self, bindings=None, store=None, clock=None):
+        self.bindings = bindings if bindings is not None else {}  # key -> profile name
+        self._store = store or config_store
+        self._clock = clock or MONOTONIC
+        self._lock = threading.Lock()     # writers only; current() never takes it
+        self.loaded = {}                  # profile name -> ParamSnapshot
+        self._seq = 0
+        self._pending = None
+        self._applied = 0
+        self.active = None
+        self.active_name = None
+        self.switches = 0
+        self.reloads = 0
+        self.last_latency_us = 0.0
+        self.latency = Histogram()        # key press -> applied by the worker, us
+        # fn(snapshot) on every publish, under the lock and before the
+        # snapshot is installed: one that raises refuses the publish
+        self.observers = []
+
+    def preload(self) -> int:
+        """Bind and compile every profile in the store that declares a hotkey."""
+        bindings = {}
+        loaded = {}
+        for name in self._store.refresh():
+            try:
+                data = self._store.load(name)
+                key = str(data.get("hotkey") or "").strip().lower()
+                if not key:
+                    continue
+                if key in bindings:
+                    print(f'[hotkeys] "{key}" already bound to "{bindings[key]}"; ignoring "{name}"')
+                    continue
+                loaded[name] = ParamSnapshot.from_config(data)
+                bindings[key] = name
+            except Exception as e:
+                print(f'[hotkeys] skipped "{name}": {e}')
+        with self._lock:
+            self.bindings.clear()
+            self.bindings.update(bindings)
+            self.loaded = loaded
+        return len(bindings)
+
+    def publish(self, snapshot, name=None, t_press=None):
+        with self._lock:
+            for fn in self.observers:
+                fn(snapshot)
+            self._seq += 1
+            self._pending = (self._seq, name, snapshot, t_press)
+
+    def press(self, key) -> bool:
+        """Listener side: switch to the profile bound to `key`, if any."""
+        t = self._clock.now()
+        name = self.bindings.get(key)
+        snapshot = self.loaded.get(name) if name else None
+        if snapshot is None:
+            return False
+        self.publish(snapshot, name, t)
+        return True
+
+    def reload(self, name, snapshot, hotkey=None):
+        """
+        Install a re-read profile (snapshot None: its file is gone). Its
+        hotkey binding and preloaded copy are replaced, and if it is the
+        profile currently published, the new snapshot is published in its
+        place: the worker keeps playing the old one and picks this up at
+        its next interval boundary, like any other switch.
+        """
+        with self._lock:
+            p = self._pending
+            republish = snapshot is not None and p is not None and p[1] == name
+            if republish:
+                for fn in self.observers:
+                    fn(snapshot)
+            for key in [k for k, n in self.bindings.items() if n == name]:
+                del self.bindings[key]
+            loaded = dict(self.loaded)
+            loaded.pop(name, None)
+            if snapshot is not None and hotkey and hotkey not in self.bindings:
+                self.bindings[hotkey] = name
+                loaded[name] = snapshot
+            self.loaded = loaded
+            if republish:
+                self._seq += 1
+                self._pending = (self._seq, name, snapshot, None)
+                self.reloads += 1
+                return True
+        return False
+
+    def latest(self):
+        """(name, snapshot) most recently published, whether or not the worker has it yet."""
+        p = self._pending
+        return (p[1], p[2]) if p is not None else (None, None)
+
+    def current(self, applied_at=None):
+        """
+        Worker side: the snapshot to run this interval. An isolated engine
+        passes the clock time its child process actually adopted it.
+        """
+        p = self._pending
+        if p is not None and p[0] != self._applied:
+            self._applied = p[0]
+            self.active = p[2]
+            self.active_name = p[1]
+            if p[3] is not None:
+                now = self._clock.now() if applied_at is None else applied_at
+                self.last_latency_us = max(0.0, now - p[3]) * 1e6
+                self.latency.add(self.last_latency_us)
+                self.switches += 1
+        return self.active
+
+profile_switcher = ProfileSwitcher(hotkeys)
+
+# ===================== Config watcher =====================
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM  = 0x040
+_IN_MOVED_TO    = 0x080
+_IN_DELETE      = 0x200
+_IN_DELETE_SELF = 0x400
+_IN_MOVE_SELF   = 0x800
+_IN_Q_OVERFLOW  = 0x4000
+_IN_NONBLOCK    = 0o4000
+_IN_CLOEXEC     = 0o2000000
+_INOTIFY_EVENT  = struct.Struct("iIII")   # wd, mask, cookie, len; then the name
+
+def _inotify_watch(directory):
+    """Non-blocking inotify fd watching `directory`, or None where that isn't possible."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    mask = (_IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_DELETE
+            | _IN_DELETE_SELF | _IN_MOVE_SELF)
+    if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+class ConfigWatcher:
+    """
+    Watches a config directory from its own thread and calls
+    on_change(names) with the profile names whose files were written,
+    renamed or deleted (None: "anything may have changed", after an
+    inotify overflow). Uses inotify on Linux. Elsewhere, or when inotify
+    can't be set up, it polls: the directory's mtime catches creates,
+    deletes and rename-into-place saves, and only the names returned by
+    `interesting()` are stat'ed for in-place edits, so a poll stays cheap
+    however many profiles there are.
+    """
+    POLL_S = 0.5
+    SETTLE_S = 0.02     # editors save in several steps; report them together
+
+    def __init__(self, directory, on_change, interesting=None, poll_s=None, use_inotify=True):
+        self.directory = directory
+        self.on_change = on_change
+        self.interesting = interesting or (lambda: ())
+        self.poll_s = poll_s or self.POLL_S
+        self.use_inotify = use_inotify
+        self.mode = None            # "inotify" or "poll" once started
+        self.batches = 0
+        self._stop = threading.Event()
+        self._wake_r = self._wake_w = None
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        fd = _inotify_watch(self.directory) if self.use_inotify else None
+        if fd is not None:
+            self.mode = "inotify"
+            self._wake_r, self._wake_w = os.pipe()
+            target, args = self._inotify_loop, (fd,)
+        else:
+            self.mode = "poll"
+            target, args = self._poll_loop, ()
+        self._thread = threading.Thread(target=target, args=args, name="config-watch", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._wake_w is not None:
+            os.write(self._wake_w, b"x")
+        if self._thread is not None:
+            self._thread.join(1.0)
+            self._thread = None
+
+    def _emit(self, names):
+        self.batches += 1
+        try:
+            self.on_change(names)
+        except Exception as e:
+            print(f"[watch] change handler failed: {e}")
+
+    # -------- inotify --------
+    def _read_events(self, fd, names):
+        """Drain pending events into `names`; False if the directory itself went away."""
+        alive = True
+        while True:
+            try:
+                buf = os.read(fd, 64 * 1024)
+            except BlockingIOError:
+                return alive
+            off = 0
+            while off < len(buf):
+                _, mask, _, n = _INOTIFY_EVENT.unpack_from(buf, off)
+                off += _INOTIFY_EVENT.size
+                raw = buf[off:off + n].rstrip(b"\0")
+                off += n
+                if mask & _IN_Q_OVERFLOW:
+                    names.add(None)
+                elif mask & (_IN_DELETE_SELF | _IN_MOVE_SELF):
+                    alive = False
+                elif raw.lower().endswith(b".json"):
+                    names.add(os.path.splitext(os.fsdecode(raw))[0])
+
+    def _inotify_loop(self, fd):
+        wake = self._wake_r
+        try:
+            while not self._stop.is_set():
+                ready, _, _ = select.select([fd, wake], [], [])
+                if wake in ready:
+                    break
+                names = set()
+                alive = self._read_events(fd, names)
+                while alive:
+                    ready, _, _ = select.select([fd, wake], [], [], self.SETTLE_S)
+                    if fd not in ready:
+                        break
+                    alive = self._read_events(fd, names)
+                if names:
+                    self._emit(None if None in names else names)
+                if not alive:
+                    print("[watch] config directory went away; polling for it")
+                    self.mode = "poll"
+                    self._poll_loop()
+                    break
+        finally:
+            os.close(fd)
+            os.close(self._wake_r)
+            os.close(self._wake_w)
+            self._wake_r = self._wake_w = None
+
+    # -------- polling --------
+    def _scan(self):
+        out = {}
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.lower().endswith(".json") and entry.is_file():
+                        st = entry.stat()
+                        out[os.path.splitext(entry.name)[0]] = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            pass
+        return out
+
+    def _dir_mtime(self):
+        try:
+            return os.stat(self.directory).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _poll_loop(self):
+        known = self._scan()
+        dir_mtime = self._dir_mtime()
+        while not self._stop.wait(self.poll_s):
+            changed = set()
+            m = self._dir_mtime()
+            if m != dir_mtime:
+                dir_mtime = m
+                now = self._scan()
+                changed = {n for n in known.keys() | now.keys() if known.get(n) != now.get(n)}
+                known = now
+            else:
+                for name in self.interesting():
+                    try:
+                        st = os.stat(os.path.join(self.directory, f"{name}.json"))
+                        sig = (st.st_mtime_ns, st.st_size)
+                    except FileNotFoundError:
+                        sig = None
+                    if known.get(name) != sig:
+                        changed.add(name)
+                        if sig is None:
+                            known.pop(name, None)
+                        else:
+                            known[name] = sig
+            if changed:
+                self._emit(changed)
+
+# ===================== Packed profile library =====================
+# One file holding many profiles, read through mmap so a lookup touches only
+# the header, the index entries visited by a binary search and one record.
+#
+#   header   <4sHHIQ   magic "RCPL", version, reserved, count, index offset
+#   records  <ddiIH    x, y, interval_ms, n_segments, hotkey length
+#            <ddd      x, y, duration_ms   (n_segments times)
+#            utf-8 hotkey (hotkey length bytes; 0 for none)
+#   index    <64sQII   utf-8 name (NUL padded), record offset, length, reserved
+#
+# Index entries are sorted by their raw name bytes. Extra config keys that
+# aren't part of the record layout are not kept. Version 1 libraries (no
+# hotkey field) still read.
+LIB_MAGIC   = b"RCPL"
+LIB_VERSION = 2
+_LIB_HEADER = struct.Struct("<4sHHIQ")
+_LIB_ENTRY  = struct.Struct("<64sQII")
+_LIB_RECORD = struct.Struct("<ddiIH")
+_LIB_RECORD_V1 = struct.Struct("<ddiI")
+_LIB_SEG    = struct.Struct("<ddd")
+
+class ProfileLibrary:
+    """Read-only, memory-mapped view of a packed profile library."""
+    def __init__(self, path):
+        self.path = path
+        self._mm = None
+        self._f = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:   # empty file can't be mapped
+            self._f.close()
+            raise ValueError(f"{path}: not a profile library")
+        magic, version, _, count, index_off = _LIB_HEADER.unpack_from(self._mm, 0)
+        if magic != LIB_MAGIC or version not in (1, LIB_VERSION):
+            self.close()
+            raise ValueError(f"{path}: not a profile library (v{LIB_VERSION})")
+        if index_off + count * _LIB_ENTRY.size > len(self._mm):
+            self.close()
+            raise ValueError(f"{path}: truncated profile library")
+        self.count = count
+        self.version = version
+        self._index_off = index_off
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, name):
+        return self._find(name) is not None
+
+    def _entry(self, i):
+        return _LIB_ENTRY.unpack_from(self._mm, self._index_off + i * _LIB_ENTRY.size)
+
+    def _find(self, name):
+        key = name.encode("utf-8")
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            raw, off, length, _ = self._entry(mid)
+            cur = raw.rstrip(b"\0")
+            if cur == key:
+                return off, length
+            if cur < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def names(self) -> list:
+        names = [self._entry(i)[0].rstrip(b"\0").decode("utf-8") for i in range(self.count)]
+        return sorted(names, key=str.lower)
+
+    def get(self, name):
+        """Config dict for `name`, or None if it isn't in the library."""
+        hit = self._find(name)
+        if hit is None:
+            return None
+        off, _ = hit
+        if self.version == 1:
+            x, y, interval_ms, nseg = _LIB_RECORD_V1.unpack_from(self._mm, off)
+            keylen = 0
+            off += _LIB_RECORD_V1.size
+        else:
+            x, y, interval_ms, nseg, keylen = _LIB_RECORD.unpack_from(self._mm, off)
+            off += _LIB_RECORD.size
+        data = {"x": x, "y": y, "interval_ms": interval_ms}
+        if nseg:
+            segs = []
+            for _ in range(nseg):
+                sx, sy, dur = _LIB_SEG.unpack_from(self._mm, off)
+                segs.append({"x": sx, "y": sy, "duration_ms": dur})
+                off += _LIB_SEG.size
+            data["segments"] = segs
+        if keylen:
+            data["hotkey"] = self._mm[off:off + keylen].decode("utf-8")
+        return data
+
+    @staticmethod
+    def write(path, profiles: dict) -> None:
+        """
+        Write {name: config dict} as a library. The file is built next to
+        `path` and renamed over it, so readers never see a partial file.
+        Close any ProfileLibrary open on `path` first (Windows won't replace
+        a mapped file).
+        """
+        records = []
+        for name, data in profiles.items():
+            raw = name.encode("utf-8")
+            if not raw or len(raw) > 64 or b"\0" in raw:
+                raise ValueError(f"profile name not storable in a library: {name!r}")
+            segs = profile_segments({"segments": data.get("segments")}) if data.get("segments") else []
+            hotkey = str(data.get("hotkey") or "").strip().lower().encode("utf-8")
+            if len(hotkey) > 0xFFFF:
+                raise ValueError(f"hotkey of {name!r} not storable in a library")
+            rec = bytearray(_LIB_RECORD.pack(
+                float(data.get("x", 0.0)), float(data.get("y", -50.0)),
+                int(data.get("interval_ms", 120)), len(segs), len(hotkey)))
+            for seg in segs:
+                rec += _LIB_SEG.pack(*seg)
+            rec += hotkey
+            records.append((raw, bytes(rec)))
+        records.sort(key=lambda r: r[0])
+
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp = tempfile.mkstemp(prefix=".rcpl-", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(b"\0" * _LIB_HEADER.size)
+                entries = []
+                off = _LIB_HEADER.size
+                for raw, rec in records:
+                    f.write(rec)
+                    entries.append(_LIB_ENTRY.pack(raw, off, len(rec), 0))
+                    off += len(rec)
+                f.write(b"".join(entries))
+                f.seek(0)
+                f.write(_LIB_HEADER.pack(LIB_MAGIC, LIB_VERSION, 0, len(records), off))
+                f.flush()
+                os.fsync(f.fileno())
+            # mkstemp creates the file 0600; give it the mode a plain open()
+            # would have (or the one of the library it replaces)
+            try:
+                mode = stat.S_IMODE(os.stat(path).st_mode)
+            except FileNotFoundError:
+                umask = os.umask(0)
+                os.umask(umask)
+                mode = 0o666 & ~umask
+            os.chmod(tmp, mode)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+
+def pack_config_dir(lib_path, directory=None) -> int:
+    """Pack every JSON profile in `directory` (default CONFIG_DIR) into lib_path."""
+    store = ConfigStore(directory) if directory else config_store
+    profiles = {name: store.load(name) for name in store.refresh(force=True)}
+    ProfileLibrary.write(lib_path, profiles)
+    return len(profiles)
+
+def unpack_library(lib_path, directory=None) -> int:
+    """Write every profile in lib_path out as <name>.json in `directory`."""
+    store = ConfigStore(directory) if directory else config_store
+    with ProfileLibrary(lib_path) as lib:
+        names = lib.names()
+        for name in names:
+            store.save(name, lib.get(name))
+    return len(names)
+
+# ===================== Simulator =====================
+def default_timeline(interval_s, bursts=3, intervals=8, gap_s=0.25):
+    """
+    Scripted (t, button, pressed) edges: arm, fire for `intervals` pattern
+    intervals, release, pause; repeated `bursts` times.
+    """
+    tl = []
+    t = 0.05
+    for _ in range(bursts):
+        tl.append((t, "right", True)); t += 0.1
+        tl.append((t, "left", True)); t += interval_s * intervals
+        tl.append((t, "left", False)); t += 0.05
+        tl.append((t, "right", False)); t += gap_s
+    return tl
+
+def simulate(params: ParamSnapshot, timeline, end_s=None, capacity=1 << 16) -> dict:
+    """
+    Run movement_loop for `params` against a scripted button timeline in
+    virtual time. Returns the RecordingBackend with every injected delta
+    (timestamps in simulated seconds) and the start time of each interval.
+    """
+    clock = VirtualClock()
+    trig = TriggerState(clock)
+    stop = CancelToken(clock)
+    rec = RecordingBackend(capacity, clock=clock.now)
+    sched = HybridScheduler(clock=clock)
+    starts = []
+
+    def get_params():
+        starts.append(clock.t)
+        return params
+
+    for t, button, pressed in timeline:
+        clock.at(t, functools.partial(trig.set_button, button, pressed))
+    if end_s is None:
+        end_s = max((t for t, _, _ in timeline), default=0.0) + params.pattern.duration_s
+    clock.at(end_s, stop.set)
+    movement_loop(get_params, rec, sched, trig, stop)
+    return {"backend": rec, "interval_starts": starts, "end_s": end_s, "scheduler": sched}
+
+def simulation_report(params: ParamSnapshot, sim: dict) -> dict:
+    """Totals, event counts and per-interval drift against the compiled pattern."""
+    rec = sim["backend"]
+    starts = sim["interval_starts"]
+    pattern = params.pattern
+    exp_dx, exp_dy = pattern.total()
+    bounds = starts[1:] + [math.inf]
+    drifts = []
+    j = 0
+    n = rec.count
+    for start, nxt in zip(starts, bounds):
+        while j < n and rec.t[j] < start:
+            j += 1
+        k = j
+        sx = sy = 0
+        while k < n and rec.t[k] < nxt:
+            sx += rec.dx[k]
+            sy += rec.dy[k]
+            k += 1
+        complete = min(nxt, sim["end_s"]) - start >= pattern.duration_s - 1e-9
+        if complete:
+            drifts.append(max(abs(sx - exp_dx), abs(sy - exp_dy)))
+        j = k
+    total_dx, total_dy = rec.total()
+    return {
+        "intervals": len(starts),
+        "events": rec.count,
+        "flushes": rec.flushes,
+        "total_dx": total_dx,
+        "total_dy": total_dy,
+        "interval_dx": exp_dx,
+        "interval_dy": exp_dy,
+        "max_drift_px": max(drifts, default=0),
+        "simulated_s": round(sim["end_s"], 3),
+    }
+
+def _simulate_config_file(path) -> dict:
+    name = os.path.splitext(os.path.basename(path))[0]
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            params = ParamSnapshot.from_config(json.load(f))
+        t = time.perf_counter()
+        sim = simulate(params, default_timeline(params.pattern.duration_s))
+        wall = time.perf_counter() - t
+        rep = simulation_report(params, sim)
+        rep["wall_ms"] = round(wall * 1e3, 2)
+        rep["speedup"] = round(sim["end_s"] / wall) if wall > 0 else 0
+        return {"name": name, **rep}
+    except Exception as e:
+        return {"name": name, "error": f"{type(e).__name__}: {e}"}
+
+def validate_config_dir(directory=None, workers=None) -> list:
+    """Simulate every profile in `directory` across a process pool; one report each."""
+    directory = directory or CONFIG_DIR
+    if not os.path.isdir(directory):
+        return []
+    paths = sorted(
+        (os.path.join(directory, f) for f in os.listdir(directory) if f.lower().endswith(".json")),
+        key=str.lower)
+    if not paths:
+        return []
+    from concurrent.futures import ProcessPoolExecutor   # pulls in multiprocessing
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(_simulate_config_file, paths,
+                           chunksize=max(1, len(paths) // (4 * (workers or os.cpu_count() or 1)))))
+
+# ===================== Isolated engine process =====================
+# movement_loop can run in a child process of its own, so the Tk mainloop,
+# PIL resampling and the listener callbacks never hold the GIL it needs at
+# a step deadline. The two sides share one small block of memory; nothing
+# is pickled after startup.
+def _align8(n):
+    return (n + 7) & ~7
+
+class SharedEngineBlock:
+    """
+    Layout of the shared block between the UI process and an isolated
+    engine. Three regions, each with exactly one writer and its own
+    sequence counter (a seqlock: odd while being written, readers retry
+    until they see the same even value before and after):
+
+      buttons  parent -> child   edge count, left, right
+      params   parent -> child   x, y, interval_ms and the compiled pattern's
+                                 step arrays, up to MAX_STEPS steps
+      stats    child  -> parent  scheduler counters and the lateness histogram
+
+    The pattern goes across compiled, so adopting a new profile in the
+    child is a copy of its arrays, never a compile on the fire path.
+    Arrays are stored in their native layout: both sides are the same
+    build on the same machine.
+
+    Timestamps are MONOTONIC (perf_counter), which is system-wide on the
+    platforms the engine runs on, so the two processes can compare them.
+    """
+    MAGIC = b"RCE2"
+    MAX_STEPS = 1 << 16                     # ~270 s of pattern at 240 Hz
+    _HEAD = struct.Struct("<4sI")           # magic, block size
+    _SEQ = struct.Struct("<Q")
+    _BUTTONS = struct.Struct("<QBB")        # edges, left, right
+    # x, y, interval_ms, segment count, steps, events, residual x, residual y
+    _PARAMS = struct.Struct("<ddiIIIdd")
+    # CompiledPattern arrays: (name, typecode, counted by steps or events)
+    _ARRAYS = (("dx", "l", "steps"), ("dy", "l", "steps"), ("t", "d", "steps"),
+               ("ex", "l", "events"), ("ey", "l", "events"), ("et", "d", "events"),
+               ("estep", "l", "events"))
+    # pid, intervals, params seq applied, waits, misses,
+    # applied_at, max late us, mean late us, margin us
+    _STATS = struct.Struct("<QQQQQdddd")
+    _HIST = struct.Struct(f"<{Histogram.BUCKETS}Q")
+
+    BUTTONS_AT = _HEAD.size
+    PARAMS_AT = BUTTONS_AT + _SEQ.size + _align8(_BUTTONS.size)
+    PATTERN_AT = _align8(PARAMS_AT + _SEQ.size + _PARAMS.size)
+    STATS_AT = PATTERN_AT + MAX_STEPS * sum(array(code).itemsize for _, code, _ in _ARRAYS)
+    SIZE = STATS_AT + _SEQ.size + _STATS.size + _HIST.size
+
+    def __init__(self, buf, create=False):
+        self.buf = buf
+        if create:
+            buf[:self.SIZE] = bytes(self.SIZE)
+            self._HEAD.pack_into(buf, 0, self.MAGIC, self.SIZE)
+        elif tuple(self._HEAD.unpack_from(buf, 0)) != (self.MAGIC, self.SIZE):
+            raise ValueError("shared block is not an engine block of this version")
+
+    def _begin(self, at):
+        seq = self._SEQ.unpack_from(self.buf, at)[0] + 1
+        self._SEQ.pack_into(self.buf, at, seq)
+        return seq
+
+    def _end(self, at, seq):
+        self._SEQ.pack_into(self.buf, at, seq + 1)
+
+    def _read(self, at, read):
+        buf = self.buf
+        seq = self._SEQ
+        while True:
+            s = seq.unpack_from(buf, at)[0]
+            if s & 1:
+                time.sleep(0)
+                continue
+            value = read()
+            if seq.unpack_from(buf, at)[0] == s:
+                return s, value
+
+    def seq(self, at) -> int:
+        return self._SEQ.unpack_from(self.buf, at)[0]
+
+    # -------- buttons (parent writes) --------
+    def write_buttons(self, edges, left, right):
+        at = self.BUTTONS_AT
+        seq = self._begin(at)
+        self._BUTTONS.pack_into(self.buf, at + 8, edges, left, right)
+        self._end(at, seq)
+
+    def buttons(self):
+        """(edges, left, right)"""
+        at = self.BUTTONS_AT
+        return self._read(at, lambda: self._BUTTONS.unpack_from(self.buf, at + 8))[1]
+
+    # -------- params (parent writes) --------
+    @classmethod
+    def check(cls, snap: ParamSnapshot):
+        """ValueError if the isolated engine can't take `snap`."""
+        if snap.pattern.steps > cls.MAX_STEPS:
+            raise ValueError(f"isolated engine takes patterns of at most {cls.MAX_STEPS} steps "
+                             f"(profile has {snap.pattern.steps})")
+
+    def write_params(self, snap: ParamSnapshot) -> int:
+        self.check(snap)
+        p = snap.pattern
+        at = self.PARAMS_AT
+        seq = self._begin(at)
+        self._PARAMS.pack_into(self.buf, at + 8, snap.x, snap.y, snap.interval_ms, p.segments,
+                               p.steps, p.events, p.residual_x, p.residual_y)
+        off = self.PATTERN_AT
+        for name, code, _ in self._ARRAYS:
+            data = memoryview(getattr(p, name)).cast("B")
+            self.buf[off:off + len(data)] = data
+            off += self.MAX_STEPS * array(code).itemsize
+        self._end(at, seq)
+        return seq + 1
+
+    def params_seq(self) -> int:
+        return self.seq(self.PARAMS_AT)
+
+    def read_params(self):
+        """(seq, ParamSnapshot) as last published, with the parent's compiled pattern."""
+        at = self.PARAMS_AT
+
+        def read():
+            x, y, interval_ms, segments, steps, events, rx, ry = self._PARAMS.unpack_from(self.buf, at + 8)
+            counts = {"steps": min(steps, self.MAX_STEPS), "events": min(events, self.MAX_STEPS)}
+            arrays = []
+            off = self.PATTERN_AT
+            for _, code, counted in self._ARRAYS:
+                a = array(code)
+                a.frombytes(self.buf[off:off + counts[counted] * a.itemsize])
+                arrays.append(a)
+                off += self.MAX_STEPS * a.itemsize
+            dx, dy, t, ex, ey, et, estep = arrays
+            pattern = CompiledPattern.from_arrays(dx, dy, t, segments, ex, ey, et, estep, rx, ry)
+            return x, y, interval_ms, pattern
+        seq, (x, y, interval_ms, pattern) = self._read(at, read)
+        return seq, ParamSnapshot(x, y, interval_ms, pattern=pattern)
+
+    # -------- stats (child writes) --------
+    def write_stats(self, pid, intervals, params_seq, applied_at, scheduler):
+        at = self.STATS_AT
+        sched = scheduler
+        seq = self._begin(at)
+        mean = sched.total_late_s / sched.waits * 1e6 if sched.waits else 0.0
+        self._STATS.pack_into(self.buf, at + 8, pid, intervals, params_seq, sched.waits,
+                              sched.misses, applied_at, sched.max_late_s * 1e6, mean,
+                              sched.margin * 1e6)
+        if sched.late_hist is not None:
+            self._HIST.pack_into(self.buf, at + 8 + self._STATS.size, *sched.late_hist.counts)
+        self._end(at, seq)
+
+    def stats(self) -> dict:
+        at = self.STATS_AT
+
+        def read():
+            return (self._STATS.unpack_from(self.buf, at + 8),
+                    self._HIST.unpack_from(self.buf, at + 8 + self._STATS.size))
+        _, (fields, counts) = self._read(at, read)
+        pid, intervals, params_seq, waits, misses, applied_at, max_late, mean_late, margin = fields
+        late = Histogram()
+        late.counts = list(counts)
+        late.n = sum(counts)
+        late.max_us = max_late
+        return {
+            "pid": pid,
+            "intervals": intervals,
+            "params_seq": params_seq,
+            "applied_at": applied_at,
+            "waits": waits,
+            "misses": misses,
+            "margin_us": round(margin, 1),
+            "max_late_us": round(max_late, 1),
+            "mean_late_us": round(mean_late, 1),
+            "late": late,
+        }
+
+class SharedTrigger:
+    """
+    Child side of the button region, with TriggerState's wait interface.
+    The parent rings `bell` (a multiprocessing.Event) after every write
+    and on stop, so the edge waits block instead of polling the block.
+    wait_release is the cadence sleep, so like TriggerState's it sleeps in
+    WAIT_SLICE_S slices: Event.wait times out on the Windows timer tick.
+    """
+    def __init__(self, block: SharedEngineBlock, bell):
+        self.block = block
+        self._bell = bell
+
+    @property
+    def firing(self):
+        _, left, right = self.block.buttons()
+        return bool(left and right)
+
+    def interrupt(self):
+        self._bell.set()
+
+    def _wait(self, stop, done, timeout):
+        deadline = None if timeout is None else MONOTONIC.now() + timeout
+        bell = self._bell
+        while True:
+            _, left, right = self.block.buttons()
+            if done(left, right) or stop.is_set():
+                return left, right
+            # clear, then look again: a write landing in between rings the bell after the clear
+            bell.clear()
+            _, left, right = self.block.buttons()
+            if done(left, right) or stop.is_set():
+                return left, right
+            if deadline is None:
+                bell.wait()
+                continue
+            remaining = deadline - MONOTONIC.now()
+            if remaining <= 0:
+                return left, right
+            bell.wait(remaining)
+
+    def wait_armed(self, stop, timeout=None):
+        _, right = self._wait(stop, lambda left, right: right, timeout)
+        return bool(right) and not stop.is_set()
+
+    def wait_fire(self, stop, timeout=None):
+        left, right = self._wait(stop, lambda left, right: left or not right, timeout)
+        return bool(left and right) and not stop.is_set()
+
+    def wait_release(self, stop, timeout):
+        if timeout is None:
+            left, right = self._wait(stop, lambda left, right: not (left and right), None)
+            return bool(left and right) and not stop.is_set()
+        buttons = self.block.buttons
+        deadline = MONOTONIC.now() + timeout
+        while not stop.is_set():
+            _, left, right = buttons()
+            if not (left and right):
+                return False
+            remaining = deadline - MONOTONIC.now()
+            if remaining <= 0:
+                return True
+            time.sleep(remaining if remaining < WAIT_SLICE_S else WAIT_SLICE_S)
+        return False
+
+def _engine_process(shm_name, bell, stop, backend_factory=None, gc_mode=None):
+    """Child process entry point: movement_loop fed from the shared block."""
+    from multiprocessing import shared_memory
+    shm = shared_memory.SharedMemory(name=shm_name)   # the parent owns and unlinks it
+    block = SharedEngineBlock(shm.buf)
+    backend = backend_factory() if backend_factory is not None else default_backend()
+    scheduler = HybridScheduler()
+    scheduler.late_hist = Histogram()
+    pid = os.getpid()
+    seen, snap = block.read_params()
+    applied_at = MONOTONIC.now()
+    intervals = 0
+
+    def get_params():
+        nonlocal seen, applied_at, snap, intervals
+        if block.params_seq() != seen:
+            seen, snap = block.read_params()
+            applied_at = MONOTONIC.now()
+        intervals += 1
+        block.write_stats(pid, intervals, seen, applied_at, scheduler)
+        return snap
+
+    block.write_stats(pid, 0, seen, applied_at, scheduler)
+    try:
+        movement_loop(get_params, backend, scheduler, SharedTrigger(block, bell), stop,
+                      gc_mode=gc_mode)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        block.write_stats(pid, intervals, seen, applied_at, scheduler)
+        block = None
+        shm.close()
+
+class ProcessWorker:
+    """
+    MotionWorker's interface with movement_loop in a child process.
+    Published snapshots and button edges are copied into the shared block
+    by observers on the switcher and the trigger (so whatever thread made
+    the change writes it, under that object's lock), and the bell wakes
+    the child. stop() sets the stop event, rings the bell and joins for up
+    to STOP_TIMEOUT_S before terminating the child. Snapshots go across
+    with their compiled pattern, which the child adopts at an interval
+    boundary; one the block can't hold is refused before it is published.
+    """
+    STOP_TIMEOUT_S = 0.5
+
+    def __init__(self, switcher, trig=None, backend_factory=None):
+        self.switcher = switcher
+        self.trig = trig if trig is not None else trigger
+        self.backend_factory = backend_factory
+        self.thread = None          # nothing to sample in this process
+        self.process = None
+        self.block = None
+        self._shm = None
+        self._bell = None
+        self._stop = None
+        self._written = 0
+        self._synced = 0
+        self.last_stop_s = None
+        self.last_stats = None      # the child's stats as of the last stop()
+
+    @property
+    def running(self) -> bool:
+        return (self.process is not None and self.process.is_alive()
+                and not self._stop.is_set())
+
+    @property
+    def ready(self) -> bool:
+        """The child is up and has attached to the block."""
+        return self.block is not None and self.block.stats()["pid"] != 0
+
+    def wait_ready(self, timeout=10.0) -> bool:
+        deadline = MONOTONIC.now() + timeout
+        while not self.ready:
+            if not self.running or MONOTONIC.now() > deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+    def start(self):
+        if self.running:
+            return
+        import multiprocessing
+        from multiprocessing import shared_memory
+        self._release()
+        _, snap = self.switcher.latest()
+        if snap is not None:
+            SharedEngineBlock.check(snap)
+        ctx = multiprocessing.get_context("spawn")
+        self._shm = shared_memory.SharedMemory(create=True, size=SharedEngineBlock.SIZE)
+        self.block = SharedEngineBlock(self._shm.buf, create=True)
+        self._bell = ctx.Event()
+        self._stop = ctx.Event()
+        with self.switcher._lock:
+            _, snap = self.switcher.latest()
+            if snap is not None:
+                self._published(snap)
+            self.switcher.observers.append(self._published)
+        with self.trig._cond:
+            self._buttons(self.trig.left, self.trig.right)
+            self.trig.observers.append(self._buttons)
+        self.process = ctx.Process(
+            target=_engine_process, name="recoil-engine",
+            args=(self._shm.name, self._bell, self._stop, self.backend_factory, GC_WHILE_FIRING),
+            daemon=True,
+        )
+        self.process.start()
+
+    def stop(self):
+        """Stop the child; returns once it exits (terminated after STOP_TIMEOUT_S)."""
+        if self.process is None:
+            return
+        self._detach()
+        t0 = MONOTONIC.now()
+        self._stop.set()
+        self._bell.set()
+        self.process.join(self.STOP_TIMEOUT_S)
+        if self.process.is_alive():
+            print(f"[worker] engine process still running {self.STOP_TIMEOUT_S * 1e3:.0f} ms after stop; terminating")
+            self.process.terminate()
+            self.process.join(1.0)
+            self.last_stop_s = None
+        else:
+            self.last_stop_s = MONOTONIC.now() - t0
+        self.sync()
+        self.last_stats = self.block.stats()
+        self._release()
+
+    def _detach(self):
+        for lock, observers, fn in ((self.switcher._lock, self.switcher.observers, self._published),
+                                    (self.trig._cond, self.trig.observers, self._buttons)):
+            with lock:
+                if fn in observers:
+                    observers.remove(fn)
+
+    def _release(self):
+        self._detach()
+        self.block = None
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+        self.process = None
+
+    # observers: called with the switcher's / trigger's lock held; the
+    # switcher calls them before installing the snapshot, so a refusal here
+    # leaves the parent and the child on the same profile
+    def _published(self, snapshot):
+        self._written = self.block.write_params(snapshot)
+        self._bell.set()
+
+    def _buttons(self, left, right):
+        self.block.write_buttons(self.trig.edges, left, right)
+        self._bell.set()
+
+    def sync(self):
+        """Mark the switcher's pending snapshot applied once the child has adopted it."""
+        if self.block is None:
+            return
+        st = self.block.stats()
+        with self.switcher._lock:
+            if st["params_seq"] == self._written and self._written != self._synced:
+                self._synced = self._written
+                self.switcher.current(st["applied_at"])
+
+    def stats(self) -> dict:
+        st = self.block.stats() if self.block is not None else self.last_stats
+        if st is None:
+            return {}
+        st = dict(st)
+        late = st.pop("late")
+        st["late_p50_us"] = late.percentile(0.5)
+        st["late_p99_us"] = late.percentile(0.99)
+        return st
+
+# ===================== Engine =====================
+def snapshot_data(snap: ParamSnapshot, hotkey=None) -> dict:
+    """Config-shaped dict for a snapshot (what a profile file would hold)."""
+    data = {"x": snap.x, "y": snap.y, "interval_ms": snap.interval_ms}
+    if snap.segments:
+        data["segments"] = [{"x": dx, "y": dy, "duration_ms": d} for dx, dy, d in snap.segments]
+    if hotkey:
+        data["hotkey"] = hotkey
+    return data
+
+class Engine:
+    """
+    The motion engine with no UI attached: worker thread, input listeners
+    and the parameter slot. RecoilApp drives one in-process; --headless
+    runs one behind the local control channel, and RemoteEngine gives the
+    GUI the same interface over that channel. isolate=True runs the
+    worker in a child process (ProcessWorker) instead of a thread.
+    """
+    def __init__(self, switcher=None, isolate=False):
+        self.switcher = switcher or profile_switcher
+        self.isolated = bool(isolate)
+        if self.isolated:
+            self.worker = ProcessWorker(self.switcher)
+        else:
+            self.worker = MotionWorker(self.switcher.current)
+        self.listener_running = False
+        self.watcher = None
+        self.config_changes = 0
+
+    @property
+    def running(self) -> bool:
+        return self.worker.running
+
+    @property
+    def worker_thread(self):
+        return self.worker.thread
+
+    def on(self) -> int:
+        """Start listeners and the worker; returns how many hotkeys are bound."""
+        n = len(self.switcher.bindings)
+        if not self.listener_running:
+            n = self.switcher.preload()
+            start_listeners()
+            self.listener_running = True
+            if n:
+                print(f"[hotkeys] {n} profiles preloaded: " +
+                      ", ".join(f"{k}={v}" for k, v in sorted(self.switcher.bindings.items())))
+        self.worker.start()
+        return n
+
+    def off(self):
+        self.worker.stop()
+        stop_listeners()
+        self.listener_running = False
+        trigger.reset()
+
+    def close(self):
+        self.off()
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+
+    # -------- hot reload --------
+    def watch_configs(self, poll_s=None):
+        """Follow edits to configs/ made outside the app (see ConfigWatcher)."""
+        if self.watcher is None:
+            self.watcher = ConfigWatcher(config_store.directory, self._configs_changed,
+                                         self._watched_names, poll_s)
+            self.watcher.start()
+        return self.watcher.mode
+
+    def _watched_names(self):
+        name, _ = self.switcher.latest()
+        names = set(self.switcher.loaded)
+        if name:
+            names.add(name)
+        return names
+
+    def _configs_changed(self, names):
+        """Watcher thread: re-read, validate and install the profiles that changed."""
+        self.config_changes += 1
+        config_store.refresh(force=names is None)
+        active, _ = self.switcher.latest()
+        if names is None:
+            names = self._watched_names()
+        for name in sorted(names):
+            # only the running profile and (while listening) hotkey profiles matter
+            if name != active and not (self.listener_running or name in self.switcher.loaded):
+                continue
+            try:
+                data = config_store.load(name)
+            except FileNotFoundError:
+                self.switcher.reload(name, None)
+                continue
+            except (OSError, ValueError, TypeError) as e:
+                print(f'[watch] "{name}" not reloaded: {e}')
+                continue
+            try:
+                snap = ParamSnapshot.from_config(data)
+            except (TypeError, ValueError, AttributeError) as e:
+                print(f'[watch] "{name}" is not a valid profile, keeping the old one: {e}')
+                continue
+            hotkey = str(data.get("hotkey") or "").strip().lower() if self.listener_running else None
+            try:
+                if self.switcher.reload(name, snap, hotkey):
+                    print(f'[watch] reloaded "{name}"')
+            except ValueError as e:
+                print(f'[watch] "{name}" not reloaded, keeping the old one: {e}')
+
+    def reload_hotkeys(self):
+        if self.listener_running:
+            self.switcher.preload()
+            start_listeners()   # brings up the keyboard listener if keys are now bound
+
+    def publish(self, snapshot: ParamSnapshot, name=None):
+        self.switcher.publish(snapshot, name)
+
+    def load_profile(self, name: str) -> ParamSnapshot:
+        """Make `name` the active profile; bound profiles come precompiled."""
+        snap = self.switcher.loaded.get(name)
+        if snap is None:
+            snap = ParamSnapshot.from_config(config_store.load(name))
+        self.publish(snap, name)
+        return snap
+
+    def update(self, fields: dict, name=None) -> ParamSnapshot:
+        """Publish the current parameters with `fields` (x/y/interval_ms/segments) replaced."""
+        cur_name, cur = self.switcher.latest()
+        data = snapshot_data(cur) if cur is not None else {}
+        data.update(fields)
+        snap = ParamSnapshot.from_config(data)
+        self.publish(snap, name if name is not None else cur_name)
+        return snap
+
+    def hotkey_for(self, name):
+        return next((k for k, n in self.switcher.bindings.items() if n == name), None)
+
+    def status(self) -> dict:
+        if self.isolated:
+            self.worker.sync()
+        name, snap = self.switcher.latest()
+        return {
+            "running": self.running,
+            "profile": name,
+            "params": snapshot_data(snap, self.hotkey_for(name)) if snap is not None else None,
+            "switches": self.switcher.switches,
+            "reloads": self.switcher.reloads,
+            "config_changes": self.config_changes,
+        }
+
+    def stats(self) -> dict:
+        lat = self.switcher.latency
+        st = self.status()
+        st.update({
+            "backend": type(_backend).__name__ if _backend is not None else None,
+            "scheduler": (self.worker.stats() if self.isolated else
+                          _scheduler.stats() if _scheduler is not None else {}),
+            "isolated": self.isolated,
+            "trigger_edges": trigger.edges,
+            "buttons": listener_mouse.name if listener_mouse is not None else None,
+            "last_stop_ms": (round(self.worker.last_stop_s * 1e3, 3)
+                             if self.worker.last_stop_s is not None else None),
+            "watcher": self.watcher.mode if self.watcher is not None else None,
+            "hotkeys": dict(self.switcher.bindings),
+            "switch_latency_us": {"p50": lat.percentile(0.5), "p99": lat.percentile(0.99),
+                                  "max": round(lat.max_us, 1)},
+        })
+        return st
+
+# ===================== Local control channel =====================
+# Newline-delimited JSON over a Unix socket (the default where there is one)
+# or a loopback TCP port. The first line must be the handshake
+#   {"cmd": "auth", "token": "..."}
+# with the token the server wrote, readable only by this user, to
+# control_token_path(address) when it started; then:
+#   {"cmd": "on" | "off" | "toggle" | "stats" | "status" | "profiles" | "reload"}
+#   {"cmd": "profile", "name": "..."}
+#   {"cmd": "set", "params": {"x": .., "y": .., "interval_ms": .., "segments": [..]}, "name": ..}
+# Every reply is one JSON line with "ok" and either the engine status or "error".
+# A line that isn't a JSON object, or a missing/wrong token, closes the
+# connection: a browser POSTing to the port gets no further than its
+# request line.
+CONTROL_TCP_ADDRESS = "127.0.0.1:47321"
+
+def _runtime_dir():
+    return (os.environ.get("XDG_RUNTIME_DIR") or os.environ.get("LOCALAPPDATA")
+            or tempfile.gettempdir())
+
+def default_control_address() -> str:
+    if os.name != "nt" and hasattr(socket, "AF_UNIX"):
+        return os.path.join(_runtime_dir(), f"recoil-{os.getuid()}.sock")
+    return CONTROL_TCP_ADDRESS
+
+CONTROL_ADDRESS = default_control_address()
+
+def control_token_path(address: str) -> str:
+    """Where the server listening on `address` keeps its per-run token."""
+    tag = re.sub(r"[^A-Za-z0-9]+", "-", address).strip("-")
+    return os.path.join(_runtime_dir(), f"recoil-control-{tag}.token")
+
+def read_control_token(address: str) -> str:
+    with open(control_token_path(address), "r", encoding="ascii") as f:
+        return f.read().strip()
+
+def _write_control_token(address: str, token: str) -> str:
+    path = control_token_path(address)
+    try:
+        os.remove(path)     # never write through someone else's file or link
+    except FileNotFoundError:
+        pass
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w", encoding="ascii") as f:
+        f.write(token)
+    return path
+
+def parse_control_address(address: str):
+    """'host:port' -> ("tcp", host, port); a filesystem path -> ("unix", path, None)."""
+    if os.sep in address or address.endswith(".sock"):
+        return "unix", address, None
+    host, _, port = address.rpartition(":")
+    host = host.strip("[]") or "127.0.0.1"
+    if host != "localhost" and not ipaddress.ip_address(host).is_loopback:
+        raise ValueError(f"control channel only listens on loopback, not {host}")
+    return "tcp", host, int(port)
+
+class ControlServer:
+    """Serves an Engine on the local control channel from an asyncio loop."""
+    def __init__(self, engine: Engine):
+        from concurrent.futures import ThreadPoolExecutor
+        self.engine = engine
+        # engine calls can block briefly (worker join); one thread keeps them ordered
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="control")
+        self.address = None
+        self.token = None           # per run; set by serve()
+
+    def handle(self, req: dict) -> dict:
+        engine = self.engine
+        try:
+            cmd = req.get("cmd")
+            if cmd == "on":
+                engine.on()
+            elif cmd == "off":
+                engine.off()
+            elif cmd == "toggle":
+                engine.off() if engine.running else engine.on()
+            elif cmd == "profile":
+                name = str(req["name"])
+                if name not in list_configs():
+                    raise ValueError(f"no profile named {name!r}")
+                engine.load_profile(name)
+            elif cmd == "set":
+                engine.update(dict(req.get("params") or {}), req.get("name"))
+            elif cmd == "reload":
+                engine.reload_hotkeys()
+            elif cmd == "stats":
+                return {"ok": True, **engine.stats()}
+            elif cmd == "profiles":
+                return {"ok": True, "profiles": list_configs()}
+            elif cmd != "status":
+                raise ValueError(f"unknown command {cmd!r}")
+            return {"ok": True, **engine.status()}
+        except Exception as e:
+            return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+    async def _client(self, reader, writer):
+        import asyncio
+        import hmac
+        loop = asyncio.get_running_loop()
+        authed = False
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    req = json.loads(line)
+                    if not isinstance(req, dict):
+                        raise ValueError("request must be a JSON object")
+                except ValueError as e:
+                    # not a client of ours (an HTTP request, say): stop reading
+                    writer.write(json.dumps({"ok": False, "error": str(e)}).encode("utf-8") + b"\n")
+                    break
+                if not authed:
+                    token = req.get("token")
+                    if req.get("cmd") != "auth" or not isinstance(token, str) \
+                            or not hmac.compare_digest(token, self.token):
+                        writer.write(b'{"ok": false, "error": "authentication required"}\n')
+                        break
+                    authed = True
+                    resp = {"ok": True}
+                else:
+                    resp = await loop.run_in_executor(self._executor, self.handle, req)
+                writer.write(json.dumps(resp).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, ValueError):   # ValueError: line over the reader's limit
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, address=CONTROL_ADDRESS, ready=None):
+        """Listen until cancelled. `ready(where)` is called once the socket is bound."""
+        import asyncio
+        import secrets
+        kind, host, port = parse_control_address(address)
+        self.token = secrets.token_hex(16)
+        if kind == "unix":
+            try:
+                if stat.S_ISSOCK(os.stat(host).st_mode):
+                    os.remove(host)   # left over from a previous run
+            except FileNotFoundError:
+                pass
+            server = await asyncio.start_unix_server(self._client, path=host)
+            os.chmod(host, 0o600)
+            self.address = host
+        else:
+            server = await asyncio.start_server(self._client, host, port)
+            bound = server.sockets[0].getsockname()
+            self.address = f"{host}:{bound[1]}"
+        token_path = None
+        try:
+            token_path = _write_control_token(self.address, self.token)
+            if ready is not None:
+                ready(self.address)
+            async with server:
+                await server.serve_forever()
+        finally:
+            self._executor.shutdown(wait=False)
+            if token_path is not None and os.path.exists(token_path):
+                os.remove(token_path)
+            if kind == "unix" and os.path.exists(host):
+                os.remove(host)
+
+class RemoteEngine:
+    """
+    Engine-shaped client of a ControlServer, for running the GUI against
+    --headless. The handshake token is read from the server's token file
+    unless one is given.
+    """
+    def __init__(self, address=CONTROL_ADDRESS, timeout=2.0, token=None):
+        self.address = address
+        self.timeout = timeout
+        self.token = token
+        self._sock = None
+        self._rfile = None
+        self.worker_thread = None   # lives in the other process
+
+    def _connect(self):
+        kind, host, port = parse_control_address(self.address)
+        if kind == "unix":
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(host)
+        else:
+            sock = socket.create_connection((host, port), self.timeout)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._sock = sock
+        self._rfile = sock.makefile("rb")
+        try:
+            token = self.token if self.token is not None else read_control_token(self.address)
+            self._call("auth", token=token)
+        except BaseException:
+            self.close()
+            raise
+
+    def _call(self, cmd, **fields) -> dict:
+        if self._sock is None:
+            self._connect()
+        try:
+            self._sock.sendall(json.dumps({"cmd": cmd, **fields}).encode("utf-8") + b"\n")
+            line = self._rfile.readline()
+        except OSError:
+            self.close()
+            raise
+        if not line:
+            self.close()
+            raise ConnectionError(f"engine at {self.address} closed the connection")
+        resp = json.loads(line)
+        if not resp.pop("ok", False):
+            raise RuntimeError(resp.get("error", "engine error"))
+        return resp
+
+    @property
+    def running(self) -> bool:
+        return self._call("status")["running"]
+
+    def on(self) -> int:
+        self._call("on")
+        return len(self._call("stats")["hotkeys"])
+
+    def off(self):
+        self._call("off")
+
+    def reload_hotkeys(self):
+        self._call("reload")
+
+    def watch_configs(self, poll_s=None):
+        return self._call("stats")["watcher"]   # the engine process watches for itself
+
+    def publish(self, snapshot: ParamSnapshot, name=None):
+        self._call("set", params=snapshot_data(snapshot), name=name)
+
+    def load_profile(self, name: str):
+        self._call("profile", name=name)
+
+    def status(self) -> dict:
+        return self._call("status")
+
+    def stats(self) -> dict:
+        return self._call("stats")
+
+    def close(self):
+        # the engine keeps running; only this client goes away
+        if self._sock is not None:
+            try:
+                self._rfile.close()
+                self._sock.close()
+            finally:
+                self._sock = None
+                self._rfile = None
+
+def run_headless(address=CONTROL_ADDRESS, profile=None, start_on=False, isolate=False):
+    """Run the engine with no Tk window until interrupted."""
+    import asyncio
+    import signal
+    engine = Engine(isolate=isolate)
+    if profile:
+        engine.load_profile(profile)
+    else:
+        engine.publish(ParamSnapshot(0.0, -50.0, 120))
+    print(f"[watch] following {config_store.directory} ({engine.watch_configs()})")
+    if start_on:
+        engine.on()
+    server = ControlServer(engine)
+
+    def _terminate(*_):
+        raise KeyboardInterrupt
+    signal.signal(signal.SIGTERM, _terminate)   # shut down (and clean up) like Ctrl+C
+    try:
+        asyncio.run(server.serve(address, lambda where: print(f"[control] listening on {where}", flush=True)))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        engine.close()
 
 # ===================== Dark theme =====================
 BG_APP   = "#0b0d10"
@@ -225,35 +3111,110 @@ def apply_dark_theme(root: tk.Tk):
 
     style.configure("TSpinbox", fieldbackground="#0d0f13", background="#0d0f13",
                     foreground=FG_TEXT, bordercolor=BORDER, arrowsize=12)
+    style.configure("TEntry", fieldbackground="#0d0f13", foreground=FG_TEXT,
+                    bordercolor=BORDER, insertcolor=FG_TEXT)
     style.configure("TScale", background=BG_CARD, troughcolor="#0d0f13")
+    style.configure("TCheckbutton", background=BG_CARD, foreground=FG_TEXT, font=FONT_BASE)
+    style.map("TCheckbutton", background=[("active", BG_CARD)])
+    style.configure("Mono.TLabel", background=BG_CARD, foreground=FG_TEXT, font=("Consolas", 9))
 
 # ===================== Image background (draws immediately) =====================
+class _RenderCache:
+    """Size-keyed LRU of rendered frames, bounded by an approximate byte budget."""
+    def __init__(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self.used_bytes = 0
+        self._items = OrderedDict()   # key -> (value, cost)
+
+    def get(self, key):
+        item = self._items.get(key)
+        if item is None:
+            return None
+        self._items.move_to_end(key)
+        return item[0]
+
+    def put(self, key, value, cost):
+        old = self._items.pop(key, None)
+        if old is not None:
+            self.used_bytes -= old[1]
+        self._items[key] = (value, cost)
+        self.used_bytes += cost
+        while self.used_bytes > self.budget_bytes and len(self._items) > 1:
+            _, (_, c) = self._items.popitem(last=False)
+            self.used_bytes -= c
+
+    def clear(self):
+        self._items.clear()
+        self.used_bytes = 0
+
+    def __len__(self):
+        return len(self._items)
+
 class ImageBackground(tk.Label):
     """
     Loads 'background.png' / '.jpg' / '.jpeg' and paints it as a cover-fit background.
-    Draws immediately on startup and on every resize. Falls back to solid dark if missing.
+    Decoding and cover-fit resampling run on a worker thread; the Tk side
+    only converts finished frames to PhotoImages. Until the first frame is
+    ready (or if no image exists) the label is plain BG_APP. Resizes are
+    debounced, renders for sizes that are no longer current are dropped,
+    and rendered frames are kept in a size-keyed LRU.
     """
-    def __init__(self, master, **kw):
+    RESIZE_DEBOUNCE_MS = 60
+    POLL_MS = 15
+    CACHE_BUDGET_BYTES = 64 * 1024 * 1024   # ~4 bytes per pixel in Tk
+
+    def __init__(self, master, source=None, **kw):
         super().__init__(master, **kw)
         self["bg"] = BG_APP
-        self._img = None            # PIL Image
+        self._source = source       # PIL Image or path; None = look for background.*
+        self._img = None            # PIL Image (working copy, at most screen-sized); worker-owned
         self._imgtk = None          # PhotoImage
         self._target_w = 1
         self._target_h = 1
-        self._load_image()
+        self._pending = None        # after() id of the debounced redraw
+        self._polling = None        # after() id of the hand-back poll
+        self._cache = _RenderCache(self.CACHE_BUDGET_BYTES)
+        self.frames_rendered = 0
+        self.stale_dropped = 0
+        self.cache_hits = 0
+        self.render_s = 0.0         # worker-thread resample time
+        self.convert_s = 0.0        # Tk-thread PhotoImage time
+
+        # worker hand-off: newest request wins, one finished frame at a time
+        self._cond = threading.Condition()
+        self._gen = 0
+        self._shown_gen = 0
+        self._request = None        # (gen, w, h)
+        self._ready = None          # (gen, (w, h), PIL image)
+        self._closed = False
+        self._worker = threading.Thread(
+            target=self._render_worker,
+            args=(self.winfo_screenwidth(), self.winfo_screenheight()),
+            name="bg-render", daemon=True)
+        self._worker.start()
 
         # draw once the window exists
         self.bind("<Configure>", self._on_resize)
         self.after(50, self._initial_draw)
 
-    def _load_image(self):
+    # ---- worker thread ----
+    def _load_image(self, screen_w, screen_h):
+        if self._source is not None and not isinstance(self._source, str):
+            self._img = self._working_copy(self._source.convert("RGB"), screen_w, screen_h)
+            return
         base = os.path.dirname(os.path.abspath(__file__))
-        for name in ("background.png", "background.jpg", "background.jpeg"):
+        if self._source:
+            candidates = (self._source,)
+        else:
+            candidates = ("background.png", "background.jpg", "background.jpeg")
+        for name in candidates:
             path = os.path.join(base, name)
             if os.path.exists(path):
                 try:
-                    self._img = Image.open(path).convert("RGB")
-                    print(f"[image] loaded {name}")
+                    img = Image.open(path).convert("RGB")
+                    self._img = self._working_copy(img, screen_w, screen_h)
+                    print(f"[image] loaded {name} {img.size[0]}x{img.size[1]}"
+                          f" (working copy {self._img.size[0]}x{self._img.size[1]})")
                 except Exception as e:
                     print(f"[image] failed to open {name}: {e}")
                     self._img = None
@@ -261,6 +3222,29 @@ class ImageBackground(tk.Label):
         if self._img is None:
             print("[image] no background.png/.jpg found — using solid bg")
 
+    def _render_worker(self, screen_w, screen_h):
+        self._load_image(screen_w, screen_h)
+        if self._img is None:
+            return
+        while True:
+            with self._cond:
+                while self._request is None and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                gen, w, h = self._request
+                self._request = None
+            t = time.perf_counter()
+            img = self._cover_fit(self._img, w, h)
+            dt = time.perf_counter() - t
+            with self._cond:
+                self.render_s += dt
+                if gen != self._gen:
+                    self.stale_dropped += 1   # window moved on while we resampled
+                    continue
+                self._ready = (gen, (w, h), img)
+
+    # ---- Tk thread ----
     def _initial_draw(self):
         try:
             self._target_w = max(1, self.winfo_width())
@@ -272,17 +3256,72 @@ class ImageBackground(tk.Label):
     def _on_resize(self, _e=None):
         self._target_w = max(1, self.winfo_width())
         self._target_h = max(1, self.winfo_height())
-        self._redraw()
+        if self._pending is not None:
+            self.after_cancel(self._pending)
+        self._pending = self.after(self.RESIZE_DEBOUNCE_MS, self._redraw)
 
     def _redraw(self):
-        if self._img is None:
+        self._pending = None
+        key = (self._target_w, self._target_h)
+        imgtk = self._cache.get(key)
+        if imgtk is not None:
+            self.cache_hits += 1
+            with self._cond:
+                self._gen += 1          # anything in flight is now stale
+                self._request = None
+                self._shown_gen = self._gen
+            self._show(imgtk)
             return
-        img = self._cover_fit(self._img, self._target_w, self._target_h)
-        self._imgtk = ImageTk.PhotoImage(img)
-        self.configure(image=self._imgtk)
+        with self._cond:
+            self._gen += 1
+            self._request = (self._gen, key[0], key[1])
+            self._cond.notify()
+        if self._polling is None:
+            self._polling = self.after(self.POLL_MS, self._poll_ready)
+
+    def _poll_ready(self):
+        self._polling = None
+        with self._cond:
+            ready, self._ready = self._ready, None
+            current = self._gen
+        if ready is not None and ready[0] == current:
+            gen, key, img = ready
+            t = time.perf_counter()
+            imgtk = ImageTk.PhotoImage(img)
+            self.convert_s += time.perf_counter() - t
+            self._cache.put(key, imgtk, key[0] * key[1] * 4)
+            self.frames_rendered += 1
+            self._show(imgtk)
+            self._shown_gen = gen
+        if self._shown_gen != current and self._worker.is_alive():
+            self._polling = self.after(self.POLL_MS, self._poll_ready)
+
+    def _show(self, imgtk):
+        if imgtk is not self._imgtk:
+            self._imgtk = imgtk
+            self.configure(image=imgtk)
+
+    def destroy(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        super().destroy()
 
     @staticmethod
-    def _cover_fit(img: Image.Image, tw: int, th: int) -> Image.Image:
+    def _working_copy(img: "Image.Image", max_w: int, max_h: int) -> "Image.Image":
+        """
+        Downscale once so the image just covers a max_w x max_h window;
+        cover-fit for any smaller window then never touches the original.
+        """
+        w, h = img.size
+        scale = max(max_w / w, max_h / h)
+        if scale >= 1.0:
+            return img
+        size = (max(1, math.ceil(w * scale)), max(1, math.ceil(h * scale)))
+        return img.resize(size, Image.LANCZOS)
+
+    @staticmethod
+    def _cover_fit(img: "Image.Image", tw: int, th: int) -> "Image.Image":
         if tw <= 0 or th <= 0:
             return img
         w, h = img.size
@@ -302,35 +3341,79 @@ class ImageBackground(tk.Label):
 
 # ===================== UI App =====================
 class RecoilApp(tk.Tk):
-    def __init__(self):
+    def __init__(self, lazy=True, engine=None):
+        """
+        lazy=True defers the background widget (and with it PIL) until the
+        window has been shown; lazy=False builds everything up front.
+        engine defaults to an in-process Engine; pass a RemoteEngine to
+        drive a --headless one instead.
+        """
         super().__init__()
         self.title("tickys recoil app")
-        self.geometry("980x520")
-        self.minsize(920, 480)
+        self.geometry("980x620")
+        self.minsize(920, 580)
         self.configure(bg=BG_APP)
 
         apply_dark_theme(self)
 
-        # Background image (draw right away and keep behind everything)
-        self.bg_image = ImageBackground(self)
-        self.bg_image.place(x=0, y=0, relwidth=1, relheight=1)
-        self.bg_image.lower()
-        self.bg_image._initial_draw()
+        self.bg_image = None
+        if lazy:
+            self.after_idle(self._init_background)
+        else:
+            self._init_background()
 
         # Vars
         self.y_var = DoubleVar(value=-50.0)
         self.x_var = DoubleVar(value=0.0)
         self.interval_var = IntVar(value=120)
         self.status_var = StringVar(value="toggled off")
+        self.pattern_var = StringVar(value="constant")
+        self.hotkey_var = StringVar(value="")
+        self.telemetry_on = tk.BooleanVar(value=False)
+        self.telemetry_var = StringVar(value="off")
 
         # State
-        self.listener_running = False
-        self.worker_thread = None
+        self.engine = engine if engine is not None else Engine()
+        self.engine_on = False
         self.current_config_name = None
+        self._listed = []           # mirror of the Listbox rows
+        self._tel_reader = None
+        self._tel_after = None      # pending _update_telemetry callback
+        self._profiler = None
+        self.segments = None        # multi-segment pattern of the loaded config
+        self.params = ParamSnapshot(self.x_var.get(), self.y_var.get(), self.interval_var.get())
+        self._engine_seen = None     # (switches, reloads, config_changes) last mirrored
+        self._suspend_publish = False
+        for var in (self.x_var, self.y_var, self.interval_var):
+            var.trace_add("write", self._publish_params)
 
         self._build_ui()
         self._refresh_config_list()
 
+        # adopt whatever the engine is already running (a headless one may be),
+        # otherwise hand it the defaults
+        st = self.engine.status()
+        self._engine_seen = (st["switches"], st["reloads"], st["config_changes"])
+        if st["params"] is not None:
+            self._show_switched(st["profile"], st["params"])
+            self.engine_on = st["running"]
+            if self.engine_on:
+                self.status_var.set("toggled on")
+        else:
+            self.engine.publish(self.params)
+        try:
+            self.engine.watch_configs()
+        except (OSError, RuntimeError) as e:
+            print(f"[engine] config watcher unavailable: {e}")
+        self.after(100, self._poll_engine)
+
+    def _init_background(self):
+        # Background image (keep behind everything)
+        self.bg_image = ImageBackground(self)
+        self.bg_image.place(x=0, y=0, relwidth=1, relheight=1)
+        self.bg_image.lower()
+        self.bg_image._initial_draw()
+
     def _build_ui(self):
         # Foreground container (above background)
         root = ttk.Frame(self, style="TFrame")
@@ -354,6 +3437,10 @@ class RecoilApp(tk.Tk):
         )
         self.config_list.pack(fill="both", expand=True, padx=12, pady=(4,8))
 
+        hk = ttk.Frame(left, style="TFrame"); hk.pack(fill="x", padx=12, pady=(0,8))
+        ttk.Label(hk, text="hotkey").pack(side="left", padx=(4,10))
+        ttk.Entry(hk, textvariable=self.hotkey_var, width=12).pack(side="left")
+
         b1 = ttk.Frame(left, style="TFrame"); b1.pack(fill="x", padx=12, pady=(0,8))
         ttk.Button(b1, text="new", width=10, command=self._new_config).pack(side="left", padx=4)
         ttk.Button(b1, text="save", width=10, command=self._save_config).pack(side="left", padx=4)
@@ -373,9 +3460,9 @@ class RecoilApp(tk.Tk):
         controls = ttk.LabelFrame(right, text="movement controls", style="TLabelframe")
         controls.pack(fill="x", pady=(0,12))
 
-        self._add_slider_with_spin(controls, "Y (vertical)", -200, 200, self.y_var, step=1, digits=0)
-        self._add_slider_with_spin(controls, "X (horizontal)", -200, 200, self.x_var, step=1, digits=0)
-        self._add_slider_with_spin(controls, "Interval (ms)", 1, 2000, self.interval_var, step=1, digits=0, is_int=True)
+        self._add_slider_with_spin(controls, "Y (vertical)", *MOVE_RANGE, self.y_var, step=1, digits=0)
+        self._add_slider_with_spin(controls, "X (horizontal)", *MOVE_RANGE, self.x_var, step=1, digits=0)
+        self._add_slider_with_spin(controls, "Interval (ms)", *INTERVAL_RANGE, self.interval_var, step=1, digits=0, is_int=True)
 
         row = ttk.Frame(right, style="TFrame"); row.pack(pady=(2,10))
         ttk.Button(row, text="toggle on", command=self.toggle_on).pack(side="left", padx=6)
@@ -384,6 +3471,19 @@ class RecoilApp(tk.Tk):
         srow = ttk.Frame(right, style="TFrame"); srow.pack(fill="x")
         ttk.Label(srow, text="status:", style="TLabel").pack(side="left")
         ttk.Label(srow, textvariable=self.status_var).pack(side="left", padx=(8,0))
+        ttk.Label(srow, text="pattern:", style="TLabel").pack(side="left", padx=(24,0))
+        ttk.Label(srow, textvariable=self.pattern_var).pack(side="left", padx=(8,0))
+
+        # Telemetry — opt-in, polled from the Tk side only while recording
+        tel = ttk.LabelFrame(right, text="telemetry", style="TLabelframe")
+        tel.pack(fill="x", pady=(12,0))
+        trow = ttk.Frame(tel, style="TFrame"); trow.pack(fill="x", padx=12, pady=(8,4))
+        ttk.Checkbutton(trow, text="record", variable=self.telemetry_on,
+                        command=self._toggle_telemetry).pack(side="left")
+        ttk.Button(trow, text="profiler", width=10, command=self._toggle_profiler).pack(side="left", padx=(12,4))
+        ttk.Button(trow, text="dump", width=10, command=self._dump_telemetry).pack(side="left", padx=4)
+        ttk.Label(tel, textvariable=self.telemetry_var, style="Mono.TLabel",
+                  justify="left").pack(anchor="w", padx=12, pady=(0,8))
 
         ttk.Frame(right, style="TFrame").pack(fill="both", expand=True)
 
@@ -407,14 +3507,31 @@ class RecoilApp(tk.Tk):
 
     # -------- Config actions --------
     def _refresh_config_list(self):
-        self.config_list.delete(0, tk.END)
-        for name in list_configs():
-            self.config_list.insert(tk.END, name)
+        self._sync_config_list(list_configs())
+
+    def _sync_config_list(self, names):
+        """
+        Patch the Listbox to match `names` instead of rebuilding it: delete
+        the rows that went away, then insert the new ones at their sorted
+        positions. Both lists share the same order, so what survives is
+        already in place.
+        """
+        listed = self._listed
+        if listed == names:
+            return
+        keep = set(names)
+        for i in range(len(listed) - 1, -1, -1):
+            if listed[i] not in keep:
+                self.config_list.delete(i)
+                del listed[i]
+        have = set(listed)
+        for i, name in enumerate(names):
+            if name not in have:
+                self.config_list.insert(i, name)
+                listed.insert(i, name)
 
     def _new_config(self):
-        self.y_var.set(-50.0)
-        self.x_var.set(0.0)
-        self.interval_var.set(120)
+        self._apply_data({})
         self.current_config_name = None
         self.config_list.selection_clear(0, tk.END)
 
@@ -424,6 +3541,7 @@ class RecoilApp(tk.Tk):
         try:
             save_config(self.current_config_name, self._current_data())
             self._refresh_config_list()
+            self._reload_hotkeys()
         except Exception as e:
             messagebox.showerror("save error", str(e))
 
@@ -444,13 +3562,13 @@ class RecoilApp(tk.Tk):
             save_config(name, self._current_data())
             self.current_config_name = name
             self._refresh_config_list()
+            self._reload_hotkeys()
             # highlight in list
-            for i in range(self.config_list.size()):
-                if self.config_list.get(i) == name:
-                    self.config_list.selection_clear(0, tk.END)
-                    self.config_list.selection_set(i)
-                    self.config_list.see(i)
-                    break
+            if name in self._listed:
+                i = self._listed.index(name)
+                self.config_list.selection_clear(0, tk.END)
+                self.config_list.selection_set(i)
+                self.config_list.see(i)
         except Exception as e:
             messagebox.showerror("save error", str(e))
 
@@ -478,6 +3596,7 @@ class RecoilApp(tk.Tk):
             if self.current_config_name == sel:
                 self.current_config_name = None
             self._refresh_config_list()
+            self._reload_hotkeys()
         except Exception as e:
             messagebox.showerror("delete error", str(e))
 
@@ -491,58 +3610,263 @@ class RecoilApp(tk.Tk):
             return None
 
     def _current_data(self):
-        return {
+        data = {
             "x": float(self.x_var.get()),
             "y": float(self.y_var.get()),
             "interval_ms": int(self.interval_var.get()),
         }
+        if self.segments:
+            data["segments"] = self.segments
+        hotkey = self.hotkey_var.get().strip().lower()
+        if hotkey:
+            data["hotkey"] = hotkey
+        return data
 
     def _apply_data(self, data: dict):
-        self.x_var.set(float(data.get("x", 0.0)))
-        self.y_var.set(float(data.get("y", -50.0)))
-        self.interval_var.set(int(data.get("interval_ms", 120)))
+        # set all three vars, then publish a single snapshot for the lot
+        self._suspend_publish = True
+        try:
+            self.x_var.set(float(data.get("x", 0.0)))
+            self.y_var.set(float(data.get("y", -50.0)))
+            self.interval_var.set(int(data.get("interval_ms", 120)))
+            self.hotkey_var.set(str(data.get("hotkey") or ""))
+        finally:
+            self._suspend_publish = False
+        self._set_segments(data.get("segments") or None)
+
+    def _set_segments(self, segments):
+        self.segments = segments
+        self._show_pattern()
+        self._publish_params(force=True)
+
+    def _show_pattern(self):
+        if self.segments:
+            total_ms = sum(d for _, _, d in profile_segments({"segments": self.segments}))
+            self.pattern_var.set(f"{len(self.segments)} segments ({total_ms / 1000.0:.2f} s)")
+        else:
+            self.pattern_var.set("constant")
+
+    def _publish_params(self, *_, force=False):
+        """Validate the controls and swap in a fresh ParamSnapshot."""
+        if self._suspend_publish:
+            return
+        try:
+            x = float(self.x_var.get())
+            y = float(self.y_var.get())
+            interval_ms = float(self.interval_var.get())
+        except (tk.TclError, ValueError):
+            return  # half-typed spinbox text; keep the last good snapshot
+        prev = self.params
+        if not force and (x, y, int(interval_ms)) == (prev.x, prev.y, prev.interval_ms):
+            return
+        # segment patterns don't depend on the sliders, so reuse the compiled one
+        pattern = prev.pattern if (self.segments and not force) else None
+        self.params = ParamSnapshot(x, y, interval_ms, self.segments, pattern)
+        try:
+            self.engine.publish(self.params, self.current_config_name)
+        except (OSError, RuntimeError, ValueError) as e:
+            print(f"[engine] publish failed: {e}")
+
+    # -------- Hotkeys --------
+    def _reload_hotkeys(self):
+        try:
+            self.engine.reload_hotkeys()
+        except (OSError, RuntimeError) as e:
+            print(f"[engine] hotkey reload failed: {e}")
+
+    def _poll_engine(self):
+        # hotkey switches and hot reloads happen off the Tk thread; mirror them here
+        try:
+            st = self.engine.status()
+        except (OSError, RuntimeError):
+            st = None
+        if st is not None:
+            seen = (st["switches"], st["reloads"], st["config_changes"])
+            prev, self._engine_seen = self._engine_seen, seen
+            if seen[2] != prev[2]:
+                self._refresh_config_list()
+            if seen[:2] != prev[:2] and st["profile"] and st["params"] is not None:
+                self._show_switched(st["profile"], st["params"])
+        self.after(100 if self.engine_on else 250, self._poll_engine)
+
+    def _show_switched(self, name, data):
+        """Reflect the engine's active profile in the controls without republishing it."""
+        self._suspend_publish = True
+        try:
+            self.x_var.set(float(data.get("x", 0.0)))
+            self.y_var.set(float(data.get("y", -50.0)))
+            self.interval_var.set(int(data.get("interval_ms", 120)))
+            self.hotkey_var.set(str(data.get("hotkey") or ""))
+        finally:
+            self._suspend_publish = False
+        self.segments = data.get("segments") or None
+        self._show_pattern()
+        self.params = ParamSnapshot.from_config(data)
+        self.current_config_name = name
+        if name in self._listed:
+            i = self._listed.index(name)
+            self.config_list.selection_clear(0, tk.END)
+            self.config_list.selection_set(i)
+            self.config_list.see(i)
 
     # -------- Toggle controls --------
     def toggle_on(self):
-        if not self.listener_running:
-            start_listeners()
-            self.listener_running = True
-        if not (self.worker_thread and self.worker_thread.is_alive()):
-            stop_event.clear()
-            self.worker_thread = threading.Thread(
-                target=movement_loop, args=(self._get_params,), daemon=True
-            )
-            self.worker_thread.start()
+        try:
+            self.engine.on()
+        except (OSError, RuntimeError) as e:
+            messagebox.showerror("engine", str(e))
+            return
+        self.engine_on = True
         self.status_var.set("toggled on")
 
     def toggle_off(self):
-        stop_event.set()
-        if self.worker_thread and self.worker_thread.is_alive():
-            self.worker_thread.join(timeout=0.3)
-        stop_listeners()
-        self.listener_running = False
-        global left_down, right_down
-        left_down = False
-        right_down = False
-        stop_event.clear()
+        try:
+            self.engine.off()
+        except (OSError, RuntimeError) as e:
+            messagebox.showerror("engine", str(e))
+            return
+        self.engine_on = False
         self.status_var.set("toggled off")
 
-    def _get_params(self):
-        return {
-            "x": self.x_var.get(),
-            "y": self.y_var.get(),
-            "interval_ms": self.interval_var.get(),
-        }
+    # -------- Telemetry --------
+    def _toggle_telemetry(self):
+        # one polling loop at most, however quickly "record" is toggled
+        if self._tel_after is not None:
+            self.after_cancel(self._tel_after)
+            self._tel_after = None
+        if self.telemetry_on.get():
+            self._tel_reader = TelemetryReader(enable_telemetry())
+            self._update_telemetry()
+        else:
+            disable_telemetry()
+            self._tel_reader = None
+            self.telemetry_var.set("off")
+
+    def _update_telemetry(self):
+        self._tel_after = None
+        reader = self._tel_reader
+        if reader is None:
+            return
+        reader.poll()
+        st = reader.summary()
+        sched = get_scheduler().stats() if _scheduler is not None else {}
+        prof = self._profiler
+        self.telemetry_var.set(
+            f"wakes {st['wakes']}  steps {st['steps']}  misses {st['misses']}"
+            f"  skipped {st['skipped']}  lost {st['lost']}\n"
+            f"late p50/p99/max {st['late_p50_us']:.0f}/{st['late_p99_us']:.0f}/{st['late_max_us']:.0f} us"
+            f"  jitter p99 {st['jitter_p99_us']:.0f} us  send p99 {st['send_p99_us']:.0f} us\n"
+            f"timer margin {sched.get('margin_us', 0):.0f} us"
+            f"  profiler {'on (%d samples)' % prof.samples if prof and prof.running else 'off'}"
+        )
+        self._tel_after = self.after(500, self._update_telemetry)
+
+    def _toggle_profiler(self):
+        prof = self._profiler
+        if prof is not None and prof.running:
+            prof.stop()
+            for name, n in prof.top(8)["cumulative"]:
+                print(f"[profile] {n:6d}  {name}")
+            return
+        worker = self.engine.worker_thread
+        if not (worker and worker.is_alive()):
+            messagebox.showinfo("profiler", "toggle on first; the profiler samples the worker thread.")
+            return
+        self._profiler = SamplingProfiler(worker.ident)
+        self._profiler.start()
+
+    def _dump_telemetry(self):
+        if self._tel_reader is None:
+            messagebox.showinfo("telemetry", "turn on recording first.")
+            return
+        path = filedialog.asksaveasfilename(
+            title="dump telemetry", defaultextension=".json",
+            filetypes=(("JSON summary", "*.json"), ("CSV records", "*.csv")))
+        if not path:
+            return
+        try:
+            if path.lower().endswith(".csv"):
+                self._tel_reader.dump_csv(path)
+            else:
+                extra = {"scheduler": get_scheduler().stats()}
+                if self._profiler is not None:
+                    extra["profile"] = self._profiler.top(20)
+                self._tel_reader.dump_json(path, extra)
+        except Exception as e:
+            messagebox.showerror("dump error", str(e))
 
     def on_close(self):
         try:
-            self.toggle_off()
+            self.engine.close()   # a remote engine keeps running without us
         finally:
             self.destroy()
 
 # ===================== Main =====================
-def main():
-    app = RecoilApp()
+def main(argv=None):
+    global GC_WHILE_FIRING, BUTTON_SOURCE
+    ap = argparse.ArgumentParser(description="tickys recoil app")
+    ap.add_argument("--pack", metavar="LIB",
+                    help="pack configs/ into a single profile library file and exit")
+    ap.add_argument("--unpack", metavar="LIB",
+                    help="write every profile in a library out to configs/ and exit")
+    ap.add_argument("--simulate", metavar="DIR", nargs="?", const=CONFIG_DIR,
+                    help="replay every profile in DIR (default configs/) in virtual time and report")
+    ap.add_argument("--workers", type=int, default=None,
+                    help="process pool size for --simulate")
+    ap.add_argument("--trace", metavar="NAME",
+                    help="print the exact injected (t, dx, dy) sequence for one profile")
+    ap.add_argument("--headless", action="store_true",
+                    help="run the engine without a window, controlled over --listen")
+    ap.add_argument("--listen", metavar="ADDR", default=CONTROL_ADDRESS,
+                    help=f"control channel: a Unix socket path or loopback host:port (default {CONTROL_ADDRESS})")
+    ap.add_argument("--profile", metavar="NAME", help="profile to start --headless with")
+    ap.add_argument("--on", action="store_true", help="toggle the --headless engine on at startup")
+    ap.add_argument("--isolate", action="store_true",
+                    help="run the movement worker in its own process instead of a thread")
+    ap.add_argument("--buttons", choices=("auto", "pynput"), default=BUTTON_SOURCE,
+                    help="button listener: auto polls the button state where the OS allows "
+                         "(Windows), pynput hooks every mouse event")
+    ap.add_argument("--gc-while-firing", choices=("on", "freeze", "off"), default=GC_WHILE_FIRING,
+                    help="cyclic garbage collector while fire is held (default on)")
+    ap.add_argument("--connect", metavar="ADDR", nargs="?", const=CONTROL_ADDRESS,
+                    help="run the window as a client of a --headless engine at ADDR")
+    args = ap.parse_args(argv)
+    GC_WHILE_FIRING = args.gc_while_firing
+    BUTTON_SOURCE = args.buttons
+    if args.headless:
+        run_headless(args.listen, args.profile, args.on, args.isolate)
+        return
+    if args.simulate:
+        reports = validate_config_dir(args.simulate, args.workers)
+        for r in reports:
+            if "error" in r:
+                print(f"{r['name']:30s} ERROR {r['error']}")
+                continue
+            print(f"{r['name']:30s} dx={r['total_dx']:6d} dy={r['total_dy']:6d}"
+                  f" intervals={r['intervals']:3d} events={r['events']:5d}"
+                  f" drift={r['max_drift_px']}px  {r['simulated_s']:.2f}s sim"
+                  f" in {r['wall_ms']:.1f}ms (x{r['speedup']})")
+        print(f"[simulate] {len(reports)} profiles")
+        return
+    if args.trace:
+        params = ParamSnapshot.from_config(load_config(args.trace))
+        rec = simulate(params, default_timeline(params.pattern.duration_s))["backend"]
+        print("t_s,dx,dy")
+        for t, dx, dy in rec.events():
+            print(f"{t:.6f},{dx},{dy}")
+        return
+    if args.pack:
+        print(f"[configs] packed {pack_config_dir(args.pack)} profiles into {args.pack}")
+        return
+    if args.unpack:
+        print(f"[configs] unpacked {unpack_library(args.unpack)} profiles from {args.unpack}")
+        return
+
+    if args.connect:
+        engine = RemoteEngine(args.connect)
+    else:
+        engine = Engine(isolate=args.isolate)
+    app = RecoilApp(engine=engine)
     app.protocol("WM_DELETE_WINDOW", app.on_close)
     app.mainloop()
 